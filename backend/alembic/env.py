@@ -1,15 +1,20 @@
+import os
 from logging.config import fileConfig
 
 from alembic import context
 from sqlalchemy import engine_from_config, pool
 
-from app.main import Base
+from app.main import Base, DATABASE_URL
 
 config = context.config
 
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
+if os.getenv('SHADOWGRAPH_DB_PATH'):
+    # Migrate the same database the app uses instead of the default in alembic.ini.
+    config.set_main_option('sqlalchemy.url', DATABASE_URL)
+
 target_metadata = Base.metadata
 
 
@@ -0,0 +1,39 @@
+"""crossref response cache
+
+Revision ID: 0002_crossref_cache
+Revises: 0001_initial_schema
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0002_crossref_cache'
+down_revision = '0001_initial_schema'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'crossref_cache',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('cache_key', sa.String(length=64), nullable=False),
+        sa.Column('params_json', sa.Text(), nullable=False),
+        sa.Column('body', sa.LargeBinary(), nullable=False),
+        sa.Column('etag', sa.String(length=255), nullable=True),
+        sa.Column('last_modified', sa.String(length=64), nullable=True),
+        sa.Column('fetched_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_crossref_cache_id', 'crossref_cache', ['id'], unique=False)
+    op.create_index('ix_crossref_cache_cache_key', 'crossref_cache', ['cache_key'], unique=True)
+    op.create_index('ix_crossref_cache_fetched_at', 'crossref_cache', ['fetched_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_crossref_cache_fetched_at', table_name='crossref_cache')
+    op.drop_index('ix_crossref_cache_cache_key', table_name='crossref_cache')
+    op.drop_index('ix_crossref_cache_id', table_name='crossref_cache')
+    op.drop_table('crossref_cache')
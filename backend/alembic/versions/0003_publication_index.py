@@ -0,0 +1,71 @@
+"""local publication store with full-text index
+
+Revision ID: 0003_publication_index
+Revises: 0002_crossref_cache
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0003_publication_index'
+down_revision = '0002_crossref_cache'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'publications',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('dedupe_key', sa.String(length=512), nullable=False),
+        sa.Column('doi', sa.String(length=255), nullable=True),
+        sa.Column('title', sa.Text(), nullable=False),
+        sa.Column('authors', sa.Text(), nullable=False),
+        sa.Column('source', sa.String(length=512), nullable=False),
+        sa.Column('year', sa.Integer(), nullable=True),
+        sa.Column('citations', sa.Integer(), nullable=False),
+        sa.Column('url', sa.Text(), nullable=True),
+        sa.Column('summary', sa.Text(), nullable=False),
+        sa.Column('first_seen_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('last_seen_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_publications_id', 'publications', ['id'], unique=False)
+    op.create_index('ix_publications_dedupe_key', 'publications', ['dedupe_key'], unique=True)
+    op.create_index('ix_publications_doi', 'publications', ['doi'], unique=False)
+
+    op.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS publications_fts USING fts5("
+        "title, authors, source, summary, content='publications', content_rowid='id')"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS publications_fts_ai AFTER INSERT ON publications BEGIN "
+        "INSERT INTO publications_fts(rowid, title, authors, source, summary) "
+        "VALUES (new.id, new.title, new.authors, new.source, new.summary); END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS publications_fts_ad AFTER DELETE ON publications BEGIN "
+        "INSERT INTO publications_fts(publications_fts, rowid, title, authors, source, summary) "
+        "VALUES ('delete', old.id, old.title, old.authors, old.source, old.summary); END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS publications_fts_au AFTER UPDATE ON publications BEGIN "
+        "INSERT INTO publications_fts(publications_fts, rowid, title, authors, source, summary) "
+        "VALUES ('delete', old.id, old.title, old.authors, old.source, old.summary); "
+        "INSERT INTO publications_fts(rowid, title, authors, source, summary) "
+        "VALUES (new.id, new.title, new.authors, new.source, new.summary); END"
+    )
+    op.execute("INSERT INTO publications_fts(publications_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS publications_fts_au')
+    op.execute('DROP TRIGGER IF EXISTS publications_fts_ad')
+    op.execute('DROP TRIGGER IF EXISTS publications_fts_ai')
+    op.execute('DROP TABLE IF EXISTS publications_fts')
+    op.drop_index('ix_publications_doi', table_name='publications')
+    op.drop_index('ix_publications_dedupe_key', table_name='publications')
+    op.drop_index('ix_publications_id', table_name='publications')
+    op.drop_table('publications')
@@ -0,0 +1,38 @@
+"""hibp breach catalog
+
+Revision ID: 0004_hibp_breach_catalog
+Revises: 0003_publication_index
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0004_hibp_breach_catalog'
+down_revision = '0003_publication_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'hibp_breaches',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('domain', sa.String(length=255), nullable=False),
+        sa.Column('breach_date', sa.String(length=32), nullable=True),
+        sa.Column('pwn_count', sa.Integer(), nullable=False),
+        sa.Column('data_classes_json', sa.Text(), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_hibp_breaches_id', 'hibp_breaches', ['id'], unique=False)
+    op.create_index('ix_hibp_breaches_name', 'hibp_breaches', ['name'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_hibp_breaches_name', table_name='hibp_breaches')
+    op.drop_index('ix_hibp_breaches_id', table_name='hibp_breaches')
+    op.drop_table('hibp_breaches')
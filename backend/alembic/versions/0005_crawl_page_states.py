@@ -0,0 +1,43 @@
+"""crawl page states
+
+Revision ID: 0005_crawl_page_states
+Revises: 0004_hibp_breach_catalog
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0005_crawl_page_states'
+down_revision = '0004_hibp_breach_catalog'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'crawl_page_states',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('state_key', sa.String(length=64), nullable=False),
+        sa.Column('schedule_id', sa.String(length=64), nullable=False),
+        sa.Column('url', sa.Text(), nullable=False),
+        sa.Column('etag', sa.String(length=255), nullable=True),
+        sa.Column('last_modified', sa.String(length=64), nullable=True),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('status_code', sa.Integer(), nullable=False),
+        sa.Column('analysis_json', sa.Text(), nullable=False),
+        sa.Column('fetched_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('checked_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_crawl_page_states_id', 'crawl_page_states', ['id'], unique=False)
+    op.create_index('ix_crawl_page_states_state_key', 'crawl_page_states', ['state_key'], unique=True)
+    op.create_index('ix_crawl_page_states_schedule_id', 'crawl_page_states', ['schedule_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_crawl_page_states_schedule_id', table_name='crawl_page_states')
+    op.drop_index('ix_crawl_page_states_state_key', table_name='crawl_page_states')
+    op.drop_index('ix_crawl_page_states_id', table_name='crawl_page_states')
+    op.drop_table('crawl_page_states')
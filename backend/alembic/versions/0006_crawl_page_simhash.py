@@ -0,0 +1,26 @@
+"""crawl page simhash
+
+Revision ID: 0006_crawl_page_simhash
+Revises: 0005_crawl_page_states
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0006_crawl_page_simhash'
+down_revision = '0005_crawl_page_states'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('crawl_page_states', sa.Column('simhash', sa.String(length=16), nullable=True))
+    op.add_column('crawl_page_states', sa.Column('duplicate_of', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('crawl_page_states') as batch_op:
+        batch_op.drop_column('duplicate_of')
+        batch_op.drop_column('simhash')
@@ -0,0 +1,54 @@
+"""scrape jobs
+
+Revision ID: 0007_scrape_jobs
+Revises: 0006_crawl_page_simhash
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0007_scrape_jobs'
+down_revision = '0006_crawl_page_simhash'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'scrape_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.String(length=36), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('schedule_id', sa.String(length=64), nullable=True),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('payload_json', sa.Text(), nullable=False),
+        sa.Column('result_json', sa.Text(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('available_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('lease_owner', sa.String(length=128), nullable=True),
+        sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_scrape_jobs_id', 'scrape_jobs', ['id'], unique=False)
+    op.create_index('ix_scrape_jobs_job_id', 'scrape_jobs', ['job_id'], unique=True)
+    op.create_index('ix_scrape_jobs_user_id', 'scrape_jobs', ['user_id'], unique=False)
+    op.create_index('ix_scrape_jobs_schedule_id', 'scrape_jobs', ['schedule_id'], unique=False)
+    op.create_index('ix_scrape_jobs_status', 'scrape_jobs', ['status'], unique=False)
+    op.create_index('ix_scrape_jobs_available_at', 'scrape_jobs', ['available_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_scrape_jobs_available_at', table_name='scrape_jobs')
+    op.drop_index('ix_scrape_jobs_status', table_name='scrape_jobs')
+    op.drop_index('ix_scrape_jobs_schedule_id', table_name='scrape_jobs')
+    op.drop_index('ix_scrape_jobs_user_id', table_name='scrape_jobs')
+    op.drop_index('ix_scrape_jobs_job_id', table_name='scrape_jobs')
+    op.drop_index('ix_scrape_jobs_id', table_name='scrape_jobs')
+    op.drop_table('scrape_jobs')
@@ -0,0 +1,54 @@
+"""scrape schedules and service leases
+
+Revision ID: 0008_scrape_schedules
+Revises: 0007_scrape_jobs
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0008_scrape_schedules'
+down_revision = '0007_scrape_jobs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'scrape_schedules',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('schedule_id', sa.String(length=36), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('payload_json', sa.Text(), nullable=False),
+        sa.Column('interval_minutes', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('next_run_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('last_run_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_job_id', sa.String(length=36), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_scrape_schedules_id', 'scrape_schedules', ['id'], unique=False)
+    op.create_index('ix_scrape_schedules_schedule_id', 'scrape_schedules', ['schedule_id'], unique=True)
+    op.create_index('ix_scrape_schedules_user_id', 'scrape_schedules', ['user_id'], unique=False)
+    op.create_index('ix_scrape_schedules_next_run_at', 'scrape_schedules', ['next_run_at'], unique=False)
+
+    op.create_table(
+        'service_leases',
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('owner', sa.String(length=128), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('service_leases')
+    op.drop_index('ix_scrape_schedules_next_run_at', table_name='scrape_schedules')
+    op.drop_index('ix_scrape_schedules_user_id', table_name='scrape_schedules')
+    op.drop_index('ix_scrape_schedules_schedule_id', table_name='scrape_schedules')
+    op.drop_index('ix_scrape_schedules_id', table_name='scrape_schedules')
+    op.drop_table('scrape_schedules')
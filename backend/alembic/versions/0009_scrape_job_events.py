@@ -0,0 +1,38 @@
+"""scrape job events and cancellation
+
+Revision ID: 0009_scrape_job_events
+Revises: 0008_scrape_schedules
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0009_scrape_job_events'
+down_revision = '0008_scrape_schedules'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('scrape_jobs', sa.Column('cancel_requested_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_table(
+        'scrape_job_events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.String(length=36), nullable=False),
+        sa.Column('event_type', sa.String(length=32), nullable=False),
+        sa.Column('payload_json', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_scrape_job_events_id', 'scrape_job_events', ['id'], unique=False)
+    op.create_index('ix_scrape_job_events_job_id', 'scrape_job_events', ['job_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_scrape_job_events_job_id', table_name='scrape_job_events')
+    op.drop_index('ix_scrape_job_events_id', table_name='scrape_job_events')
+    op.drop_table('scrape_job_events')
+    with op.batch_alter_table('scrape_jobs') as batch_op:
+        batch_op.drop_column('cancel_requested_at')
@@ -0,0 +1,88 @@
+"""scrape job results stored apart from job rows
+
+Revision ID: 0010_scrape_job_results
+Revises: 0009_scrape_job_events
+Create Date: 2026-10-19
+"""
+
+import json
+import zlib
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0010_scrape_job_results'
+down_revision = '0009_scrape_job_events'
+branch_labels = None
+depends_on = None
+
+
+def _summary(result: dict) -> dict:
+    aggregates = result.get('aggregates', {})
+    return {
+        'status': result.get('status'),
+        'frontier': result.get('frontier'),
+        'pages_scraped': aggregates.get('pages_scraped', 0),
+        'unique_links': aggregates.get('unique_links', 0),
+        'emails_found': len(aggregates.get('emails_found', [])),
+        'keyword_totals': aggregates.get('keyword_totals', {}),
+    }
+
+
+def upgrade() -> None:
+    op.create_table(
+        'scrape_job_results',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.String(length=36), nullable=False),
+        sa.Column('body', sa.LargeBinary(), nullable=False),
+        sa.Column('page_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_scrape_job_results_id', 'scrape_job_results', ['id'], unique=False)
+    op.create_index('ix_scrape_job_results_job_id', 'scrape_job_results', ['job_id'], unique=True)
+    op.add_column('scrape_jobs', sa.Column('summary_json', sa.Text(), nullable=True))
+
+    conn = op.get_bind()
+    jobs = sa.table('scrape_jobs', sa.column('job_id', sa.String), sa.column('result_json', sa.Text), sa.column('summary_json', sa.Text))
+    results = sa.table(
+        'scrape_job_results',
+        sa.column('job_id', sa.String),
+        sa.column('body', sa.LargeBinary),
+        sa.column('page_count', sa.Integer),
+        sa.column('created_at', sa.DateTime(timezone=True)),
+    )
+    now = datetime.now(timezone.utc)
+    for job_id, result_json in conn.execute(sa.select(jobs.c.job_id, jobs.c.result_json).where(jobs.c.result_json.isnot(None))).all():
+        result = json.loads(result_json)
+        conn.execute(
+            results.insert().values(
+                job_id=job_id,
+                body=zlib.compress(result_json.encode('utf-8'), 6),
+                page_count=len(result.get('pages', [])),
+                created_at=now,
+            )
+        )
+        conn.execute(jobs.update().where(jobs.c.job_id == job_id).values(summary_json=json.dumps(_summary(result))))
+
+    with op.batch_alter_table('scrape_jobs') as batch_op:
+        batch_op.drop_column('result_json')
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('scrape_jobs') as batch_op:
+        batch_op.add_column(sa.Column('result_json', sa.Text(), nullable=True))
+
+    conn = op.get_bind()
+    jobs = sa.table('scrape_jobs', sa.column('job_id', sa.String), sa.column('result_json', sa.Text))
+    results = sa.table('scrape_job_results', sa.column('job_id', sa.String), sa.column('body', sa.LargeBinary))
+    for job_id, body in conn.execute(sa.select(results.c.job_id, results.c.body)).all():
+        conn.execute(jobs.update().where(jobs.c.job_id == job_id).values(result_json=zlib.decompress(body).decode('utf-8')))
+
+    with op.batch_alter_table('scrape_jobs') as batch_op:
+        batch_op.drop_column('summary_json')
+    op.drop_index('ix_scrape_job_results_job_id', table_name='scrape_job_results')
+    op.drop_index('ix_scrape_job_results_id', table_name='scrape_job_results')
+    op.drop_table('scrape_job_results')
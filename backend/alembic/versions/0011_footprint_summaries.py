@@ -0,0 +1,34 @@
+"""footprint summaries
+
+Revision ID: 0011_footprint_summaries
+Revises: 0010_scrape_job_results
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0011_footprint_summaries'
+down_revision = '0010_scrape_job_results'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Rows are built lazily on first read, or up front with scripts/rebuild_footprint_summaries.py.
+    op.create_table(
+        'footprint_summaries',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('profiles_json', sa.Text(), nullable=False),
+        sa.Column('papers_count', sa.Integer(), nullable=False),
+        sa.Column('breaches_count', sa.Integer(), nullable=False),
+        sa.Column('last_event_id', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('footprint_summaries')
@@ -0,0 +1,100 @@
+"""normalized discovered profiles, publications and breach exposures
+
+Revision ID: 0012_scan_index_tables
+Revises: 0011_footprint_summaries
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0012_scan_index_tables'
+down_revision = '0011_footprint_summaries'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Populate existing rows with scripts/backfill_scan_index.py after upgrading.
+    op.create_table(
+        'discovered_profiles',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('profile_key', sa.String(length=64), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('platform', sa.String(length=128), nullable=False),
+        sa.Column('profile_url', sa.Text(), nullable=False),
+        sa.Column('username', sa.String(length=255), nullable=False),
+        sa.Column('category', sa.String(length=32), nullable=False),
+        sa.Column('source', sa.String(length=32), nullable=False),
+        sa.Column('is_self', sa.Integer(), nullable=False),
+        sa.Column('face_matched', sa.Integer(), nullable=False),
+        sa.Column('sightings', sa.Integer(), nullable=False),
+        sa.Column('last_event_id', sa.Integer(), nullable=False),
+        sa.Column('first_seen_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('last_seen_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_discovered_profiles_id', 'discovered_profiles', ['id'], unique=False)
+    op.create_index('ix_discovered_profiles_profile_key', 'discovered_profiles', ['profile_key'], unique=True)
+    op.create_index('ix_discovered_profiles_user_id', 'discovered_profiles', ['user_id'], unique=False)
+
+    op.create_table(
+        'user_publications',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('entry_key', sa.String(length=64), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('dedupe_key', sa.String(length=512), nullable=False),
+        sa.Column('doi', sa.String(length=255), nullable=True),
+        sa.Column('title', sa.Text(), nullable=False),
+        sa.Column('year', sa.Integer(), nullable=True),
+        sa.Column('citations', sa.Integer(), nullable=False),
+        sa.Column('sightings', sa.Integer(), nullable=False),
+        sa.Column('last_event_id', sa.Integer(), nullable=False),
+        sa.Column('first_seen_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('last_seen_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_user_publications_id', 'user_publications', ['id'], unique=False)
+    op.create_index('ix_user_publications_entry_key', 'user_publications', ['entry_key'], unique=True)
+    op.create_index('ix_user_publications_user_id', 'user_publications', ['user_id'], unique=False)
+    op.create_index('ix_user_publications_dedupe_key', 'user_publications', ['dedupe_key'], unique=False)
+
+    op.create_table(
+        'breach_exposures',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('exposure_key', sa.String(length=64), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('site', sa.String(length=255), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('data_classes', sa.Text(), nullable=False),
+        sa.Column('breach_date', sa.String(length=32), nullable=True),
+        sa.Column('risk', sa.String(length=16), nullable=False),
+        sa.Column('records', sa.Integer(), nullable=False),
+        sa.Column('last_event_id', sa.Integer(), nullable=False),
+        sa.Column('first_seen_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('last_seen_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_breach_exposures_id', 'breach_exposures', ['id'], unique=False)
+    op.create_index('ix_breach_exposures_exposure_key', 'breach_exposures', ['exposure_key'], unique=True)
+    op.create_index('ix_breach_exposures_user_id', 'breach_exposures', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_breach_exposures_user_id', table_name='breach_exposures')
+    op.drop_index('ix_breach_exposures_exposure_key', table_name='breach_exposures')
+    op.drop_index('ix_breach_exposures_id', table_name='breach_exposures')
+    op.drop_table('breach_exposures')
+    op.drop_index('ix_user_publications_dedupe_key', table_name='user_publications')
+    op.drop_index('ix_user_publications_user_id', table_name='user_publications')
+    op.drop_index('ix_user_publications_entry_key', table_name='user_publications')
+    op.drop_index('ix_user_publications_id', table_name='user_publications')
+    op.drop_table('user_publications')
+    op.drop_index('ix_discovered_profiles_user_id', table_name='discovered_profiles')
+    op.drop_index('ix_discovered_profiles_profile_key', table_name='discovered_profiles')
+    op.drop_index('ix_discovered_profiles_id', table_name='discovered_profiles')
+    op.drop_table('discovered_profiles')
@@ -1,16 +1,25 @@
 import asyncio
+import hashlib
 import io
 import json
 import logging
+import math
 import os
 import re
+import socket
 import time
 import uuid
-from collections import defaultdict, deque
+import weakref
+import zlib
+from collections import Counter, defaultdict, deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from html.parser import HTMLParser
 from pathlib import Path
-from typing import Any
-from urllib.parse import quote_plus, urlencode, urljoin, urlparse
+from typing import Any, Callable
+from urllib.parse import parse_qsl, quote_plus, urlencode, urljoin, urlparse, urlsplit, urlunsplit
+from urllib.robotparser import RobotFileParser
+from xml.etree import ElementTree
 import threading
 
 import cv2
@@ -25,7 +34,8 @@ from passlib.context import CryptContext
 from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, create_engine
+from sqlalchemy import DateTime, ForeignKey, Integer, LargeBinary, String, Text, and_, create_engine, event, func, or_, text
+from sqlalchemy.exc import IntegrityError, OperationalError, SQLAlchemyError
 from sqlalchemy.orm import Mapped, Session, declarative_base, mapped_column, relationship, sessionmaker
 from starlette.responses import StreamingResponse
 from starlette.responses import JSONResponse
@@ -73,17 +83,36 @@ ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv('ACCESS_TOKEN_EXPIRE_MINUTES', '1440
 LOGIN_LOCK_WINDOW_SECONDS = int(os.getenv('LOGIN_LOCK_WINDOW_SECONDS', '900'))
 LOGIN_MAX_FAILURES = int(os.getenv('LOGIN_MAX_FAILURES', '6'))
 
-DB_PATH = BASE_DIR / 'shadowgraph.db'
+# Every process of one deployment (api and workers) must point at the same file.
+DB_PATH = Path(os.getenv('SHADOWGRAPH_DB_PATH', str(BASE_DIR / 'shadowgraph.db')))
+DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 DATABASE_URL = f'sqlite:///{DB_PATH}'
+# How long a connection waits on another process's write lock before raising 'database is locked'.
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SHADOWGRAPH_SQLITE_BUSY_TIMEOUT_MS', '5000'))
 engine = create_engine(DATABASE_URL, connect_args={'check_same_thread': False})
+
+if DATABASE_URL.startswith('sqlite'):
+
+    @event.listens_for(engine, 'connect')
+    def _configure_sqlite_connection(dbapi_connection, connection_record) -> None:
+        # WAL lets the api keep reading while a worker writes; busy_timeout queues writers instead of failing them.
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute('PRAGMA journal_mode=WAL')
+            cursor.execute(f'PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}')
+        finally:
+            cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 _schema_lock = threading.Lock()
 _schema_ready = False
+_publication_fts_ready = False
 
 # Use PBKDF2-SHA256 for cross-platform stability (avoids bcrypt backend issues on some Python/macOS builds).
 pwd_context = CryptContext(schemes=['pbkdf2_sha256'], deprecated='auto')
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='/auth/login')
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl='/auth/login', auto_error=False)
 
 FACE_GALLERY_DIR = BASE_DIR / 'data' / 'face_gallery'
 FACE_GALLERY_META = FACE_GALLERY_DIR / 'metadata.json'
@@ -161,9 +190,123 @@ LOGIN_LOCKED_UNTIL: dict[str, float] = {}
 REDIS_URL = os.getenv('REDIS_URL', '').strip()
 REDIS_RATE_PREFIX = os.getenv('REDIS_RATE_PREFIX', 'shadowgraph:ratelimit')
 redis_client = redis_async.from_url(REDIS_URL, decode_responses=True) if (REDIS_URL and redis_async) else None
-SCRAPE_JOBS: dict[str, dict[str, Any]] = {}
-SCRAPE_SCHEDULES: dict[str, dict[str, Any]] = {}
+# all: API plus background work in one process; api: serve and enqueue only; worker: see app/worker.py.
+PROCESS_ROLE = os.getenv('SHADOWGRAPH_PROCESS_ROLE', 'all').strip().lower()
+if PROCESS_ROLE not in ('all', 'api', 'worker'):
+    PROCESS_ROLE = 'all'
 scheduler = AsyncIOScheduler(timezone='UTC') if AsyncIOScheduler else None
+USERNAME_FAST_MIN_YIELD = float(os.getenv('USERNAME_FAST_MIN_YIELD', '0.05'))
+USERNAME_FAST_MIN_SAMPLES = int(os.getenv('USERNAME_FAST_MIN_SAMPLES', '5'))
+USERNAME_STATS_EVENT_LIMIT = int(os.getenv('USERNAME_STATS_EVENT_LIMIT', '500'))
+USERNAME_STATS_TTL_SECONDS = int(os.getenv('USERNAME_STATS_TTL_SECONDS', '600'))
+VARIANT_HIT_STATS: dict[str, Any] = {}
+CROSSREF_WORKS_URL = 'https://api.crossref.org/works'
+# Crossref's polite pool tolerates a handful of concurrent requests per client; stay well below it.
+CROSSREF_MAX_CONCURRENCY = max(1, int(os.getenv('CROSSREF_MAX_CONCURRENCY', '3')))
+CROSSREF_PAGE_ROWS = int(os.getenv('CROSSREF_PAGE_ROWS', '20'))
+CROSSREF_MAX_PAGES = int(os.getenv('CROSSREF_MAX_PAGES', '3'))
+# Responses and stored scans list only the first few authors; the publications index keeps the full byline.
+RESEARCH_DISPLAY_AUTHORS = 5
+# Only the fields read by _paper_from_crossref_item and the author filter.
+CROSSREF_SELECT_FIELDS = 'DOI,URL,title,author,container-title,issued,is-referenced-by-count,abstract'
+CROSSREF_CACHE_TTL_SECONDS = int(os.getenv('CROSSREF_CACHE_TTL_SECONDS', '86400'))
+CROSSREF_CACHE_RETENTION_DAYS = int(os.getenv('CROSSREF_CACHE_RETENTION_DAYS', '30'))
+METRICS: dict[str, int] = defaultdict(int)
+HIBP_RATE_PER_MINUTE = max(1, int(os.getenv('HIBP_RATE_PER_MINUTE', '10')))
+HIBP_BURST = max(1, int(os.getenv('HIBP_BURST', '1')))
+HIBP_MAX_QUEUE_WAIT_SECONDS = float(os.getenv('HIBP_MAX_QUEUE_WAIT_SECONDS', '30'))
+HIBP_MAX_RETRIES = int(os.getenv('HIBP_MAX_RETRIES', '2'))
+# A batch may queue this long in total; larger batches than the quota can serve in that time are rejected up front.
+HIBP_BATCH_MAX_WAIT_SECONDS = float(os.getenv('HIBP_BATCH_MAX_WAIT_SECONDS', '600'))
+HIBP_BUCKET_KEY = os.getenv('HIBP_BUCKET_KEY', 'shadowgraph:hibp:bucket')
+HIBP_BUCKET_STATE: dict[str, float] = {}
+HIBP_CATALOG_URL = 'https://haveibeenpwned.com/api/v3/breaches'
+HIBP_CATALOG_TTL_SECONDS = int(os.getenv('HIBP_CATALOG_TTL_SECONDS', '21600'))
+HIBP_CATALOG_MIN_REFRESH_SECONDS = int(os.getenv('HIBP_CATALOG_MIN_REFRESH_SECONDS', '300'))
+HIBP_CATALOG: dict[str, dict[str, Any]] = {}
+HIBP_CATALOG_STATE: dict[str, float] = {'refreshed_at': 0.0, 'attempted_at': 0.0}
+_hibp_catalog_lock = asyncio.Lock()
+BREACH_MONITOR_INTERVAL_MINUTES = int(os.getenv('BREACH_MONITOR_INTERVAL_MINUTES', '60'))
+BREACH_MONITOR_BATCH_SIZE = int(os.getenv('BREACH_MONITOR_BATCH_SIZE', '10'))
+# Share of the HIBP key's per-minute quota background monitoring may use; the rest is left for interactive checks.
+BREACH_MONITOR_QUOTA_SHARE = min(1.0, max(0.05, float(os.getenv('BREACH_MONITOR_QUOTA_SHARE', '0.5'))))
+BREACH_MONITOR_CURSOR_KEY = 'breach_monitor.cursor'
+SCRAPE_WORKER_COUNT = max(0, int(os.getenv('SCRAPE_WORKER_COUNT', '2')))
+# A running job whose lease is not renewed within this window is handed to another worker.
+SCRAPE_JOB_LEASE_SECONDS = int(os.getenv('SCRAPE_JOB_LEASE_SECONDS', '120'))
+SCRAPE_JOB_HEARTBEAT_SECONDS = max(1, int(os.getenv('SCRAPE_JOB_HEARTBEAT_SECONDS', '30')))
+SCRAPE_JOB_MAX_ATTEMPTS = max(1, int(os.getenv('SCRAPE_JOB_MAX_ATTEMPTS', '3')))
+SCRAPE_JOB_RETRY_BASE_SECONDS = int(os.getenv('SCRAPE_JOB_RETRY_BASE_SECONDS', '30'))
+SCRAPE_JOB_POLL_SECONDS = float(os.getenv('SCRAPE_JOB_POLL_SECONDS', '2'))
+# Hard ceiling on one attempt; a crawl still running past it is cancelled and retried like any other failure.
+SCRAPE_JOB_TIMEOUT_SECONDS = max(1, int(os.getenv('SCRAPE_JOB_TIMEOUT_SECONDS', '900')))
+# Workers flush page events and pick up cancel requests at this interval.
+SCRAPE_JOB_PROGRESS_SECONDS = float(os.getenv('SCRAPE_JOB_PROGRESS_SECONDS', '1'))
+SCRAPE_JOB_EVENTS_POLL_SECONDS = float(os.getenv('SCRAPE_JOB_EVENTS_POLL_SECONDS', '1'))
+SCRAPE_JOB_EVENTS_KEEPALIVE_SECONDS = float(os.getenv('SCRAPE_JOB_EVENTS_KEEPALIVE_SECONDS', '15'))
+# EventSource cannot send headers, so browsers open the stream with a short-lived, job-scoped ?token=.
+SCRAPE_JOB_STREAM_TOKEN_SECONDS = int(os.getenv('SCRAPE_JOB_STREAM_TOKEN_SECONDS', '120'))
+SCRAPE_JOB_TERMINAL_STATUSES = ('completed', 'failed', 'cancelled')
+# Finished jobs are pruned by age and by count per user; full results live compressed in scrape_job_results.
+SCRAPE_JOB_RETENTION_DAYS = int(os.getenv('SCRAPE_JOB_RETENTION_DAYS', '30'))
+SCRAPE_JOB_MAX_PER_USER = max(1, int(os.getenv('SCRAPE_JOB_MAX_PER_USER', '200')))
+SCRAPE_RESULT_CACHE_SIZE = max(0, int(os.getenv('SCRAPE_RESULT_CACHE_SIZE', '32')))
+SCRAPE_RESULT_CACHE_TTL_SECONDS = int(os.getenv('SCRAPE_RESULT_CACHE_TTL_SECONDS', '300'))
+SCRAPE_RESULT_CACHE: dict[str, tuple[float, dict[str, Any]]] = {}
+SCRAPE_RESULT_PAGE_LIMIT = 50
+SCRAPE_QUEUE_WAKE_KEY = os.getenv('SCRAPE_QUEUE_WAKE_KEY', 'shadowgraph:scrape:wake')
+SCRAPE_WORKER_ID = f'{socket.gethostname()}:{os.getpid()}'
+SCRAPE_WORKERS: list[asyncio.Task] = []
+# Scan types folded into the per-user footprint summary and the normalized profile/paper/breach tables as they are stored.
+FOOTPRINT_SCAN_TYPES = ('username_scan', 'face_scan', 'research_search', 'breach_check')
+GRAPH_PLATFORM_LIMIT = 60
+GRAPH_PAPER_LIMIT = 30
+GRAPH_BREACH_LIMIT = 40
+SCRAPE_SCHEDULE_TICK_SECONDS = max(1, int(os.getenv('SCRAPE_SCHEDULE_TICK_SECONDS', '15')))
+# Per-schedule phase offset so schedules sharing an interval do not fire in the same second.
+SCRAPE_SCHEDULE_MAX_JITTER_SECONDS = max(0, int(os.getenv('SCRAPE_SCHEDULE_MAX_JITTER_SECONDS', '60')))
+SCRAPE_SCHEDULER_LEASE_SECONDS = max(SCRAPE_SCHEDULE_TICK_SECONDS * 2, int(os.getenv('SCRAPE_SCHEDULER_LEASE_SECONDS', '60')))
+SCRAPE_SCHEDULER_LEASE_KEY = os.getenv('SCRAPE_SCHEDULER_LEASE_KEY', 'shadowgraph:scheduler:leader')
+_scrape_wake: asyncio.Event | None = None
+CRAWLER_WORKERS = max(1, int(os.getenv('CRAWLER_WORKERS', '4')))
+CRAWLER_PER_DOMAIN_CONCURRENCY = max(1, int(os.getenv('CRAWLER_PER_DOMAIN_CONCURRENCY', '2')))
+CRAWLER_DOMAIN_DELAY_SECONDS = float(os.getenv('CRAWLER_DOMAIN_DELAY_SECONDS', '0.25'))
+CRAWLER_GLOBAL_CONCURRENCY = max(1, int(os.getenv('CRAWLER_GLOBAL_CONCURRENCY', '16')))
+# Page analysis runs off the event loop: 'thread' (default) or 'process' for CPU parallelism on large crawls.
+CRAWLER_PARSE_EXECUTOR = os.getenv('CRAWLER_PARSE_EXECUTOR', 'thread').strip().lower()
+CRAWLER_PARSE_WORKERS = max(1, int(os.getenv('CRAWLER_PARSE_WORKERS', '2')))
+# Pages smaller than this are cheaper to analyze inline than to hand off to the pool.
+CRAWLER_PARSE_INLINE_BYTES = int(os.getenv('CRAWLER_PARSE_INLINE_BYTES', '16384'))
+_page_parse_executor: Executor | None = None
+CRAWLER_USER_AGENT = 'ShadowGraphCrawler/1.0'
+CRAWLER_RESPECT_ROBOTS = os.getenv('CRAWLER_RESPECT_ROBOTS', 'true').strip().lower() in ('1', 'true', 'yes')
+CRAWLER_ROBOTS_TTL_SECONDS = int(os.getenv('CRAWLER_ROBOTS_TTL_SECONDS', '3600'))
+# robots.txt that cannot be fetched (5xx, network error) blocks the host, but only for this long.
+CRAWLER_ROBOTS_ERROR_TTL_SECONDS = int(os.getenv('CRAWLER_ROBOTS_ERROR_TTL_SECONDS', '300'))
+CRAWLER_MAX_CRAWL_DELAY_SECONDS = float(os.getenv('CRAWLER_MAX_CRAWL_DELAY_SECONDS', '10'))
+CRAWLER_USE_SITEMAPS = os.getenv('CRAWLER_USE_SITEMAPS', 'true').strip().lower() in ('1', 'true', 'yes')
+CRAWLER_SITEMAP_MAX_FILES = int(os.getenv('CRAWLER_SITEMAP_MAX_FILES', '3'))
+CRAWLER_SITEMAP_MAX_BYTES = int(os.getenv('CRAWLER_SITEMAP_MAX_BYTES', '2000000'))
+# 'exact' keeps 64-bit URL fingerprints; 'bloom' trades a small false-positive rate for fixed memory on huge crawls.
+CRAWLER_URL_SET = os.getenv('CRAWLER_URL_SET', 'exact').strip().lower()
+CRAWLER_BLOOM_CAPACITY = int(os.getenv('CRAWLER_BLOOM_CAPACITY', '1000000'))
+CRAWLER_BLOOM_ERROR_RATE = float(os.getenv('CRAWLER_BLOOM_ERROR_RATE', '0.001'))
+TRACKING_QUERY_PARAMS = {'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid', '_ga', '_gl', '_hsenc', '_hsmi'}
+# Bodies are streamed and capped; larger declared sizes are skipped, undeclared ones truncated at the cap.
+CRAWLER_MAX_BYTES = int(os.getenv('CRAWLER_MAX_BYTES', '2000000'))
+CRAWLER_TEXT_CONTENT_TYPES = {'text/html', 'application/xhtml+xml', 'text/plain'}
+NON_HTML_EXTENSIONS = {
+    '.pdf', '.zip', '.gz', '.tgz', '.rar', '.7z', '.exe', '.dmg', '.iso', '.jpg', '.jpeg', '.png', '.gif', '.webp',
+    '.svg', '.ico', '.mp3', '.mp4', '.m4a', '.mov', '.avi', '.webm', '.wav', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx',
+}
+# Pages whose 64-bit SimHash differs in at most this many bits are treated as near-duplicates.
+CRAWLER_SIMHASH_DISTANCE = min(15, int(os.getenv('CRAWLER_SIMHASH_DISTANCE', '3')))
+CRAWLER_SIMHASH_MIN_WORDS = int(os.getenv('CRAWLER_SIMHASH_MIN_WORDS', '20'))
+ROBOTS_CACHE_MAX_HOSTS = 1024
+# Order-key slot for sitemap entries, past any realistic count of anchors on the seed page.
+SITEMAP_ORDER_OFFSET = 1_000_000
+ROBOTS_CACHE: dict[str, dict[str, Any]] = {}
+_crawler_fetch_slots: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]' = weakref.WeakKeyDictionary()
 
 
 class User(Base):
@@ -201,6 +344,223 @@ class AuditEvent(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
 
 
+class CrossrefCacheEntry(Base):
+    __tablename__ = 'crossref_cache'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    cache_key: Mapped[str] = mapped_column(String(64), unique=True, index=True, nullable=False)
+    params_json: Mapped[str] = mapped_column(Text, nullable=False)
+    body: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    etag: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    last_modified: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True, default=lambda: datetime.now(timezone.utc))
+
+
+class Publication(Base):
+    __tablename__ = 'publications'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    dedupe_key: Mapped[str] = mapped_column(String(512), unique=True, index=True, nullable=False)
+    doi: Mapped[str | None] = mapped_column(String(255), index=True, nullable=True)
+    title: Mapped[str] = mapped_column(Text, nullable=False)
+    authors: Mapped[str] = mapped_column(Text, default='')
+    source: Mapped[str] = mapped_column(String(512), default='')
+    year: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    citations: Mapped[int] = mapped_column(Integer, default=0)
+    url: Mapped[str | None] = mapped_column(Text, nullable=True)
+    summary: Mapped[str] = mapped_column(Text, default='')
+    first_seen_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    last_seen_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+
+# External-content FTS5 index over publications, kept in sync by triggers.
+PUBLICATION_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS publications_fts USING fts5("
+    "title, authors, source, summary, content='publications', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS publications_fts_ai AFTER INSERT ON publications BEGIN "
+    "INSERT INTO publications_fts(rowid, title, authors, source, summary) "
+    "VALUES (new.id, new.title, new.authors, new.source, new.summary); END",
+    "CREATE TRIGGER IF NOT EXISTS publications_fts_ad AFTER DELETE ON publications BEGIN "
+    "INSERT INTO publications_fts(publications_fts, rowid, title, authors, source, summary) "
+    "VALUES ('delete', old.id, old.title, old.authors, old.source, old.summary); END",
+    "CREATE TRIGGER IF NOT EXISTS publications_fts_au AFTER UPDATE ON publications BEGIN "
+    "INSERT INTO publications_fts(publications_fts, rowid, title, authors, source, summary) "
+    "VALUES ('delete', old.id, old.title, old.authors, old.source, old.summary); "
+    "INSERT INTO publications_fts(rowid, title, authors, source, summary) "
+    "VALUES (new.id, new.title, new.authors, new.source, new.summary); END",
+]
+
+
+class HibpBreach(Base):
+    __tablename__ = 'hibp_breaches'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    name: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
+    title: Mapped[str] = mapped_column(String(255), default='')
+    domain: Mapped[str] = mapped_column(String(255), default='')
+    breach_date: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    pwn_count: Mapped[int] = mapped_column(Integer, default=0)
+    data_classes_json: Mapped[str] = mapped_column(Text, default='[]')
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+
+class CrawlPageState(Base):
+    __tablename__ = 'crawl_page_states'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    state_key: Mapped[str] = mapped_column(String(64), unique=True, index=True, nullable=False)
+    schedule_id: Mapped[str] = mapped_column(String(64), index=True, nullable=False)
+    url: Mapped[str] = mapped_column(Text, nullable=False)
+    etag: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    last_modified: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    content_hash: Mapped[str] = mapped_column(String(64), default='')
+    status_code: Mapped[int] = mapped_column(Integer, default=0)
+    analysis_json: Mapped[str] = mapped_column(Text, default='{}')
+    simhash: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    duplicate_of: Mapped[str | None] = mapped_column(Text, nullable=True)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    checked_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+
+class ScrapeJob(Base):
+    __tablename__ = 'scrape_jobs'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    job_id: Mapped[str] = mapped_column(String(36), unique=True, index=True, nullable=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey('users.id'), index=True)
+    schedule_id: Mapped[str | None] = mapped_column(String(64), index=True, nullable=True)
+    status: Mapped[str] = mapped_column(String(16), index=True, default='queued')
+    payload_json: Mapped[str] = mapped_column(Text, nullable=False)
+    summary_json: Mapped[str | None] = mapped_column(Text, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    available_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True, default=lambda: datetime.now(timezone.utc))
+    lease_owner: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    cancel_requested_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class ScrapeJobResult(Base):
+    __tablename__ = 'scrape_job_results'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    job_id: Mapped[str] = mapped_column(String(36), unique=True, index=True, nullable=False)
+    body: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    page_count: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+
+class ScrapeJobEvent(Base):
+    __tablename__ = 'scrape_job_events'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    job_id: Mapped[str] = mapped_column(String(36), index=True, nullable=False)
+    event_type: Mapped[str] = mapped_column(String(32), nullable=False)
+    payload_json: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+
+class ScrapeSchedule(Base):
+    __tablename__ = 'scrape_schedules'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    schedule_id: Mapped[str] = mapped_column(String(36), unique=True, index=True, nullable=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey('users.id'), index=True)
+    payload_json: Mapped[str] = mapped_column(Text, nullable=False)
+    interval_minutes: Mapped[int] = mapped_column(Integer, nullable=False)
+    status: Mapped[str] = mapped_column(String(16), default='active')
+    next_run_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True, nullable=False)
+    last_run_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_job_id: Mapped[str | None] = mapped_column(String(36), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+
+class ServiceLease(Base):
+    __tablename__ = 'service_leases'
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    owner: Mapped[str] = mapped_column(String(128), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class ServiceState(Base):
+    __tablename__ = 'service_state'
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    value: Mapped[str] = mapped_column(Text, default='')
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+
+class FootprintSummary(Base):
+    __tablename__ = 'footprint_summaries'
+
+    user_id: Mapped[int] = mapped_column(ForeignKey('users.id'), primary_key=True)
+    profiles_json: Mapped[str] = mapped_column(Text, nullable=False, default='{}')
+    papers_count: Mapped[int] = mapped_column(Integer, default=0)
+    breaches_count: Mapped[int] = mapped_column(Integer, default=0)
+    last_event_id: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+
+class DiscoveredProfile(Base):
+    __tablename__ = 'discovered_profiles'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    # sha256 of user id, platform and profile URL.
+    profile_key: Mapped[str] = mapped_column(String(64), unique=True, index=True, nullable=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey('users.id'), index=True)
+    platform: Mapped[str] = mapped_column(String(128), nullable=False)
+    profile_url: Mapped[str] = mapped_column(Text, default='')
+    username: Mapped[str] = mapped_column(String(255), default='')
+    category: Mapped[str] = mapped_column(String(32), default='Social')
+    source: Mapped[str] = mapped_column(String(32), nullable=False)
+    is_self: Mapped[int] = mapped_column(Integer, default=0)
+    face_matched: Mapped[int] = mapped_column(Integer, default=0)
+    sightings: Mapped[int] = mapped_column(Integer, default=0)
+    last_event_id: Mapped[int] = mapped_column(Integer, default=0)
+    first_seen_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    last_seen_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+
+class UserPublication(Base):
+    __tablename__ = 'user_publications'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    # sha256 of user id and the paper's dedupe key (DOI, or title and year).
+    entry_key: Mapped[str] = mapped_column(String(64), unique=True, index=True, nullable=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey('users.id'), index=True)
+    dedupe_key: Mapped[str] = mapped_column(String(512), index=True, nullable=False)
+    doi: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    title: Mapped[str] = mapped_column(Text, nullable=False)
+    year: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    citations: Mapped[int] = mapped_column(Integer, default=0)
+    sightings: Mapped[int] = mapped_column(Integer, default=0)
+    last_event_id: Mapped[int] = mapped_column(Integer, default=0)
+    first_seen_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    last_seen_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+
+class BreachExposure(Base):
+    __tablename__ = 'breach_exposures'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    # sha256 of user id and lowercased breach site.
+    exposure_key: Mapped[str] = mapped_column(String(64), unique=True, index=True, nullable=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey('users.id'), index=True)
+    site: Mapped[str] = mapped_column(String(255), nullable=False)
+    email: Mapped[str] = mapped_column(String(255), default='')
+    data_classes: Mapped[str] = mapped_column(Text, default='')
+    breach_date: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    risk: Mapped[str] = mapped_column(String(16), default='low')
+    records: Mapped[int] = mapped_column(Integer, default=0)
+    last_event_id: Mapped[int] = mapped_column(Integer, default=0)
+    first_seen_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    last_seen_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+
 class UserSetting(Base):
     __tablename__ = 'user_settings'
 
@@ -255,6 +615,7 @@ class OAuthExchangeRequest(BaseModel):
 
 class UsernameRequest(BaseModel):
     username: str = Field(..., min_length=2, max_length=120)
+    mode: str = Field(default='exhaustive', pattern=r'^(fast|exhaustive)$')
 
     @field_validator('username')
     @classmethod
@@ -268,6 +629,7 @@ class UsernameRequest(BaseModel):
 class ResearchRequest(BaseModel):
     full_name: str | None = None
     institution: str | None = None
+    force_refresh: bool = False
 
     @field_validator('full_name', 'institution')
     @classmethod
@@ -285,6 +647,10 @@ class BreachRequest(BaseModel):
     email: EmailStr
 
 
+class BreachBatchRequest(BaseModel):
+    emails: list[EmailStr] = Field(..., min_length=1, max_length=50)
+
+
 class RiskRequest(BaseModel):
     public_profiles: int = Field(default=50, ge=0, le=100)
     research_visibility: int = Field(default=45, ge=0, le=100)
@@ -304,6 +670,8 @@ class ScrapeAggregateRequest(BaseModel):
     keywords: list[str] = Field(default_factory=list, max_length=20)
     max_pages: int = Field(default=6, ge=1, le=20)
     same_domain_only: bool = True
+    # 'best_first' fetches the most keyword-relevant links first instead of breadth-first.
+    frontier: str = Field(default='bfs', pattern=r'^(bfs|best_first)$')
 
     @field_validator('seed_urls')
     @classmethod
@@ -323,6 +691,8 @@ class ScrapeScheduleRequest(BaseModel):
     interval_minutes: int = Field(default=60, ge=5, le=1440)
     max_pages: int = Field(default=6, ge=1, le=20)
     same_domain_only: bool = True
+    # 'best_first' fetches the most keyword-relevant links first instead of breadth-first.
+    frontier: str = Field(default='bfs', pattern=r'^(bfs|best_first)$')
 
     @field_validator('seed_urls')
     @classmethod
@@ -355,9 +725,23 @@ def ensure_schema() -> None:
         if _schema_ready:
             return
         Base.metadata.create_all(bind=engine)
+        _ensure_publication_fts()
         _schema_ready = True
 
 
+def _ensure_publication_fts() -> None:
+    global _publication_fts_ready
+    try:
+        with engine.begin() as conn:
+            for statement in PUBLICATION_FTS_DDL:
+                conn.execute(text(statement))
+        _publication_fts_ready = True
+    except OperationalError as exc:
+        # SQLite builds without FTS5 fall back to LIKE scans over the publications table.
+        logger.warning('Publication full-text index unavailable: %s', exc)
+        _publication_fts_ready = False
+
+
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
@@ -424,6 +808,8 @@ def _upsert_oauth_user(db: Session, email: str, name: str) -> User:
     if user:
         if name and user.name != name:
             user.name = name
+            # Self-matching depends on the name; the footprint summary is rebuilt on next read.
+            db.query(FootprintSummary).filter(FootprintSummary.user_id == user.id).delete()
             db.commit()
             db.refresh(user)
         return user
@@ -474,10 +860,52 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     return require_user(db, token)
 
 
+def create_scrape_stream_token(user_id: int, job_id: str) -> str:
+    # No 'sub' claim: require_user rejects it, so the token opens one job's event stream and nothing else.
+    expire = datetime.now(timezone.utc) + timedelta(seconds=SCRAPE_JOB_STREAM_TOKEN_SECONDS)
+    payload = {'scope': 'scrape_events', 'uid': user_id, 'job': job_id, 'exp': expire}
+    return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
+
+
+def parse_scrape_stream_token(token: str, job_id: str) -> int | None:
+    for key in VERIFY_KEYS:
+        try:
+            payload = jwt.decode(token, key, algorithms=[ALGORITHM])
+        except JWTError:
+            continue
+        if payload.get('scope') != 'scrape_events' or payload.get('job') != job_id:
+            return None
+        user_id = payload.get('uid')
+        return user_id if isinstance(user_id, int) else None
+    return None
+
+
 def store_scan_event(db: Session, user: User, scan_type: str, payload: dict[str, Any]) -> None:
     event = ScanEvent(user_id=user.id, scan_type=scan_type, payload_json=json.dumps(payload))
     db.add(event)
     db.commit()
+    if scan_type in FOOTPRINT_SCAN_TYPES:
+        event_id = event.id
+        # A concurrent scan may insert the same profile, paper or breach first; the retry then updates its row.
+        for attempt in range(3):
+            try:
+                _index_scan_event(db, user, event_id, scan_type, payload)
+                db.commit()
+                break
+            except IntegrityError:
+                db.rollback()
+                if attempt == 2:
+                    raise
+        _apply_footprint_event(db, user, event_id, scan_type, payload)
+
+
+def incr_metric(name: str, amount: int = 1) -> None:
+    METRICS[name] += amount
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite drops tzinfo on read; stored values are always UTC.
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
 
 
 def store_audit_event(db: Session, event_type: str, user_id: int | None, details: dict[str, Any]) -> None:
@@ -580,8 +1008,59 @@ def startup() -> None:
         FACE_GALLERY_META.write_text('[]\n', encoding='utf-8')
     if SECRET_KEY == 'change-this-in-production-shadowgraph':
         logger.warning('Using default SECRET_KEY. Set SHADOWGRAPH_SECRET_KEY or SHADOWGRAPH_JWT_KEYS.')
+
+
+async def start_background_services() -> None:
+    global _scrape_wake
     if scheduler:
-        scheduler.start()
+        scheduler.add_job(
+            _run_breach_monitor, 'interval', minutes=BREACH_MONITOR_INTERVAL_MINUTES, id='breach-monitor', replace_existing=True
+        )
+        scheduler.add_job(
+            _ensure_hibp_catalog, 'interval', seconds=HIBP_CATALOG_TTL_SECONDS, id='hibp-catalog-refresh', replace_existing=True
+        )
+        # First tick runs immediately so schedules missed while no worker was up fire once on startup.
+        scheduler.add_job(
+            _dispatch_scrape_schedules,
+            'interval',
+            seconds=SCRAPE_SCHEDULE_TICK_SECONDS,
+            id='scrape-schedule-dispatch',
+            replace_existing=True,
+            next_run_time=datetime.now(timezone.utc),
+        )
+        if not scheduler.running:
+            scheduler.start()
+    _scrape_wake = asyncio.Event()
+    for index in range(SCRAPE_WORKER_COUNT):
+        SCRAPE_WORKERS.append(asyncio.create_task(_scrape_worker(f'{SCRAPE_WORKER_ID}:{index}')))
+
+
+async def stop_background_services() -> None:
+    for task in SCRAPE_WORKERS:
+        task.cancel()
+    await asyncio.gather(*SCRAPE_WORKERS, return_exceptions=True)
+    SCRAPE_WORKERS.clear()
+    if scheduler and scheduler.running:
+        scheduler.shutdown(wait=False)
+
+
+@app.on_event('startup')
+async def start_role_services() -> None:
+    if PROCESS_ROLE == 'all':
+        await start_background_services()
+
+
+@app.on_event('shutdown')
+async def stop_role_services() -> None:
+    await stop_background_services()
+
+
+@app.on_event('shutdown')
+def shutdown() -> None:
+    global _page_parse_executor
+    if _page_parse_executor is not None:
+        _page_parse_executor.shutdown(wait=False, cancel_futures=True)
+        _page_parse_executor = None
 
 
 @app.get('/health')
@@ -601,7 +1080,12 @@ def ops_readiness() -> dict[str, Any]:
         'face_gallery_exists': FACE_GALLERY_META.exists(),
     }
     missing = [k for k, v in checks.items() if not v]
-    return {'checks': checks, 'missing': missing, 'ready': len(missing) == 0}
+    return {'checks': checks, 'missing': missing, 'ready': len(missing) == 0, 'process_role': PROCESS_ROLE}
+
+
+@app.get('/ops/metrics')
+def ops_metrics() -> dict[str, Any]:
+    return {'counters': dict(sorted(METRICS.items()))}
 
 
 @app.post('/auth/signup', response_model=AuthResponse)
@@ -797,6 +1281,15 @@ def update_settings(
 def delete_account(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)) -> dict[str, Any]:
     store_audit_event(db, 'account.delete_requested', current_user.id, {'email': current_user.email})
     db.query(ScanEvent).filter(ScanEvent.user_id == current_user.id).delete()
+    _delete_scrape_jobs(db, [row.job_id for row in db.query(ScrapeJob.job_id).filter(ScrapeJob.user_id == current_user.id)])
+    schedule_ids = [row.schedule_id for row in db.query(ScrapeSchedule.schedule_id).filter(ScrapeSchedule.user_id == current_user.id)]
+    if schedule_ids:
+        db.query(CrawlPageState).filter(CrawlPageState.schedule_id.in_(schedule_ids)).delete(synchronize_session=False)
+    db.query(ScrapeSchedule).filter(ScrapeSchedule.user_id == current_user.id).delete()
+    db.query(FootprintSummary).filter(FootprintSummary.user_id == current_user.id).delete()
+    db.query(DiscoveredProfile).filter(DiscoveredProfile.user_id == current_user.id).delete()
+    db.query(UserPublication).filter(UserPublication.user_id == current_user.id).delete()
+    db.query(BreachExposure).filter(BreachExposure.user_id == current_user.id).delete()
     db.query(UserSetting).filter(UserSetting.user_id == current_user.id).delete()
     db.query(AuditEvent).filter(AuditEvent.user_id == current_user.id).delete()
     db.query(User).filter(User.id == current_user.id).delete()
@@ -1226,7 +1719,7 @@ async def _probe_name_search_links(client: httpx.AsyncClient, raw_name: str) ->
     return rows
 
 
-def _username_variants(raw_username: str) -> list[str]:
+def _username_variant_patterns(raw_username: str) -> list[tuple[str, str]]:
     normalized = re.sub(r'\s+', ' ', raw_username.strip().lower())
     if not normalized:
         return []
@@ -1236,32 +1729,32 @@ def _username_variants(raw_username: str) -> list[str]:
     if not parts:
         return []
 
-    variants: list[str] = []
+    candidates: list[tuple[str, str]] = []
     joined = ''.join(parts)
     if joined:
-        variants.append(joined)
+        candidates.append(('joined', joined))
 
     if len(parts) >= 2:
-        variants.extend(
+        candidates.extend(
             [
-                '.'.join(parts),
-                '_'.join(parts),
-                '-'.join(parts),
-                ''.join(reversed(parts)),
-                '.'.join(reversed(parts)),
-                '_'.join(reversed(parts)),
-                '-'.join(reversed(parts)),
+                ('dotted', '.'.join(parts)),
+                ('underscored', '_'.join(parts)),
+                ('hyphenated', '-'.join(parts)),
+                ('reversed', ''.join(reversed(parts))),
+                ('reversed_dotted', '.'.join(reversed(parts))),
+                ('reversed_underscored', '_'.join(reversed(parts))),
+                ('reversed_hyphenated', '-'.join(reversed(parts))),
             ]
         )
 
     # Keep already username-like raw input too.
     raw_compact = re.sub(r'[^a-z0-9._-]', '', normalized)
     if raw_compact:
-        variants.append(raw_compact)
+        candidates.append(('raw_compact', raw_compact))
 
-    unique: list[str] = []
+    unique: list[tuple[str, str]] = []
     seen: set[str] = set()
-    for variant in variants:
+    for pattern, variant in candidates:
         if not variant:
             continue
         if len(variant) < 2 or len(variant) > 40:
@@ -1271,10 +1764,98 @@ def _username_variants(raw_username: str) -> list[str]:
         if variant in seen:
             continue
         seen.add(variant)
-        unique.append(variant)
+        unique.append((pattern, variant))
     return unique[:12]
 
 
+def _username_variants(raw_username: str) -> list[str]:
+    return [variant for _, variant in _username_variant_patterns(raw_username)]
+
+
+def _variant_hit_stats(db: Session, limit: int = USERNAME_STATS_EVENT_LIMIT) -> dict[str, dict[str, dict[str, int]]]:
+    events = (
+        db.query(ScanEvent)
+        .filter(ScanEvent.scan_type == 'username_scan')
+        .order_by(ScanEvent.created_at.desc())
+        .limit(limit)
+        .all()
+    )
+
+    stats: dict[str, dict[str, dict[str, int]]] = defaultdict(lambda: defaultdict(lambda: {'probes': 0, 'hits': 0}))
+    for event in events:
+        payload = _safe_json(event.payload_json)
+        if payload.get('status') != 'live-scan':
+            continue
+        variant_patterns = payload.get('variant_patterns')
+        if not isinstance(variant_patterns, dict):
+            variant_patterns = {variant: pattern for pattern, variant in _username_variant_patterns(str(payload.get('username', '')))}
+        checked = [v for v in payload.get('username_variants_checked', []) if v in variant_patterns]
+        if not checked:
+            continue
+        pruned = payload.get('pruned_probes') or {}
+
+        for platform in PLATFORMS:
+            skipped = set(pruned.get(platform['name'], []))
+            for variant in checked:
+                pattern = variant_patterns[variant]
+                if pattern not in skipped:
+                    stats[platform['name']][pattern]['probes'] += 1
+
+        pattern_hits = payload.get('pattern_hits')
+        if isinstance(pattern_hits, dict):
+            for platform_name, hit_patterns in pattern_hits.items():
+                for pattern in set(hit_patterns):
+                    stats[platform_name][pattern]['hits'] += 1
+            continue
+        # Older events only stored the best row per platform, so they credit at most one pattern per scan.
+        for row in payload.get('results', []):
+            if row.get('status') != 'Found' or row.get('match_type'):
+                continue
+            pattern = row.get('variant_pattern') or variant_patterns.get(row.get('username', ''))
+            if pattern:
+                stats[row.get('platform', 'Unknown')][pattern]['hits'] += 1
+
+    return {platform: dict(patterns) for platform, patterns in stats.items()}
+
+
+def _cached_variant_hit_stats(db: Session) -> dict[str, dict[str, dict[str, int]]]:
+    now = time.time()
+    cached = VARIANT_HIT_STATS.get('stats')
+    if cached is not None and now - VARIANT_HIT_STATS.get('computed_at', 0.0) < USERNAME_STATS_TTL_SECONDS:
+        return cached
+    stats = _variant_hit_stats(db)
+    VARIANT_HIT_STATS['stats'] = stats
+    VARIANT_HIT_STATS['computed_at'] = now
+    return stats
+
+
+def _fast_probe_plan(
+    stats: dict[str, dict[str, dict[str, int]]],
+    patterns: list[str],
+    min_yield: float = USERNAME_FAST_MIN_YIELD,
+    min_samples: int = USERNAME_FAST_MIN_SAMPLES,
+) -> dict[str, list[str]]:
+    plan: dict[str, list[str]] = {}
+    for platform in PLATFORMS:
+        platform_stats = stats.get(platform['name'], {})
+        kept: list[str] = []
+        best_pattern = patterns[0] if patterns else None
+        best_rate = -1.0
+        for pattern in patterns:
+            row = platform_stats.get(pattern, {'probes': 0, 'hits': 0})
+            probes = int(row.get('probes', 0))
+            rate = (int(row.get('hits', 0)) / probes) if probes else 0.0
+            # Patterns without enough history are still probed so they can earn a hit rate.
+            if probes < min_samples or rate >= min_yield:
+                kept.append(pattern)
+            if rate > best_rate:
+                best_pattern, best_rate = pattern, rate
+        if not kept and best_pattern:
+            kept.append(best_pattern)
+        plan[platform['name']] = kept
+    return plan
+
+
 @app.post('/scan-username')
 async def scan_username(
     payload: UsernameRequest,
@@ -1286,9 +1867,21 @@ async def scan_username(
     raw_query = (payload.username or '').strip()
 
     try:
-        variants = _username_variants(payload.username)
+        variant_patterns = _username_variant_patterns(payload.username)
+        variants = [variant for _, variant in variant_patterns]
         name_search_rows: list[dict[str, Any]] = []
         found_results: list[dict[str, Any]] = []
+        probe_plan: dict[str, list[str]] | None = None
+        pruned_probes: dict[str, list[str]] = {}
+        pattern_hits: dict[str, list[str]] = {}
+        if payload.mode == 'fast' and variant_patterns:
+            patterns = [pattern for pattern, _ in variant_patterns]
+            probe_plan = _fast_probe_plan(_cached_variant_hit_stats(db), patterns)
+            for platform_name, kept in probe_plan.items():
+                skipped = [pattern for pattern in patterns if pattern not in kept]
+                if skipped:
+                    pruned_probes[platform_name] = skipped
+        probes_sent = 0
 
         async with httpx.AsyncClient(
             timeout=8,
@@ -1298,12 +1891,19 @@ async def scan_username(
             },
         ) as client:
             if variants:
-                probes = [
-                    _probe_platform(client, platform, variant)
+                probe_targets = [
+                    (platform, pattern, variant)
                     for platform in PLATFORMS
-                    for variant in variants
+                    for pattern, variant in variant_patterns
+                    if probe_plan is None or pattern in probe_plan.get(platform['name'], [])
                 ]
-                probed = await asyncio.gather(*probes)
+                probes_sent = len(probe_targets)
+                probed = await asyncio.gather(*[_probe_platform(client, platform, variant) for platform, _, variant in probe_targets])
+                for row, (_, pattern, _) in zip(probed, probe_targets):
+                    row['variant_pattern'] = pattern
+                    if row.get('status') == 'Found':
+                        # Every pattern that found the profile earns a hit, not just the row kept below.
+                        pattern_hits.setdefault(row['platform'], []).append(pattern)
 
                 # Pick best candidate per platform: Found > Not Found > Unknown, then lower latency.
                 score = {'Found': 3, 'Not Found': 2, 'Rate Limited': 1, 'Unknown': 0}
@@ -1345,10 +1945,15 @@ async def scan_username(
             'username': payload.username,
             'query_owner': query_owner,
             'username_variants_checked': variants,
+            'variant_patterns': {variant: pattern for pattern, variant in variant_patterns},
+            'scan_mode': payload.mode,
+            'pruned_probes': pruned_probes,
+            'pattern_hits': pattern_hits,
             'results': found_results,
             'summary': {
                 'total_platforms': len(PLATFORMS),
                 'found': len(found_results),
+                'probes_sent': probes_sent,
                 'duration_ms': duration_ms,
             },
             'status': 'live-scan',
@@ -1374,6 +1979,7 @@ async def scan_username(
             'username': payload.username,
             'query_owner': query_owner,
             'username_variants_checked': _username_variants(payload.username),
+            'scan_mode': payload.mode,
             'results': fallback_results,
             'summary': {
                 'total_platforms': len(NAME_SEARCH_PLATFORMS),
@@ -1387,9 +1993,35 @@ async def scan_username(
         return response_payload
 
 
+@app.get('/username/variant-stats')
+def username_variant_stats(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)) -> dict[str, Any]:
+    stats = _cached_variant_hit_stats(db)
+    platforms = []
+    for platform_name, patterns in sorted(stats.items()):
+        rows = []
+        for pattern, row in sorted(patterns.items()):
+            probes = row.get('probes', 0)
+            rows.append(
+                {
+                    'pattern': pattern,
+                    'probes': probes,
+                    'hits': row.get('hits', 0),
+                    'hit_rate': round(row.get('hits', 0) / probes, 4) if probes else 0.0,
+                }
+            )
+        platforms.append({'platform': platform_name, 'patterns': rows})
+    return {
+        'platforms': platforms,
+        'fast_mode': {'min_yield': USERNAME_FAST_MIN_YIELD, 'min_samples': USERNAME_FAST_MIN_SAMPLES},
+        'events_window': USERNAME_STATS_EVENT_LIMIT,
+        'status': 'aggregated',
+    }
+
+
 def _author_names(authors: list[dict[str, Any]]) -> str:
+    # The full list is indexed: the local search must find a person however far down the byline they are.
     names: list[str] = []
-    for author in authors[:5]:
+    for author in authors:
         given = author.get('given', '').strip()
         family = author.get('family', '').strip()
         full_name = f'{given} {family}'.strip()
@@ -1398,6 +2030,10 @@ def _author_names(authors: list[dict[str, Any]]) -> str:
     return ', '.join(names) if names else 'Unknown'
 
 
+def _display_authors(authors: str) -> str:
+    return ', '.join(authors.split(', ')[:RESEARCH_DISPLAY_AUTHORS]) if authors else authors
+
+
 def _name_variants(full_name: str) -> list[str]:
     normalized = re.sub(r'\s+', ' ', (full_name or '').strip())
     if not normalized:
@@ -1537,14 +2173,105 @@ def _author_match_score(author: dict[str, Any], profiles: list[dict[str, Any]])
     return best
 
 
-def _paper_passes_name_filter(item: dict[str, Any], profiles: list[dict[str, Any]]) -> bool:
-    if not profiles:
+AUTHOR_MATCH_THRESHOLD = 0.65
+
+
+# Compiles search name profiles once so scoring an author matches _author_match_score without re-scanning profiles.
+class AuthorMatcher:
+    _cache_limit = 50000
+
+    def __init__(self, profiles: list[dict[str, Any]]) -> None:
+        self.profiles = profiles
+        self.given_sets = [set(profile['given_tokens']) for profile in profiles]
+        self.given_initials = [{token[0] for token in profile['given_tokens'] if token} for profile in profiles]
+        self.family_index: dict[str, list[int]] = defaultdict(list)
+        # Character trie over profile family names: '$' marks profiles ending at a node, '*' every profile below it.
+        self.family_trie: dict[str, Any] = {'*': set()}
+        for idx, profile in enumerate(profiles):
+            family = profile['family']
+            self.family_index[family].append(idx)
+            node = self.family_trie
+            node['*'].add(idx)
+            for char in family:
+                node = node.setdefault(char, {'*': set()})
+                node['*'].add(idx)
+            node.setdefault('$', set()).add(idx)
+        self._author_tokens: dict[tuple[str, str], tuple[list[str], set[str], set[str], str]] = {}
+
+    def _normalize(self, author: dict[str, Any]) -> tuple[list[str], set[str], set[str], str]:
+        key = (author.get('given', '') or '', author.get('family', '') or '')
+        cached = self._author_tokens.get(key)
+        if cached is None:
+            given = _tokenize_name(key[0])
+            family_tokens = _tokenize_name(key[1])
+            cached = (given, set(given), {token[0] for token in given}, family_tokens[-1] if family_tokens else '')
+            if len(self._author_tokens) >= self._cache_limit:
+                self._author_tokens.clear()
+            self._author_tokens[key] = cached
+        return cached
+
+    def _family_scores(self, author_family: str) -> dict[int, float]:
+        scores: dict[int, float] = {}
+        if not author_family:
+            return scores
+        node = self.family_trie
+        for char in author_family:
+            node = node.get(char)
+            if node is None:
+                break
+            # Profile families that are a proper prefix of the author's family.
+            for idx in node.get('$', ()):
+                scores[idx] = 0.45
+        else:
+            # Profile families that extend the author's family.
+            for idx in node['*']:
+                scores[idx] = 0.45
+        for idx in self.family_index.get(author_family, ()):
+            scores[idx] = 0.7
+        return scores
+
+    def _given_score(self, idx: int, given: list[str], given_set: set[str], initials: set[str]) -> float:
+        profile_given = self.profiles[idx]['given_tokens']
+        if profile_given and given:
+            if self.given_sets[idx] & given_set:
+                return 0.3
+            if self.given_initials[idx] & initials:
+                return 0.2
+        elif not profile_given and given:
+            if self.profiles[idx]['family'] in given_set:
+                return 0.25
+        return 0.0
+
+    def score(self, author: dict[str, Any]) -> float:
+        given, given_set, initials, family = self._normalize(author)
+        family_scores = self._family_scores(family)
+        best = 0.0
+        for idx in range(len(self.profiles)):
+            score = family_scores.get(idx, 0.0) + self._given_score(idx, given, given_set, initials)
+            best = max(best, min(score, 1.0))
+        return best
+
+    def matches(self, author: dict[str, Any], threshold: float = AUTHOR_MATCH_THRESHOLD) -> bool:
+        given, given_set, initials, family = self._normalize(author)
+        # Given-name evidence alone tops out at 0.3, so only family candidates can clear the threshold.
+        for idx, family_score in self._family_scores(family).items():
+            if min(family_score + self._given_score(idx, given, given_set, initials), 1.0) >= threshold:
+                return True
+        return False
+
+
+def _paper_passes_name_filter(item: dict[str, Any], matcher: AuthorMatcher) -> bool:
+    if not matcher.profiles:
         return True
     authors = item.get('author', []) or []
     if not authors:
         return False
 
-    return any(_author_match_score(author, profiles) >= 0.65 for author in authors)
+    return any(matcher.matches(author) for author in authors)
+
+
+def _paper_dedupe_key(doi: str | None, title: str, year: int | None) -> str:
+    return (doi or f'{title.lower()}::{year or "na"}').strip().lower()
 
 
 def _paper_from_crossref_item(item: dict[str, Any]) -> dict[str, Any]:
@@ -1558,7 +2285,6 @@ def _paper_from_crossref_item(item: dict[str, Any]) -> dict[str, Any]:
     abstract_text = re.sub(r'<[^>]+>', ' ', abstract_raw)
     abstract_text = _normalize_text(abstract_text)
     title = title_values[0] if title_values else 'Untitled'
-    dedupe_key = (doi or f'{title.lower()}::{year or "na"}').strip()
 
     return {
         'title': title,
@@ -1569,10 +2295,287 @@ def _paper_from_crossref_item(item: dict[str, Any]) -> dict[str, Any]:
         'doi': doi,
         'url': url,
         'summary': abstract_text[:420] if abstract_text else 'Summary not provided by source.',
-        '_dedupe_key': dedupe_key.lower(),
+        '_dedupe_key': _paper_dedupe_key(doi, title, year),
+    }
+
+
+def _crossref_cache_key(query_params: dict[str, Any]) -> str:
+    normalized = {
+        key: re.sub(r'\s+', ' ', str(value).strip().lower()) if key.startswith('query') else str(value)
+        for key, value in query_params.items()
+    }
+    return hashlib.sha256(json.dumps(normalized, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _load_crossref_cache(cache_key: str) -> dict[str, Any] | None:
+    db = SessionLocal()
+    try:
+        entry = db.query(CrossrefCacheEntry).filter(CrossrefCacheEntry.cache_key == cache_key).first()
+        if not entry:
+            return None
+        return {
+            'body': zlib.decompress(entry.body),
+            'etag': entry.etag,
+            'last_modified': entry.last_modified,
+            'fetched_at': _as_utc(entry.fetched_at),
+        }
+    except zlib.error:
+        return None
+    finally:
+        db.close()
+
+
+def _store_crossref_cache(
+    cache_key: str,
+    query_params: dict[str, Any],
+    body: bytes | None,
+    etag: str | None,
+    last_modified: str | None,
+) -> None:
+    now = datetime.now(timezone.utc)
+    db = SessionLocal()
+    try:
+        # Two concurrent misses for the same key both try to insert; the loser retries as an update of the winner's row.
+        for _ in range(2):
+            entry = db.query(CrossrefCacheEntry).filter(CrossrefCacheEntry.cache_key == cache_key).first()
+            if not entry:
+                entry = CrossrefCacheEntry(cache_key=cache_key, params_json=json.dumps(query_params, sort_keys=True))
+                db.add(entry)
+            if body is not None:
+                entry.body = zlib.compress(body, 6)
+                entry.etag = etag
+                entry.last_modified = last_modified
+            entry.fetched_at = now
+            try:
+                db.flush()
+            except IntegrityError:
+                db.rollback()
+                continue
+            break
+        db.query(CrossrefCacheEntry).filter(
+            CrossrefCacheEntry.fetched_at < now - timedelta(days=CROSSREF_CACHE_RETENTION_DAYS)
+        ).delete()
+        db.commit()
+    finally:
+        db.close()
+
+
+async def _crossref_cached_get(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    query_params: dict[str, Any],
+    force_refresh: bool = False,
+    cache_params: dict[str, Any] | None = None,
+    require_live: bool = False,
+) -> tuple[bytes, bool]:
+    # The flag is True only for a body fetched from Crossref just now; cached bodies carry stale cursors.
+    # require_live is the internal refetch for a usable cursor and is counted apart from user-requested bypasses.
+    cache_params = cache_params if cache_params is not None else query_params
+    cache_key = _crossref_cache_key(cache_params)
+    cached = None if force_refresh or require_live else _load_crossref_cache(cache_key)
+    if force_refresh:
+        incr_metric('crossref_cache.bypass')
+    elif require_live:
+        incr_metric('crossref_cache.cursor_refetch')
+    elif cached is None:
+        incr_metric('crossref_cache.miss')
+    elif (datetime.now(timezone.utc) - cached['fetched_at']).total_seconds() < CROSSREF_CACHE_TTL_SECONDS:
+        incr_metric('crossref_cache.hit')
+        return cached['body'], False
+
+    headers: dict[str, str] = {}
+    if cached and cached.get('etag'):
+        headers['If-None-Match'] = cached['etag']
+    if cached and cached.get('last_modified'):
+        headers['If-Modified-Since'] = cached['last_modified']
+
+    try:
+        async with semaphore:
+            response = await client.get(CROSSREF_WORKS_URL, params=query_params, headers=headers)
+    except httpx.HTTPError:
+        if cached is None:
+            raise
+        incr_metric('crossref_cache.stale_served')
+        return cached['body'], False
+
+    if cached is not None and response.status_code == 304:
+        incr_metric('crossref_cache.revalidated')
+        _store_crossref_cache(cache_key, cache_params, None, None, None)
+        return cached['body'], False
+
+    if cached is not None and response.status_code >= 500:
+        # An upstream outage is no reason to drop a usable (if stale) entry.
+        incr_metric('crossref_cache.stale_served')
+        return cached['body'], False
+
+    response.raise_for_status()
+    response.json()
+    if cached is not None:
+        incr_metric('crossref_cache.refreshed')
+    _store_crossref_cache(
+        cache_key,
+        cache_params,
+        response.content,
+        response.headers.get('etag'),
+        response.headers.get('last-modified'),
+    )
+    return response.content, True
+
+
+def _index_publications(db: Session, papers: dict[str, dict[str, Any]]) -> None:
+    if not papers:
+        return
+    now = datetime.now(timezone.utc)
+    existing = {
+        row.dedupe_key: row
+        for row in db.query(Publication).filter(Publication.dedupe_key.in_(list(papers.keys()))).all()
+    }
+    for key, paper in papers.items():
+        row = existing.get(key)
+        if not row:
+            row = Publication(dedupe_key=key, first_seen_at=now)
+            db.add(row)
+        row.doi = paper.get('doi')
+        row.title = paper.get('title') or 'Untitled'
+        row.authors = paper.get('authors') or ''
+        row.source = paper.get('source') or ''
+        row.year = paper.get('year')
+        row.citations = max(int(paper.get('citations') or 0), row.citations or 0)
+        row.url = paper.get('url')
+        row.summary = paper.get('summary') or ''
+        row.last_seen_at = now
+    db.commit()
+
+
+def _serialize_publication(row: Publication) -> dict[str, Any]:
+    return {
+        'title': row.title,
+        'authors': row.authors,
+        'source': row.source,
+        'year': row.year,
+        'citations': row.citations,
+        'doi': row.doi,
+        'url': row.url,
+        'summary': row.summary,
     }
 
 
+def _authors_from_text(authors: str) -> list[dict[str, str]]:
+    rows: list[dict[str, str]] = []
+    for name in (authors or '').split(','):
+        parts = name.split()
+        if parts:
+            rows.append({'given': ' '.join(parts[:-1]), 'family': parts[-1]})
+    return rows
+
+
+def _search_local_publications(
+    db: Session,
+    full_name: str,
+    institution: str,
+    matcher: AuthorMatcher,
+    limit: int = 40,
+) -> dict[str, dict[str, Any]]:
+    ensure_schema()
+    # Candidate rows only need a plausible family name; the author filter below does the real matching.
+    family_tokens = sorted({profile['family'] for profile in matcher.profiles if len(profile['family']) >= 2})
+    institution_tokens = re.findall(r'[a-z0-9]{3,}', (institution or '').lower())
+    if not family_tokens and not institution_tokens:
+        return {}
+
+    if _publication_fts_ready:
+        if family_tokens:
+            match = 'authors : (' + ' OR '.join(f'"{token}"*' for token in family_tokens) + ')'
+        else:
+            match = ' AND '.join(f'{{title source summary}} : "{token}"' for token in institution_tokens)
+        ids = [
+            row[0]
+            for row in db.execute(
+                text('SELECT rowid FROM publications_fts WHERE publications_fts MATCH :match ORDER BY rank LIMIT :limit'),
+                {'match': match, 'limit': limit},
+            )
+        ]
+        rows = db.query(Publication).filter(Publication.id.in_(ids)).all() if ids else []
+    else:
+        query = db.query(Publication)
+        if family_tokens:
+            query = query.filter(or_(*[Publication.authors.ilike(f'%{token}%') for token in family_tokens]))
+        for token in institution_tokens if not family_tokens else []:
+            pattern = f'%{token}%'
+            query = query.filter(Publication.title.ilike(pattern) | Publication.source.ilike(pattern) | Publication.summary.ilike(pattern))
+        rows = query.limit(limit).all()
+
+    results: dict[str, dict[str, Any]] = {}
+    for row in rows:
+        # FTS matches tokens anywhere in the author list, so re-check against a single author.
+        if family_tokens and not _paper_passes_name_filter({'author': _authors_from_text(row.authors)}, matcher):
+            continue
+        results[row.dedupe_key] = _serialize_publication(row)
+    return results
+
+
+async def _stream_crossref_query(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    query_params: dict[str, Any],
+    target: int,
+    accept: Callable[[dict[str, Any]], bool],
+    force_refresh: bool = False,
+    errors: list[str] | None = None,
+) -> list[dict[str, Any]]:
+    collected: list[dict[str, Any]] = []
+    cursor = '*'
+    for page_index in range(CROSSREF_MAX_PAGES):
+        page_params = {**query_params, 'select': CROSSREF_SELECT_FIELDS, 'rows': CROSSREF_PAGE_ROWS, 'cursor': cursor}
+        # Cursor tokens are per-session, so cached pages are keyed by their position instead.
+        cache_params = {**query_params, 'select': CROSSREF_SELECT_FIELDS, 'rows': CROSSREF_PAGE_ROWS, 'page': page_index}
+        try:
+            body, live = await _crossref_cached_get(client, semaphore, page_params, force_refresh, cache_params)
+            message = json.loads(body).get('message', {})
+        except (httpx.HTTPError, ValueError) as exc:
+            if page_index == 0:
+                raise
+            # A later page failing keeps what earlier pages produced; the caller reports it as partial.
+            if errors is not None:
+                errors.append(_crossref_error_label(exc))
+            break
+
+        items = message.get('items', [])
+        for item in items:
+            if not accept(item):
+                continue
+            collected.append(item)
+            if len(collected) >= target:
+                return collected
+
+        if len(items) < CROSSREF_PAGE_ROWS or not message.get('next-cursor'):
+            break
+        if not live:
+            # A cached body's next-cursor belongs to an expired session. Refetch this page live for a
+            # usable cursor; the request cursor itself is live because every earlier page was.
+            try:
+                body, _ = await _crossref_cached_get(client, semaphore, page_params, cache_params=cache_params, require_live=True)
+                message = json.loads(body).get('message', {})
+            except (httpx.HTTPError, ValueError) as exc:
+                if errors is not None:
+                    errors.append(_crossref_error_label(exc))
+                break
+        cursor = message.get('next-cursor')
+        if not cursor:
+            break
+    return collected
+
+
+def _crossref_error_label(exc: BaseException) -> str:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return f'http-{exc.response.status_code}'
+    if isinstance(exc, httpx.TimeoutException):
+        return 'timeout'
+    if isinstance(exc, httpx.HTTPError):
+        return 'network-error'
+    return 'invalid-response'
+
+
 @app.post('/search-research')
 async def search_research(
     payload: ResearchRequest,
@@ -1582,67 +2585,116 @@ async def search_research(
     full_name = (payload.full_name or '').strip()
     institution = (payload.institution or '').strip()
     name_variants = _name_variants(full_name)
-    name_profiles = _name_profiles(name_variants)
+    author_matcher = AuthorMatcher(_name_profiles(name_variants))
 
-    query_params_list: list[dict[str, Any]] = []
+    query_params_list: list[tuple[str, dict[str, Any], int]] = []
     query_modes_used: list[str] = []
 
     if name_variants and institution:
         for variant in name_variants:
             query_params_list.append(
-                {
-                    'query.author': variant,
-                    'query.affiliation': institution,
-                    'rows': 8,
-                    'sort': 'relevance',
-                    'order': 'desc',
-                }
+                (
+                    'name_and_institution',
+                    {
+                        'query.author': variant,
+                        'query.affiliation': institution,
+                        'sort': 'relevance',
+                        'order': 'desc',
+                    },
+                    8,
+                )
             )
         query_modes_used.append('name_and_institution')
 
     if name_variants:
         for variant in name_variants:
             query_params_list.append(
-                {
-                    'query.author': variant,
-                    'rows': 6,
-                    'sort': 'relevance',
-                    'order': 'desc',
-                }
+                (
+                    'name_only',
+                    {
+                        'query.author': variant,
+                        'sort': 'relevance',
+                        'order': 'desc',
+                    },
+                    6,
+                )
             )
         query_modes_used.append('name_only')
 
     if institution:
         query_params_list.append(
-            {
-                'query.affiliation': institution,
-                'rows': 6,
-                'sort': 'relevance',
-                'order': 'desc',
-            }
+            (
+                'institution_only',
+                {
+                    'query.affiliation': institution,
+                    'sort': 'relevance',
+                    'order': 'desc',
+                },
+                6,
+            )
         )
         query_modes_used.append('institution_only')
 
-    papers_by_key: dict[str, dict[str, Any]] = {}
-    try:
-        async with httpx.AsyncClient(
-            timeout=10,
-            headers={'User-Agent': 'ShadowGraph/0.3 (mailto:research@shadowgraph.local)'},
-        ) as client:
-            for query_params in query_params_list:
-                response = await client.get('https://api.crossref.org/works', params=query_params)
-                response.raise_for_status()
-                items = response.json().get('message', {}).get('items', [])
-                for item in items:
-                    if full_name and not _paper_passes_name_filter(item, name_profiles):
-                        continue
-                    paper = _paper_from_crossref_item(item)
-                    key = paper.pop('_dedupe_key')
-                    existing = papers_by_key.get(key)
-                    if not existing or paper.get('citations', 0) > existing.get('citations', 0):
-                        papers_by_key[key] = paper
-    except httpx.HTTPError:
-        papers_by_key = {}
+    def accept(item: dict[str, Any]) -> bool:
+        return not full_name or _paper_passes_name_filter(item, author_matcher)
+
+    local_papers = _search_local_publications(db, full_name, institution, author_matcher)
+
+    semaphore = asyncio.Semaphore(CROSSREF_MAX_CONCURRENCY)
+    async with httpx.AsyncClient(
+        timeout=10,
+        headers={'User-Agent': 'ShadowGraph/0.3 (mailto:research@shadowgraph.local)'},
+    ) as client:
+        page_errors: list[list[str]] = [[] for _ in query_params_list]
+        outcomes = await asyncio.gather(
+            *[
+                _stream_crossref_query(client, semaphore, query_params, target, accept, payload.force_refresh, errors)
+                for (_, query_params, target), errors in zip(query_params_list, page_errors)
+            ],
+            return_exceptions=True,
+        )
+
+    live_papers: dict[str, dict[str, Any]] = {}
+    query_status: dict[str, dict[str, Any]] = {
+        mode: {'queries': 0, 'succeeded': 0, 'failed': 0, 'partial': 0, 'errors': []} for mode in query_modes_used
+    }
+    # Merge in query order so the surviving row for a duplicate paper does not depend on timing.
+    for (mode, _, _), outcome, errors in zip(query_params_list, outcomes, page_errors):
+        mode_status = query_status[mode]
+        mode_status['queries'] += 1
+        if isinstance(outcome, BaseException):
+            if not isinstance(outcome, (httpx.HTTPError, ValueError)):
+                raise outcome
+            mode_status['failed'] += 1
+            mode_status['errors'].append(_crossref_error_label(outcome))
+            continue
+        mode_status['succeeded'] += 1
+        if errors:
+            # Deeper pages were lost; the papers from earlier pages are still used.
+            mode_status['partial'] += 1
+            mode_status['errors'].extend(errors)
+        for item in outcome:
+            paper = _paper_from_crossref_item(item)
+            key = paper.pop('_dedupe_key')
+            existing = live_papers.get(key)
+            if not existing or paper.get('citations', 0) > existing.get('citations', 0):
+                live_papers[key] = paper
+
+    _index_publications(db, live_papers)
+    papers_by_key: dict[str, dict[str, Any]] = {
+        key: {**paper, 'authors': _display_authors(paper['authors']), 'provenance': 'local'} for key, paper in local_papers.items()
+    }
+    for key, paper in live_papers.items():
+        papers_by_key[key] = {**paper, 'authors': _display_authors(paper['authors']), 'provenance': 'live'}
+
+    failed_queries = sum(row['failed'] for row in query_status.values())
+    partial_queries = sum(row['partial'] for row in query_status.values())
+    if not failed_queries and not partial_queries:
+        search_status = 'live-search'
+    elif failed_queries < len(query_params_list):
+        search_status = 'partial-results'
+    else:
+        search_status = 'upstream-error'
 
     papers = sorted(
         papers_by_key.values(),
@@ -1655,141 +2707,546 @@ async def search_research(
         'institution': institution,
         'name_variants_checked': name_variants,
         'query_modes_used': query_modes_used,
+        'query_status': query_status,
         'papers': papers,
+        'sources': {
+            'local': sum(1 for paper in papers if paper['provenance'] == 'local'),
+            'live': sum(1 for paper in papers if paper['provenance'] == 'live'),
+        },
         'provider': 'Crossref',
-        'status': 'live-search',
+        'status': search_status,
     }
     store_scan_event(db, current_user, 'research_search', response_payload)
     return response_payload
 
 
-@app.post('/check-breach')
-async def check_breach(
-    payload: BreachRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-) -> dict[str, Any]:
-    api_key = os.getenv('HIBP_API_KEY', '').strip()
-    if not api_key:
-        response_payload = {
-            'email': payload.email,
-            'breaches': [],
-            'provider': 'Have I Been Pwned',
-            'status': 'api-key-missing',
-            'message': 'Set HIBP_API_KEY to enable live breach lookup.',
-        }
-        store_scan_event(db, current_user, 'breach_check', response_payload)
-        return response_payload
-
-    url = f'https://haveibeenpwned.com/api/v3/breachedaccount/{payload.email}'
-    headers = {
-        'hibp-api-key': api_key,
-        'user-agent': 'ShadowGraph/0.3',
+def _catalog_entry(row: HibpBreach) -> dict[str, Any]:
+    try:
+        data_classes = json.loads(row.data_classes_json or '[]')
+    except json.JSONDecodeError:
+        data_classes = []
+    return {
+        'name': row.name,
+        'title': row.title,
+        'domain': row.domain,
+        'breach_date': row.breach_date,
+        'pwn_count': row.pwn_count,
+        'data_classes': data_classes,
     }
-    params = {'truncateResponse': 'false'}
 
+
+def _load_hibp_catalog(db: Session) -> None:
+    rows = db.query(HibpBreach).all()
+    HIBP_CATALOG.clear()
+    HIBP_CATALOG.update({row.name.lower(): _catalog_entry(row) for row in rows})
+    if rows:
+        HIBP_CATALOG_STATE['refreshed_at'] = max(_as_utc(row.refreshed_at) for row in rows).timestamp()
+
+
+def _store_hibp_catalog(db: Session, raw_breaches: list[dict[str, Any]]) -> None:
+    now = datetime.now(timezone.utc)
+    existing = {row.name: row for row in db.query(HibpBreach).all()}
+    for breach in raw_breaches:
+        name = breach.get('Name')
+        if not name:
+            continue
+        row = existing.get(name)
+        if not row:
+            row = HibpBreach(name=name)
+            db.add(row)
+        row.title = breach.get('Title') or name
+        row.domain = breach.get('Domain') or ''
+        row.breach_date = breach.get('BreachDate')
+        row.pwn_count = int(breach.get('PwnCount') or 0)
+        row.data_classes_json = json.dumps(breach.get('DataClasses') or [])
+        row.refreshed_at = now
+    db.commit()
+    _load_hibp_catalog(db)
+
+
+async def _ensure_hibp_catalog(force: bool = False) -> None:
+    if not HIBP_CATALOG:
+        db = SessionLocal()
+        try:
+            _load_hibp_catalog(db)
+        finally:
+            db.close()
+    now = time.time()
+    if not force and now - HIBP_CATALOG_STATE['refreshed_at'] < HIBP_CATALOG_TTL_SECONDS:
+        return
+    async with _hibp_catalog_lock:
+        # Another task may have refreshed while we waited; forced refreshes are throttled too.
+        if now - HIBP_CATALOG_STATE['attempted_at'] < HIBP_CATALOG_MIN_REFRESH_SECONDS:
+            return
+        HIBP_CATALOG_STATE['attempted_at'] = now
+        try:
+            async with httpx.AsyncClient(timeout=30, headers={'user-agent': 'ShadowGraph/0.3'}) as client:
+                response = await client.get(HIBP_CATALOG_URL)
+            response.raise_for_status()
+            raw_breaches = response.json()
+        except (httpx.HTTPError, ValueError) as exc:
+            incr_metric('hibp_catalog.refresh_failed')
+            logger.warning('HIBP breach catalog refresh failed: %s', exc)
+            return
+        db = SessionLocal()
+        try:
+            _store_hibp_catalog(db, raw_breaches)
+        finally:
+            db.close()
+        incr_metric('hibp_catalog.refreshed')
+
+
+HIBP_TOKEN_BUCKET_SCRIPT = """
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local burst = tonumber(ARGV[3])
+local max_wait = tonumber(ARGV[4])
+local penalty_until = tonumber(ARGV[5])
+local cost = tonumber(ARGV[6])
+local tat = tonumber(redis.call('GET', KEYS[1]) or '0')
+tat = math.max(tat, now, penalty_until)
+local wait = math.max(0, tat - now - (burst - 1) * interval)
+if max_wait >= 0 and wait > max_wait then
+  return -1
+end
+local new_tat = tat + interval * cost
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000) + 1000)
+return tostring(wait)
+"""
+
+
+def _hibp_reserve_local(now: float, interval: float, max_wait: float, penalty_until: float = 0.0, cost: int = 1) -> float:
+    tat = max(HIBP_BUCKET_STATE.get('tat', 0.0), now, penalty_until)
+    wait = max(0.0, tat - now - (HIBP_BURST - 1) * interval)
+    if max_wait >= 0 and wait > max_wait:
+        return -1.0
+    HIBP_BUCKET_STATE['tat'] = tat + interval * cost
+    return wait
+
+
+async def _hibp_reserve(max_wait: float, penalty_until: float = 0.0, cost: int = 1) -> float:
+    # Reserves the next free slot on the key's shared schedule (GCRA); returns the wait, or -1 if the queue is full.
+    now = time.time()
+    interval = 60.0 / HIBP_RATE_PER_MINUTE
+    if redis_client is not None:
+        try:
+            result = await redis_client.eval(
+                HIBP_TOKEN_BUCKET_SCRIPT, 1, HIBP_BUCKET_KEY, now, interval, HIBP_BURST, max_wait, penalty_until, cost
+            )
+            return float(result)
+        except Exception as exc:
+            # Fail closed: a per-process bucket would let every replica spend the whole shared key quota.
+            incr_metric('hibp.redis_unavailable')
+            logger.warning('HIBP rate schedule unavailable in Redis, refusing request: %s', exc)
+            return -1.0
+    return _hibp_reserve_local(now, interval, max_wait, penalty_until, cost)
+
+
+async def _hibp_acquire(max_wait: float = HIBP_MAX_QUEUE_WAIT_SECONDS) -> bool:
+    wait = await _hibp_reserve(max_wait)
+    if wait < 0:
+        incr_metric('hibp.queue_rejected')
+        return False
+    if wait > 0:
+        incr_metric('hibp.queued')
+        await asyncio.sleep(wait)
+    return True
+
+
+async def _hibp_penalize(retry_after: float) -> None:
+    # Push the shared schedule past Retry-After so every worker backs off, not just this request.
+    await _hibp_reserve(-1, time.time() + retry_after, cost=0)
+
+
+def _retry_after_seconds(response: httpx.Response) -> float:
     try:
-        async with httpx.AsyncClient(timeout=10, headers=headers) as client:
+        return max(1.0, float(response.headers.get('retry-after', '2')))
+    except ValueError:
+        return 2.0
+
+
+def _breach_payload(email: str, status_name: str, breaches: list[dict[str, Any]] | None = None, message: str | None = None) -> dict[str, Any]:
+    payload: dict[str, Any] = {
+        'email': email,
+        'breaches': breaches or [],
+        'provider': 'Have I Been Pwned',
+        'status': status_name,
+    }
+    if message:
+        payload['message'] = message
+    return payload
+
+
+async def _hibp_lookup(client: httpx.AsyncClient, email: str, max_wait: float = HIBP_MAX_QUEUE_WAIT_SECONDS) -> dict[str, Any]:
+    url = f'https://haveibeenpwned.com/api/v3/breachedaccount/{email}'
+    # Breach metadata is identical for every account, so only names are fetched and joined with the local catalog.
+    params = {'truncateResponse': 'true'}
+    deadline = time.time() + max_wait
+
+    for _ in range(HIBP_MAX_RETRIES + 1):
+        if not await _hibp_acquire(max(0.0, deadline - time.time())):
+            return _breach_payload(email, 'rate-limited', message='HIBP request queue is full; try again shortly.')
+        incr_metric('hibp.requests')
+        try:
             response = await client.get(url, params=params)
-    except httpx.HTTPError:
-        response_payload = {
-            'email': payload.email,
-            'breaches': [],
-            'provider': 'Have I Been Pwned',
-            'status': 'network-error',
-        }
-        store_scan_event(db, current_user, 'breach_check', response_payload)
-        return response_payload
+        except httpx.HTTPError:
+            return _breach_payload(email, 'network-error')
+        if response.status_code != 429:
+            break
+        incr_metric('hibp.upstream_429')
+        await _hibp_penalize(_retry_after_seconds(response))
+    else:
+        return _breach_payload(email, 'rate-limited')
 
     if response.status_code == 404:
-        response_payload = {
-            'email': payload.email,
-            'breaches': [],
-            'provider': 'Have I Been Pwned',
-            'status': 'no-breaches',
-        }
-        store_scan_event(db, current_user, 'breach_check', response_payload)
-        return response_payload
+        return _breach_payload(email, 'no-breaches')
 
     if response.status_code in (401, 403):
-        response_payload = {
-            'email': payload.email,
-            'breaches': [],
-            'provider': 'Have I Been Pwned',
-            'status': 'auth-error',
-            'message': 'HIBP API key rejected.',
-        }
-        store_scan_event(db, current_user, 'breach_check', response_payload)
-        return response_payload
-
-    if response.status_code == 429:
-        response_payload = {
-            'email': payload.email,
-            'breaches': [],
-            'provider': 'Have I Been Pwned',
-            'status': 'rate-limited',
-        }
-        store_scan_event(db, current_user, 'breach_check', response_payload)
-        return response_payload
+        return _breach_payload(email, 'auth-error', message='HIBP API key rejected.')
 
     try:
         response.raise_for_status()
     except httpx.HTTPStatusError:
-        response_payload = {
-            'email': payload.email,
-            'breaches': [],
-            'provider': 'Have I Been Pwned',
-            'status': 'upstream-error',
-        }
-        store_scan_event(db, current_user, 'breach_check', response_payload)
-        return response_payload
+        return _breach_payload(email, 'upstream-error')
 
-    raw_breaches = response.json()
-    breaches: list[dict[str, Any]] = []
+    names = [breach.get('Name') for breach in response.json() if breach.get('Name')]
+    await _ensure_hibp_catalog()
+    if any(name.lower() not in HIBP_CATALOG for name in names):
+        # A breach newer than the catalog snapshot; refresh once (throttled) before joining.
+        await _ensure_hibp_catalog(force=True)
 
-    for breach in raw_breaches:
-        exposed_data = breach.get('DataClasses', [])
+    breaches: list[dict[str, Any]] = []
+    for name in names:
+        entry = HIBP_CATALOG.get(name.lower())
+        if entry is None:
+            # Still unknown (refresh throttled or failed): no data classes to judge by, so never report it as low risk.
+            incr_metric('hibp.metadata_unavailable')
+            breaches.append({'site': name, 'data': '', 'date': None, 'risk': 'unknown', 'records': 0, 'metadata': 'unavailable'})
+            continue
+        exposed_data = entry.get('data_classes', [])
         risk = 'high' if len(exposed_data) >= 4 else 'low'
         breaches.append(
             {
-                'site': breach.get('Name'),
+                'site': name,
                 'data': ', '.join(exposed_data[:6]),
-                'date': breach.get('BreachDate'),
+                'date': entry.get('breach_date'),
                 'risk': risk,
-                'records': breach.get('PwnCount', 0),
+                'records': entry.get('pwn_count', 0),
             }
         )
 
-    response_payload = {
-        'email': payload.email,
-        'breaches': breaches,
-        'provider': 'Have I Been Pwned',
-        'status': 'live-check',
-    }
+    return _breach_payload(email, 'live-check', breaches)
+
+
+def _hibp_client(api_key: str) -> httpx.AsyncClient:
+    return httpx.AsyncClient(timeout=10, headers={'hibp-api-key': api_key, 'user-agent': 'ShadowGraph/0.3'})
+
+
+@app.post('/check-breach')
+async def check_breach(
+    payload: BreachRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> dict[str, Any]:
+    api_key = os.getenv('HIBP_API_KEY', '').strip()
+    if not api_key:
+        response_payload = _breach_payload(
+            payload.email, 'api-key-missing', message='Set HIBP_API_KEY to enable live breach lookup.'
+        )
+        store_scan_event(db, current_user, 'breach_check', response_payload)
+        return response_payload
+
+    async with _hibp_client(api_key) as client:
+        response_payload = await _hibp_lookup(client, payload.email)
     store_scan_event(db, current_user, 'breach_check', response_payload)
     return response_payload
 
 
+def _last_breach_sites(db: Session, user_id: int, email: str) -> set[str] | None:
+    events = (
+        db.query(ScanEvent)
+        .filter(ScanEvent.user_id == user_id, ScanEvent.scan_type == 'breach_check')
+        .order_by(ScanEvent.created_at.desc())
+        .limit(50)
+        .all()
+    )
+    for event in events:
+        payload = _safe_json(event.payload_json)
+        if str(payload.get('email', '')).lower() != email.lower():
+            continue
+        if payload.get('status') not in ('live-check', 'no-breaches'):
+            continue
+        return {row.get('site') for row in payload.get('breaches', []) if row.get('site')}
+    return None
+
+
+def _load_service_state(name: str, default: str = '') -> str:
+    db = SessionLocal()
+    try:
+        value = db.query(ServiceState.value).filter(ServiceState.name == name).scalar()
+        return default if value is None else value
+    finally:
+        db.close()
+
+
+def _save_service_state(name: str, value: str) -> None:
+    # Small cross-process state (e.g. the breach monitor cursor) shared by every API and worker process.
+    now = datetime.now(timezone.utc)
+    db = SessionLocal()
+    try:
+        if db.query(ServiceState).filter(ServiceState.name == name).update({ServiceState.value: value, ServiceState.updated_at: now}):
+            db.commit()
+            return
+        db.add(ServiceState(name=name, value=value, updated_at=now))
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            db.query(ServiceState).filter(ServiceState.name == name).update({ServiceState.value: value, ServiceState.updated_at: now})
+            db.commit()
+    finally:
+        db.close()
+
+
+def _record_breach_monitor_result(user_id: int, email: str, result: dict[str, Any]) -> list[str] | None:
+    # Returns the newly exposed sites, or None when this first check of the address only recorded a silent baseline.
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.id == user_id).first()
+        if user is None:
+            return []
+        previous = _last_breach_sites(db, user_id, email)
+        if previous is None:
+            store_scan_event(db, user, 'breach_check', {**result, 'trigger': 'monitor', 'baseline': True})
+            return None
+        new_sites = [row['site'] for row in result['breaches'] if row.get('site') and row['site'] not in previous]
+        if new_sites:
+            store_scan_event(db, user, 'breach_check', {**result, 'trigger': 'monitor', 'new_breaches': new_sites})
+            store_audit_event(db, 'breach.new_exposure', user_id, {'email': email, 'sites': new_sites})
+        return new_sites
+    finally:
+        db.close()
+
+
+async def _run_breach_monitor() -> dict[str, Any]:
+    stats = {'checked': 0, 'new_exposures': 0, 'baselined': 0, 'deferred': 0}
+    api_key = os.getenv('HIBP_API_KEY', '').strip()
+    if not api_key:
+        return {**stats, 'status': 'api-key-missing'}
+
+    ensure_schema()
+    # The cursor is persisted so restarts and other processes continue the rotation instead of starting over.
+    cursor = int(_load_service_state(BREACH_MONITOR_CURSOR_KEY, '0') or 0)
+    db = SessionLocal()
+    try:
+        users = [
+            (row.id, row.email)
+            for row in db.query(User.id, User.email)
+            .outerjoin(UserSetting, UserSetting.user_id == User.id)
+            .filter(User.id > cursor)
+            .filter(or_(UserSetting.breach_alerts == 1, UserSetting.id.is_(None)))
+            .order_by(User.id.asc())
+            .limit(BREACH_MONITOR_BATCH_SIZE)
+            .all()
+        ]
+    finally:
+        db.close()
+    if len(users) < BREACH_MONITOR_BATCH_SIZE:
+        _save_service_state(BREACH_MONITOR_CURSOR_KEY, '0')
+    spacing = 60.0 / (HIBP_RATE_PER_MINUTE * BREACH_MONITOR_QUOTA_SHARE)
+
+    async with _hibp_client(api_key) as client:
+        for idx, (user_id, email) in enumerate(users):
+            if idx:
+                await asyncio.sleep(spacing)
+            # Background checks only take slots that are free right now, so they never queue ahead of users.
+            result = await _hibp_lookup(client, email, max_wait=0)
+            if result['status'] == 'rate-limited':
+                stats['deferred'] += len(users) - idx
+                break
+            if len(users) == BREACH_MONITOR_BATCH_SIZE:
+                _save_service_state(BREACH_MONITOR_CURSOR_KEY, str(user_id))
+            if result['status'] not in ('live-check', 'no-breaches'):
+                continue
+            stats['checked'] += 1
+            new_sites = _record_breach_monitor_result(user_id, email, result)
+            if new_sites is None:
+                stats['baselined'] += 1
+            else:
+                stats['new_exposures'] += len(new_sites)
+
+    incr_metric('breach_monitor.checked', stats['checked'])
+    incr_metric('breach_monitor.new_exposures', stats['new_exposures'])
+    incr_metric('breach_monitor.baselined', stats['baselined'])
+    incr_metric('breach_monitor.deferred', stats['deferred'])
+    return {**stats, 'status': 'completed'}
+
+
+@app.post('/check-breach/batch')
+async def check_breach_batch(
+    payload: BreachBatchRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    api_key = os.getenv('HIBP_API_KEY', '').strip()
+    emails = list(dict.fromkeys(email.lower() for email in payload.emails))
+    user_id = current_user.id
+    # Every lookup takes one slot on the shared schedule, so the batch needs at least this long to drain.
+    needed_wait = len(emails) * 60.0 / HIBP_RATE_PER_MINUTE
+    if api_key and needed_wait > HIBP_BATCH_MAX_WAIT_SECONDS:
+        raise HTTPException(
+            status_code=429,
+            detail=f'Batch needs about {int(needed_wait)}s of HIBP quota; split it into batches under {int(HIBP_BATCH_MAX_WAIT_SECONDS)}s.',
+        )
+    batch_wait = min(HIBP_BATCH_MAX_WAIT_SECONDS, needed_wait + HIBP_MAX_QUEUE_WAIT_SECONDS)
+    store_audit_event(db, 'breach.batch_requested', user_id, {'emails': len(emails)})
+
+    async def stream():
+        db_stream = SessionLocal()
+        try:
+            user = db_stream.query(User).filter(User.id == user_id).first()
+            if not api_key:
+                results = [
+                    _breach_payload(email, 'api-key-missing', message='Set HIBP_API_KEY to enable live breach lookup.')
+                    for email in emails
+                ]
+                for row in results:
+                    store_scan_event(db_stream, user, 'breach_check', row)
+                    yield json.dumps(row) + '\n'
+            else:
+                async with _hibp_client(api_key) as client:
+                    # Requests queue on the shared HIBP schedule; results are emitted in completion order.
+                    for task in asyncio.as_completed([_hibp_lookup(client, email, batch_wait) for email in emails]):
+                        row = await task
+                        if row['status'] != 'rate-limited':
+                            # A rate-limited row says nothing about the address, so it is not kept as a scan.
+                            store_scan_event(db_stream, user, 'breach_check', row)
+                        yield json.dumps(row) + '\n'
+            yield json.dumps({'status': 'batch-complete', 'checked': len(emails)}) + '\n'
+        finally:
+            db_stream.close()
+
+    return StreamingResponse(stream(), media_type='application/x-ndjson')
+
+
 def _normalize_text(text: str) -> str:
     return re.sub(r'\s+', ' ', text or '').strip()
 
 
+EMAIL_PATTERN = re.compile(r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}')
+
+
 def _extract_emails(text: str) -> list[str]:
-    found = re.findall(r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}', text)
+    found = EMAIL_PATTERN.findall(text)
     return sorted(set(found))[:50]
 
 
-def _extract_links(base_url: str, soup: BeautifulSoup) -> list[str]:
-    links: list[str] = []
-    for tag in soup.find_all('a', href=True):
-        href = tag.get('href', '').strip()
-        if not href:
-            continue
+def _absolute_link(base_url: str, href: str) -> str | None:
+    href = href.strip()
+    if not href:
+        return None
+    try:
         absolute = urljoin(base_url, href)
         parsed = urlparse(absolute)
-        if parsed.scheme in ('http', 'https') and parsed.netloc:
-            links.append(absolute)
-    return links
+    except ValueError:
+        # Malformed hrefs (e.g. an unclosed IPv6 bracket) are dropped rather than failing the page.
+        return None
+    if parsed.scheme in ('http', 'https') and parsed.netloc:
+        return absolute
+    return None
+
+
+class KeywordCounter:
+    # Compiled once per crawl job: one alternation regex counts every keyword as a whole word in a single scan.
+    def __init__(self, keywords: list[str]) -> None:
+        normalized = [_normalize_text(keyword).lower() for keyword in keywords]
+        self.keywords = list(dict.fromkeys(keyword for keyword in normalized if keyword))
+        self.pattern: re.Pattern[str] | None = None
+        # Keywords that are whole-word prefixes of a longer one ("open" in "open source") share its match start.
+        self.implied: dict[str, list[str]] = {}
+        if not self.keywords:
+            return
+        alternation = '|'.join(re.escape(keyword) for keyword in sorted(self.keywords, key=len, reverse=True))
+        if all(re.fullmatch(r'\w+', keyword) for keyword in self.keywords):
+            # Single-word keywords cannot overlap, so matches can be consumed (much faster than a lookahead scan).
+            self.pattern = re.compile(rf'(?<!\w)({alternation})(?!\w)')
+        else:
+            self.pattern = re.compile(rf'(?<!\w)(?=({alternation})(?!\w))')
+            for keyword in self.keywords:
+                shorter = [
+                    other
+                    for other in self.keywords
+                    if len(other) < len(keyword) and keyword.startswith(other) and not re.match(r'\w', keyword[len(other)])
+                ]
+                if shorter:
+                    self.implied[keyword] = shorter
+
+    def count(self, text: str) -> dict[str, int]:
+        if self.pattern is None:
+            return {}
+        return self._tally(Counter(self.pattern.findall(re.sub(r'\s+', ' ', text.lower()))))
+
+    def _tally(self, raw: Counter) -> dict[str, int]:
+        counts = dict(raw)
+        for keyword, shorter in self.implied.items():
+            if raw.get(keyword):
+                for other in shorter:
+                    counts[other] = counts.get(other, 0) + raw[keyword]
+        return counts
+
+
+class _PageTokenizer(HTMLParser):
+    # Single pass over the token stream: title, visible text and anchors, without building a tree.
+    # Text rules follow BeautifulSoup's get_text(): script/style bodies and comments are skipped.
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.title: str | None = None
+        self.hrefs: list[str] = []
+        self.anchor_texts: list[str] = []
+        self.chunks: list[str] = []
+        self._title_parts: list[str] | None = None
+        self._anchor_parts: list[str] | None = None
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in ('script', 'style'):
+            self._skip_depth += 1
+        elif tag == 'title' and self.title is None and self._title_parts is None:
+            self._title_parts = []
+        elif tag == 'a':
+            for name, value in attrs:
+                if name == 'href':
+                    if value:
+                        self.finish_anchor()
+                        self.hrefs.append(value)
+                        self.anchor_texts.append('')
+                        self._anchor_parts = []
+                    break
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in ('script', 'style'):
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag == 'title' and self._title_parts is not None:
+            self.title = ''.join(self._title_parts)
+            self._title_parts = None
+        elif tag == 'a':
+            self.finish_anchor()
+
+    def finish_anchor(self) -> None:
+        if self._anchor_parts is not None:
+            self.anchor_texts[-1] = ' '.join(self._anchor_parts)[:200]
+            self._anchor_parts = None
+
+    def handle_data(self, data: str) -> None:
+        if self._skip_depth:
+            return
+        if self._title_parts is not None:
+            self._title_parts.append(data)
+        stripped = data.strip()
+        if stripped:
+            self.chunks.append(stripped)
+            if self._anchor_parts is not None:
+                self._anchor_parts.append(stripped)
 
 
 def _looks_unreachable_profile(response: httpx.Response) -> bool:
@@ -1823,113 +3280,1190 @@ def _looks_unreachable_profile(response: httpx.Response) -> bool:
     return any(marker in combined for marker in unreachable_markers)
 
 
-async def _run_scrape_pipeline(payload: ScrapeAggregateRequest) -> dict[str, Any]:
-    keyword_set = [k.strip().lower() for k in payload.keywords if k.strip()]
-    queue: deque[str] = deque(payload.seed_urls)
-    visited: set[str] = set()
-    pages: list[dict[str, Any]] = []
-    discovered_links: set[str] = set()
-    discovered_emails: set[str] = set()
+def _analyze_page(url: str, html: str, keywords: KeywordCounter) -> dict[str, Any]:
+    tokenizer = _PageTokenizer()
+    try:
+        tokenizer.feed(html)
+        tokenizer.close()
+    except Exception:
+        # Malformed markup: keep whatever was tokenized before the parser gave up.
+        pass
+    if tokenizer._title_parts is not None and tokenizer.title is None:
+        tokenizer.title = ''.join(tokenizer._title_parts)
+    tokenizer.finish_anchor()
+    title = _normalize_text(tokenizer.title or 'Untitled')
+    body_text = _normalize_text(' '.join(tokenizer.chunks))
+
+    simhash = _simhash(body_text)
+    links: list[str] = []
+    link_texts: list[str] = []
+    for href, anchor_text in zip(tokenizer.hrefs, tokenizer.anchor_texts):
+        link = _absolute_link(url, href)
+        if link:
+            links.append(link)
+            link_texts.append(anchor_text)
+    return {
+        'title': title,
+        'word_count': len(body_text.split()),
+        'emails': _extract_emails(body_text),
+        'links': links,
+        'link_texts': link_texts,
+        'keyword_hits': keywords.count(body_text),
+        'simhash': f'{simhash:016x}' if simhash is not None else None,
+    }
+
+
+def _simhash(text: str) -> int | None:
+    # 64-bit SimHash over word 3-shingles; too little text gives unstable fingerprints, so short pages get none.
+    words = re.findall(r'\w+', text.lower())
+    if len(words) < max(3, CRAWLER_SIMHASH_MIN_WORDS):
+        return None
+    shingles = Counter(' '.join(words[idx : idx + 3]) for idx in range(len(words) - 2))
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little') for shingle in shingles),
+        dtype=np.uint64,
+        count=len(shingles),
+    )
+    weights = np.fromiter(shingles.values(), dtype=np.int64, count=len(shingles))
+    bits = np.unpackbits(hashes.astype('<u8').view(np.uint8).reshape(-1, 8), axis=1, bitorder='little')
+    totals = (bits.astype(np.int64) * 2 - 1).T @ weights
+    fingerprint = 0
+    for bit in np.flatnonzero(totals > 0):
+        fingerprint |= 1 << int(bit)
+    return fingerprint
+
+
+class SimHashIndex:
+    # Splits fingerprints into distance+1 bands: two fingerprints within `distance` bits must agree on
+    # at least one whole band, so lookups only compare against pages sharing a band.
+    def __init__(self, distance: int = CRAWLER_SIMHASH_DISTANCE) -> None:
+        self.distance = distance
+        self.band_count = distance + 1
+        self.band_bits = 64 // self.band_count
+        self.bands: list[dict[int, set[str]]] = [defaultdict(set) for _ in range(self.band_count)]
+        self.fingerprints: dict[str, int] = {}
+
+    def _band_values(self, fingerprint: int) -> list[int]:
+        mask = (1 << self.band_bits) - 1
+        return [(fingerprint >> (idx * self.band_bits)) & mask for idx in range(self.band_count)]
+
+    def add(self, url: str, fingerprint: int) -> None:
+        self.remove(url)
+        self.fingerprints[url] = fingerprint
+        for band, value in zip(self.bands, self._band_values(fingerprint)):
+            band[value].add(url)
+
+    def remove(self, url: str) -> None:
+        fingerprint = self.fingerprints.pop(url, None)
+        if fingerprint is None:
+            return
+        for band, value in zip(self.bands, self._band_values(fingerprint)):
+            band[value].discard(url)
+
+    def find(self, fingerprint: int, exclude: str | None = None) -> str | None:
+        candidates: set[str] = set()
+        for band, value in zip(self.bands, self._band_values(fingerprint)):
+            candidates.update(band.get(value, ()))
+        candidates.discard(exclude or '')
+        for url in sorted(candidates):
+            if (self.fingerprints[url] ^ fingerprint).bit_count() <= self.distance:
+                return url
+        return None
+
+
+def _link_relevance(keywords: KeywordCounter, url: str, anchor_text: str, parent_density: float) -> float:
+    # Best-first frontier score: keywords in the anchor text weigh most, then URL tokens, then how on-topic the linking page was.
+    parsed = urlparse(url)
+    url_text = ' '.join(re.split(r'[^a-z0-9]+', f'{parsed.path} {parsed.query}'.lower()))
+    anchor_hits = sum(keywords.count(anchor_text).values()) if anchor_text else 0
+    url_hits = sum(keywords.count(url_text).values())
+    return 3.0 * anchor_hits + 2.0 * url_hits + min(2.0, 20.0 * parent_density)
+
+
+def _page_executor() -> Executor:
+    global _page_parse_executor
+    if _page_parse_executor is None:
+        if CRAWLER_PARSE_EXECUTOR == 'process':
+            _page_parse_executor = ProcessPoolExecutor(max_workers=CRAWLER_PARSE_WORKERS)
+        else:
+            _page_parse_executor = ThreadPoolExecutor(max_workers=CRAWLER_PARSE_WORKERS, thread_name_prefix='page-parse')
+    return _page_parse_executor
+
+
+async def _analyze_page_offloaded(url: str, html: str, keywords: KeywordCounter) -> dict[str, Any]:
+    if len(html) < CRAWLER_PARSE_INLINE_BYTES:
+        return _analyze_page(url, html, keywords)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_page_executor(), _analyze_page, url, html, keywords)
+
+
+def _crawler_fetch_slot() -> asyncio.Semaphore:
+    # Process-wide cap on in-flight crawler fetches, shared by every job on this event loop.
+    loop = asyncio.get_running_loop()
+    slot = _crawler_fetch_slots.get(loop)
+    if slot is None:
+        slot = asyncio.Semaphore(CRAWLER_GLOBAL_CONCURRENCY)
+        _crawler_fetch_slots[loop] = slot
+    return slot
+
+
+def _remove_dot_segments(path: str) -> str:
+    output: list[str] = []
+    for segment in path.split('/')[1:]:
+        if segment == '..':
+            if output:
+                output.pop()
+        elif segment != '.':
+            output.append(segment)
+    return '/' + '/'.join(output)
+
+
+def _canonicalize_url(url: str) -> str:
+    # Collapses variants that address the same page: scheme/host case, default port, fragment,
+    # dot segments, trailing slash, escape case, tracking params and query order.
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        # Malformed IPv6 literal or out-of-range port: nothing safe to normalize.
+        return url.strip()
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').rstrip('.')
+    if ':' in host:
+        host = f'[{host}]'
+    netloc = host
+    if port and (scheme, port) not in (('http', 80), ('https', 443)):
+        netloc = f'{host}:{port}'
+    if parts.username:
+        netloc = f'{parts.username}@{netloc}'
+    path = _remove_dot_segments(parts.path or '/')
+    if len(path) > 1:
+        path = path.rstrip('/') or '/'
+    path = re.sub(r'%[0-9a-fA-F]{2}', lambda match: match.group(0).upper(), path)
+    # Keys are sorted, but repeated keys keep their relative order.
+    query = sorted(
+        (
+            (key, value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not key.lower().startswith('utm_') and key.lower() not in TRACKING_QUERY_PARAMS
+        ),
+        key=lambda pair: pair[0],
+    )
+    return urlunsplit((scheme, netloc, path, urlencode(query), ''))
+
+
+def _url_fingerprint(url: str) -> int:
+    return int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class UrlFingerprintSet:
+    # Exact membership on 64-bit hashes instead of full URL strings.
+    def __init__(self) -> None:
+        self.fingerprints: set[int] = set()
+
+    def add(self, url: str) -> bool:
+        fingerprint = _url_fingerprint(url)
+        if fingerprint in self.fingerprints:
+            return False
+        self.fingerprints.add(fingerprint)
+        return True
+
+    def __contains__(self, url: str) -> bool:
+        return _url_fingerprint(url) in self.fingerprints
+
+    def __len__(self) -> int:
+        return len(self.fingerprints)
+
+
+class BloomFilter:
+    # Fixed-size bit array; a false positive means a URL is wrongly treated as already seen.
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        capacity = max(1, capacity)
+        self.size = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, url: str) -> list[int]:
+        digest = hashlib.blake2b(url.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'big')
+        second = int.from_bytes(digest[8:], 'big') | 1
+        return [(first + idx * second) % self.size for idx in range(self.hash_count)]
+
+    def add(self, url: str) -> bool:
+        added = False
+        for position in self._positions(url):
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] & (1 << bit):
+                self.bits[byte] |= 1 << bit
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, url: str) -> bool:
+        return all(self.bits[position // 8] & (1 << (position % 8)) for position in self._positions(url))
+
+    def __len__(self) -> int:
+        return self.count
+
+
+def _crawler_url_set() -> UrlFingerprintSet | BloomFilter:
+    if CRAWLER_URL_SET == 'bloom':
+        return BloomFilter(CRAWLER_BLOOM_CAPACITY, CRAWLER_BLOOM_ERROR_RATE)
+    return UrlFingerprintSet()
+
+
+def _url_origin(url: str) -> str:
+    parsed = urlparse(url)
+    return f'{parsed.scheme}://{parsed.netloc}'.lower()
+
+
+async def _read_capped(response: httpx.Response, limit: int) -> tuple[bytes, bool]:
+    # Reads at most `limit` bytes of a streamed response; the flag reports whether the body was cut short.
+    chunks: list[bytes] = []
+    size = 0
+    async for chunk in response.aiter_bytes():
+        if size + len(chunk) > limit:
+            chunks.append(chunk[: limit - size])
+            return b''.join(chunks), True
+        chunks.append(chunk)
+        size += len(chunk)
+    return b''.join(chunks), False
+
+
+def _crawl_skip_reason(response: httpx.Response) -> str | None:
+    content_type = response.headers.get('content-type', '').split(';', 1)[0].strip().lower()
+    if content_type and content_type not in CRAWLER_TEXT_CONTENT_TYPES:
+        return 'non_html'
+    try:
+        declared = int(response.headers.get('content-length', ''))
+    except ValueError:
+        return None
+    return 'too_large' if declared > CRAWLER_MAX_BYTES else None
+
+
+def _looks_non_html(url: str) -> bool:
+    path = urlparse(url).path.lower()
+    return os.path.splitext(path)[1] in NON_HTML_EXTENSIONS
+
+
+async def _robots_rules(client: httpx.AsyncClient, origin: str) -> dict[str, Any]:
+    cached = ROBOTS_CACHE.get(origin)
+    if cached and cached['expires_at'] > time.time():
+        incr_metric('crawler.robots_cache_hit')
+        return cached
+
+    parser = RobotFileParser()
+    ttl = CRAWLER_ROBOTS_TTL_SECONDS
+    try:
+        async with _crawler_fetch_slot(), client.stream('GET', f'{origin}/robots.txt') as response:
+            body, _ = await _read_capped(response, 500_000) if response.status_code < 400 else (b'', False)
+        # RFC 9309: a missing robots.txt (4xx) allows everything, an unavailable one (5xx) disallows everything.
+        if response.status_code >= 500:
+            parser.disallow_all = True
+            ttl = CRAWLER_ROBOTS_ERROR_TTL_SECONDS
+        elif response.status_code >= 400:
+            parser.allow_all = True
+        else:
+            parser.parse(body.decode('utf-8', errors='replace').splitlines())
+    except httpx.HTTPError:
+        parser.disallow_all = True
+        ttl = CRAWLER_ROBOTS_ERROR_TTL_SECONDS
+    incr_metric('crawler.robots_fetched')
+
+    delay = parser.crawl_delay(CRAWLER_USER_AGENT) if not (parser.allow_all or parser.disallow_all) else None
+    rules = {
+        'parser': parser,
+        'crawl_delay': min(float(delay or 0), CRAWLER_MAX_CRAWL_DELAY_SECONDS),
+        'sitemaps': list(parser.site_maps() or []),
+        'sitemap_urls': None,
+        'expires_at': time.time() + ttl,
+    }
+    ROBOTS_CACHE.pop(origin, None)
+    if len(ROBOTS_CACHE) >= ROBOTS_CACHE_MAX_HOSTS:
+        ROBOTS_CACHE.pop(next(iter(ROBOTS_CACHE)))
+    ROBOTS_CACHE[origin] = rules
+    return rules
+
+
+def _robots_allows(rules: dict[str, Any], url: str) -> bool:
+    return rules['parser'].can_fetch(CRAWLER_USER_AGENT, url)
+
+
+def _xml_local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+async def _sitemap_urls(client: httpx.AsyncClient, origin: str, rules: dict[str, Any], limit: int) -> list[str]:
+    # Cached with the host's robots rules, so repeat crawls inside the TTL seed without refetching.
+    if rules['sitemap_urls'] is not None:
+        return rules['sitemap_urls'][:limit]
+
+    pending = list(rules['sitemaps'] or [f'{origin}/sitemap.xml'])
+    entries: list[tuple[float, int, str]] = []
+    fetched = 0
+    while pending and fetched < CRAWLER_SITEMAP_MAX_FILES and len(entries) < limit:
+        sitemap_url = pending.pop(0)
+        if _url_origin(sitemap_url) != origin:
+            continue
+        fetched += 1
+        try:
+            async with _crawler_fetch_slot(), client.stream('GET', sitemap_url) as response:
+                if response.status_code >= 400:
+                    continue
+                content, _ = await _read_capped(response, CRAWLER_SITEMAP_MAX_BYTES)
+        except httpx.HTTPError:
+            continue
+        if content[:2] == b'\x1f\x8b':
+            try:
+                content = zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(content, CRAWLER_SITEMAP_MAX_BYTES)
+            except zlib.error:
+                continue
+        try:
+            root = ElementTree.fromstring(content)
+        except ElementTree.ParseError:
+            continue
+
+        if _xml_local_name(root.tag) == 'sitemapindex':
+            pending.extend(
+                (child.text or '').strip() for child in root.iter() if _xml_local_name(child.tag) == 'loc' and (child.text or '').strip()
+            )
+            continue
+        for node in root:
+            if _xml_local_name(node.tag) != 'url':
+                continue
+            loc = ''
+            priority = 0.5
+            for child in node:
+                name = _xml_local_name(child.tag)
+                if name == 'loc':
+                    loc = (child.text or '').strip()
+                elif name == 'priority':
+                    try:
+                        priority = float((child.text or '').strip())
+                    except ValueError:
+                        pass
+            if loc and _url_origin(loc) == origin:
+                entries.append((-priority, len(entries), loc))
+
+    # Highest <priority> first; document order breaks ties.
+    urls = [loc for _, _, loc in sorted(entries)]
+    rules['sitemap_urls'] = urls
+    return urls[:limit]
+
+
+class DomainThrottle:
+    def __init__(self, concurrency: int, min_delay: float) -> None:
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.min_delay = min_delay
+        self.next_start = 0.0
+
+    async def __aenter__(self) -> 'DomainThrottle':
+        await self.semaphore.acquire()
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        start_at = max(now, self.next_start)
+        self.next_start = start_at + self.min_delay
+        if start_at > now:
+            await asyncio.sleep(start_at - now)
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.semaphore.release()
+
+
+def _crawl_state_key(scope: str, url: str) -> str:
+    return hashlib.sha256(f'{scope}\n{url}'.encode('utf-8')).hexdigest()
+
+
+def _load_crawl_states(scope: str) -> dict[str, dict[str, Any]]:
+    db = SessionLocal()
+    try:
+        rows = db.query(CrawlPageState).filter(CrawlPageState.schedule_id == scope).all()
+        return {
+            row.url: {
+                'etag': row.etag,
+                'last_modified': row.last_modified,
+                'content_hash': row.content_hash,
+                'status': row.status_code,
+                'analysis': json.loads(row.analysis_json or '{}'),
+                'simhash': row.simhash,
+                'duplicate_of': row.duplicate_of,
+            }
+            for row in rows
+        }
+    finally:
+        db.close()
+
+
+def _store_crawl_states(scope: str, updates: dict[str, dict[str, Any]]) -> None:
+    if not updates:
+        return
+    now = datetime.now(timezone.utc)
+    db = SessionLocal()
+    try:
+        keys = {_crawl_state_key(scope, url): url for url in updates}
+        existing = {row.state_key: row for row in db.query(CrawlPageState).filter(CrawlPageState.state_key.in_(list(keys))).all()}
+        for key, url in keys.items():
+            update = updates[url]
+            row = existing.get(key)
+            if row is None:
+                row = CrawlPageState(state_key=key, schedule_id=scope, url=url)
+                db.add(row)
+            row.checked_at = now
+            row.duplicate_of = update.get('duplicate_of')
+            if update.get('not_modified'):
+                continue
+            row.etag = update.get('etag')
+            row.last_modified = update.get('last_modified')
+            row.content_hash = update['content_hash']
+            row.status_code = update['status']
+            row.analysis_json = json.dumps(update['analysis'])
+            row.simhash = update['analysis'].get('simhash')
+            row.fetched_at = now
+        db.commit()
+    finally:
+        db.close()
+
+
+async def _run_scrape_pipeline(
+    payload: ScrapeAggregateRequest,
+    transport: httpx.AsyncBaseTransport | None = None,
+    state_scope: str | None = None,
+    progress: Callable[[str, dict[str, Any]], None] | None = None,
+    cancel: asyncio.Event | None = None,
+) -> dict[str, Any]:
+    keywords = KeywordCounter(payload.keywords)
+    # Scheduled crawls keep per-URL validators and analysis so re-runs only re-parse pages that changed.
+    page_states = _load_crawl_states(state_scope) if state_scope else {}
+    state_updates: dict[str, dict[str, Any]] = {}
+    page_changes: dict[str, dict[str, Any] | None] = {}
+    host_rules: dict[str, asyncio.Task] = {}
+    sitemap_origins: set[str] = set()
+    planning = {
+        'robots_blocked': 0,
+        'sitemap_seeded': 0,
+        'skipped_non_html': 0,
+        'skipped_too_large': 0,
+        'truncated': 0,
+        'near_duplicates': 0,
+    }
+    running_totals: dict[str, int] = {k: 0 for k in keywords.keywords}
+    # Canonical pages from earlier runs of the schedule stay canonical, whatever order this run fetches in.
+    near_duplicates = SimHashIndex()
+    for url, state in page_states.items():
+        if state.get('simhash') and not state.get('duplicate_of'):
+            near_duplicates.add(url, int(state['simhash'], 16))
+    # URL sets hold canonical forms only; raw_links catches variants that collapse onto a known page.
+    visited = _crawler_url_set()
+    scheduled = _crawler_url_set()
+    raw_links = _crawler_url_set()
+    skipped_links = _crawler_url_set()
+    canonical_duplicates = 0
+    # Pages are keyed by their discovery path (seed index, link index, ...) so output order matches BFS order.
+    pages: list[tuple[tuple[int, ...], dict[str, Any]]] = []
+    discovered_links = _crawler_url_set()
+    discovered_emails: set[str] = set()
+    frontier: asyncio.PriorityQueue = asyncio.PriorityQueue()
+    throttles: dict[str, DomainThrottle] = {}
+
+    root_domains = {urlparse(url).netloc for url in payload.seed_urls}
+
+    best_first = payload.frontier == 'best_first'
+
+    # Only analyzed pages spend max_pages: a slot is claimed before fetching and handed back when the
+    # response is skipped (non-HTML, too large). Claims wait while fetches that may hand slots back are in flight.
+    budget = {'claimed': 0, 'pending': 0}
+    budget_changed = asyncio.Condition()
+    page_urls: set[str] = set()
+
+    async def claim_budget() -> bool:
+        async with budget_changed:
+            while budget['claimed'] >= payload.max_pages and budget['pending']:
+                await budget_changed.wait()
+            if budget['claimed'] >= payload.max_pages:
+                return False
+            budget['claimed'] += 1
+            budget['pending'] += 1
+            return True
+
+    async def settle_budget(used: bool) -> None:
+        async with budget_changed:
+            budget['pending'] -= 1
+            if not used:
+                budget['claimed'] -= 1
+            budget_changed.notify_all()
+
+    def report(event: str, data: dict[str, Any]) -> None:
+        if progress is None:
+            return
+        if event == 'page':
+            for keyword, count in data.get('keyword_hits', {}).items():
+                running_totals[keyword] = running_totals.get(keyword, 0) + count
+            data = {**data, 'pages_done': len(pages), 'keyword_totals': dict(running_totals)}
+        progress(event, data)
+
+    def add_page(order_key: tuple[int, ...], page: dict[str, Any]) -> None:
+        pages.append((order_key, page))
+        page_urls.add(page['url'])
+        report('page', page)
+
+    def schedule(url: str, order_key: tuple[int, ...], score: float = 0.0) -> bool:
+        if not scheduled.add(_canonicalize_url(url)):
+            return False
+        # Breadth-first ignores the score; best-first pops the highest score and falls back to discovery order.
+        frontier.put_nowait(((-score if best_first else 0.0, len(order_key), order_key), url))
+        return True
+
+    def discover(url: str) -> str:
+        nonlocal canonical_duplicates
+        canonical = _canonicalize_url(url)
+        is_new_raw = raw_links.add(url)
+        if not discovered_links.add(canonical) and is_new_raw:
+            canonical_duplicates += 1
+        return canonical
+
+    async def rules_for(client: httpx.AsyncClient, url: str) -> dict[str, Any] | None:
+        if not CRAWLER_RESPECT_ROBOTS:
+            return None
+        origin = _url_origin(url)
+        # One robots.txt lookup per host per job, however many workers ask at once.
+        task = host_rules.get(origin)
+        if task is None:
+            task = asyncio.ensure_future(_robots_rules(client, origin))
+            host_rules[origin] = task
+        return await task
+
+    async def seed_from_sitemaps(client: httpx.AsyncClient, url: str, rules: dict[str, Any] | None, seed_index: int) -> None:
+        origin = _url_origin(url)
+        if origin in sitemap_origins:
+            return
+        sitemap_origins.add(origin)
+        if rules is None:
+            rules = {'sitemaps': [], 'sitemap_urls': None}
+        for idx, link in enumerate(await _sitemap_urls(client, origin, rules, payload.max_pages * 3)):
+            if len(scheduled) >= payload.max_pages * 3:
+                break
+            # Sitemap entries sit one level below the seed, after the seed's own links.
+            score = _link_relevance(keywords, link, '', 0.0) if best_first else 0.0
+            if schedule(link, (seed_index, SITEMAP_ORDER_OFFSET + idx), score):
+                planning['sitemap_seeded'] += 1
+
+    async def crawl_page(
+        client: httpx.AsyncClient, current_url: str, order_key: tuple[int, ...], rules: dict[str, Any] | None
+    ) -> bool:
+        # Returns False when the response was skipped without analysis, so its page budget slot is handed back.
+        domain = urlparse(current_url).netloc
+        min_delay = max(CRAWLER_DOMAIN_DELAY_SECONDS, rules['crawl_delay'] if rules else 0.0)
+        throttle = throttles.setdefault(domain, DomainThrottle(CRAWLER_PER_DOMAIN_CONCURRENCY, min_delay))
+        prior = page_states.get(current_url)
+        # Stored analysis is only reusable when it was computed for the same keyword set.
+        if prior and prior['analysis'].get('keywords') != keywords.keywords:
+            prior = None
+        headers: dict[str, str] = {}
+        if prior and prior.get('etag'):
+            headers['If-None-Match'] = prior['etag']
+        if prior and prior.get('last_modified'):
+            headers['If-Modified-Since'] = prior['last_modified']
+        skip_reason: str | None = None
+        body, truncated = b'', False
+        try:
+            async with throttle, _crawler_fetch_slot(), client.stream('GET', current_url, headers=headers) as response:
+                # Headers decide whether the body is worth reading at all.
+                if response.status_code < 300:
+                    skip_reason = _crawl_skip_reason(response)
+                    if skip_reason is None:
+                        body, truncated = await _read_capped(response, CRAWLER_MAX_BYTES)
+        except httpx.HTTPError:
+            add_page(order_key, {'url': current_url, 'status': 'error', 'title': 'Unavailable', 'keyword_hits': {}})
+            return True
+
+        if skip_reason:
+            # Recorded as a discovered link only; nothing to analyze.
+            planning[f'skipped_{skip_reason}'] += 1
+            incr_metric(f'crawler.skipped_{skip_reason}')
+            report('skipped', {'url': current_url, 'reason': skip_reason})
+            return False
+        if truncated:
+            planning['truncated'] += 1
+            incr_metric('crawler.truncated')
+
+        if prior and response.status_code == 304:
+            incr_metric('crawler.not_modified')
+            status_code = prior['status']
+            analysis = prior['analysis']
+            change = 'unchanged'
+            state_updates[current_url] = {'not_modified': True}
+        else:
+            status_code = response.status_code
+            html = body.decode(response.encoding or 'utf-8', errors='replace') if status_code < 400 else ''
+            content_hash = hashlib.sha256(body).hexdigest()
+            if prior and prior['content_hash'] == content_hash:
+                incr_metric('crawler.unchanged_hash')
+                analysis = prior['analysis']
+                change = 'unchanged'
+            else:
+                analysis = await _analyze_page_offloaded(current_url, html, keywords)
+                analysis['keywords'] = keywords.keywords
+                change = 'changed' if current_url in page_states else 'new'
+            state_updates[current_url] = {
+                'etag': response.headers.get('etag'),
+                'last_modified': response.headers.get('last-modified'),
+                'content_hash': content_hash,
+                'status': status_code,
+                'analysis': analysis,
+            }
+        previous = page_states.get(current_url)
+        page_changes[current_url] = previous['analysis'] if change == 'changed' and previous else None
+
+        duplicate_of = None
+        if analysis.get('simhash'):
+            fingerprint = int(analysis['simhash'], 16)
+            duplicate_of = near_duplicates.find(fingerprint, exclude=current_url)
+            if duplicate_of is None:
+                near_duplicates.add(current_url, fingerprint)
+            else:
+                near_duplicates.remove(current_url)
+        state_updates[current_url]['duplicate_of'] = duplicate_of
+        if duplicate_of:
+            # Near-duplicates are listed but neither expanded nor counted again.
+            planning['near_duplicates'] += 1
+            incr_metric('crawler.near_duplicates')
+            page = {
+                'url': current_url,
+                'status': status_code,
+                'title': analysis['title'][:180],
+                'word_count': analysis['word_count'],
+                'emails_found': [],
+                'keyword_hits': {},
+                'change': change,
+                'truncated': truncated,
+                'duplicate_of': duplicate_of,
+            }
+            add_page(order_key, page)
+            return True
+
+        discovered_emails.update(analysis['emails'])
+        link_texts = analysis.get('link_texts') or [''] * len(analysis['links'])
+        parent_density = sum(analysis['keyword_hits'].values()) / max(1, analysis['word_count'])
+
+        for idx, link in enumerate(analysis['links']):
+            canonical = discover(link)
+            if canonical in visited:
+                continue
+            if payload.same_domain_only and urlparse(link).netloc not in root_domains:
+                continue
+            if _looks_non_html(link):
+                # Obvious binaries never reach the frontier, so they do not spend the page budget.
+                if skipped_links.add(canonical):
+                    planning['skipped_non_html'] += 1
+                continue
+            if len(scheduled) >= payload.max_pages * 3:
+                continue
+            score = _link_relevance(keywords, link, link_texts[idx], parent_density) if best_first else 0.0
+            schedule(link, order_key + (idx,), score)
+
+        page = {
+            'url': current_url,
+            'status': status_code,
+            'title': analysis['title'][:180],
+            'word_count': analysis['word_count'],
+            'emails_found': analysis['emails'][:10],
+            'keyword_hits': analysis['keyword_hits'],
+            'change': change,
+            'truncated': truncated,
+        }
+        add_page(order_key, page)
+        return True
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        while True:
+            (_, _, order_key), current_url = await frontier.get()
+            claimed = used = False
+            try:
+                canonical_url = _canonicalize_url(current_url)
+                if cancel is not None and cancel.is_set():
+                    # Cooperative stop: the frontier drains without fetching, in-flight pages still finish.
+                    continue
+                if canonical_url in visited or (budget['claimed'] >= payload.max_pages and not budget['pending']):
+                    continue
+                rules = await rules_for(client, current_url)
+                if rules is not None and not _robots_allows(rules, current_url):
+                    # Disallowed URLs never consume the page budget.
+                    planning['robots_blocked'] += 1
+                    report('skipped', {'url': current_url, 'reason': 'robots'})
+                    continue
+                if CRAWLER_USE_SITEMAPS and len(order_key) == 1:
+                    await seed_from_sitemaps(client, current_url, rules, order_key[0])
+                # max_pages is claimed before fetching, so concurrent workers never overshoot it.
+                if canonical_url in visited:
+                    continue
+                claimed = await claim_budget()
+                if not claimed or canonical_url in visited:
+                    continue
+                visited.add(canonical_url)
+                used = await crawl_page(client, current_url, order_key, rules)
+            except Exception as exc:
+                # One bad page must never take the worker down: frontier.join() would then wait forever.
+                logger.warning('Crawl of %s failed: %s', current_url, exc)
+                incr_metric('crawler.page_errors')
+                # A page that was already recorded (e.g. progress reporting failed afterwards) is not added twice.
+                if current_url not in page_urls:
+                    add_page(order_key, {'url': current_url, 'status': 'error', 'title': 'Unavailable', 'keyword_hits': {}})
+                used = claimed
+            finally:
+                if claimed:
+                    await settle_budget(used)
+                frontier.task_done()
+
+    for idx, url in enumerate(payload.seed_urls):
+        schedule(url, (idx,), math.inf)
+
+    async with httpx.AsyncClient(
+        timeout=12, follow_redirects=True, headers={'User-Agent': CRAWLER_USER_AGENT}, transport=transport
+    ) as client:
+        workers = [asyncio.create_task(worker(client)) for _ in range(min(CRAWLER_WORKERS, payload.max_pages))]
+        try:
+            await frontier.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            for task in host_rules.values():
+                task.cancel()
+            await asyncio.gather(*host_rules.values(), return_exceptions=True)
+
+    pages.sort(key=lambda row: (len(row[0]), row[0]))
+    ordered_pages = [page for _, page in pages]
+
+    if state_scope:
+        _store_crawl_states(state_scope, state_updates)
+
+    keyword_totals: dict[str, int] = {k: 0 for k in keywords.keywords}
+    # Deltas only look at new and changed pages; unchanged pages contribute nothing to re-aggregate.
+    keyword_delta: dict[str, int] = {k: 0 for k in keywords.keywords}
+    change_counts = {'new': 0, 'changed': 0, 'unchanged': 0}
+    for page in ordered_pages:
+        for keyword, count in page.get('keyword_hits', {}).items():
+            keyword_totals[keyword] = keyword_totals.get(keyword, 0) + count
+        change = page.get('change')
+        if change not in change_counts:
+            continue
+        change_counts[change] += 1
+        if change == 'unchanged':
+            continue
+        previous_hits = (page_changes.get(page['url']) or {}).get('keyword_hits', {})
+        for keyword in keyword_delta:
+            keyword_delta[keyword] += page['keyword_hits'].get(keyword, 0) - previous_hits.get(keyword, 0)
+    known_emails = {email for state in page_states.values() for email in state['analysis'].get('emails', [])}
+
+    response_payload = {
+        'seed_urls': payload.seed_urls,
+        'pages': ordered_pages,
+        'aggregates': {
+            'pages_scraped': len(ordered_pages),
+            'pages_new': change_counts['new'],
+            'pages_changed': change_counts['changed'],
+            'pages_unchanged': change_counts['unchanged'],
+            'unique_links': len(discovered_links),
+            'canonical_duplicates': canonical_duplicates,
+            'robots_blocked': planning['robots_blocked'],
+            'sitemap_seeded': planning['sitemap_seeded'],
+            'skipped_non_html': planning['skipped_non_html'],
+            'skipped_too_large': planning['skipped_too_large'],
+            'truncated': planning['truncated'],
+            'near_duplicates': planning['near_duplicates'],
+            'emails_found': sorted(discovered_emails)[:100],
+            'keyword_totals': keyword_totals,
+            'delta': {
+                'keyword_totals': {k: v for k, v in keyword_delta.items() if v},
+                'emails_added': sorted(discovered_emails - known_emails)[:100],
+            },
+        },
+        'frontier': payload.frontier,
+        'status': 'cancelled' if cancel is not None and cancel.is_set() else 'scraped',
+    }
+    return response_payload
+
+
+def _serialize_scrape_job(job: ScrapeJob) -> dict[str, Any]:
+    row = {
+        'job_id': job.job_id,
+        'user_id': job.user_id,
+        'status': job.status,
+        'created_at': _as_utc(job.created_at).isoformat(),
+        'payload': json.loads(job.payload_json),
+        'attempts': job.attempts,
+    }
+    if job.schedule_id:
+        row['schedule_id'] = job.schedule_id
+    if job.started_at:
+        row['started_at'] = _as_utc(job.started_at).isoformat()
+    if job.finished_at:
+        row['finished_at'] = _as_utc(job.finished_at).isoformat()
+    if job.summary_json:
+        row['summary'] = json.loads(job.summary_json)
+    if job.error:
+        row['error'] = job.error
+    if job.cancel_requested_at:
+        row['cancel_requested_at'] = _as_utc(job.cancel_requested_at).isoformat()
+    return row
+
+
+def _summarize_scrape_result(result: dict[str, Any]) -> dict[str, Any]:
+    aggregates = result.get('aggregates', {})
+    return {
+        'status': result.get('status'),
+        'frontier': result.get('frontier'),
+        'pages_scraped': aggregates.get('pages_scraped', 0),
+        'unique_links': aggregates.get('unique_links', 0),
+        'emails_found': len(aggregates.get('emails_found', [])),
+        'keyword_totals': aggregates.get('keyword_totals', {}),
+    }
+
+
+def _store_scrape_result(db: Session, job: ScrapeJob, result: dict[str, Any]) -> None:
+    job.summary_json = json.dumps(_summarize_scrape_result(result))
+    db.query(ScrapeJobResult).filter(ScrapeJobResult.job_id == job.job_id).delete(synchronize_session=False)
+    db.add(
+        ScrapeJobResult(
+            job_id=job.job_id,
+            body=zlib.compress(json.dumps(result).encode('utf-8'), 6),
+            page_count=len(result.get('pages', [])),
+        )
+    )
+
+
+def _load_scrape_result(db: Session, job_id: str) -> dict[str, Any] | None:
+    now = time.monotonic()
+    cached = SCRAPE_RESULT_CACHE.pop(job_id, None)
+    if cached and now - cached[0] < SCRAPE_RESULT_CACHE_TTL_SECONDS:
+        # Re-inserting keeps the dict in least-recently-used order.
+        SCRAPE_RESULT_CACHE[job_id] = cached
+        incr_metric('scrape_results.cache_hit')
+        return cached[1]
+    entry = db.query(ScrapeJobResult).filter(ScrapeJobResult.job_id == job_id).first()
+    if not entry:
+        return None
+    try:
+        result = json.loads(zlib.decompress(entry.body))
+    except zlib.error:
+        return None
+    incr_metric('scrape_results.cache_miss')
+    if SCRAPE_RESULT_CACHE_SIZE:
+        while len(SCRAPE_RESULT_CACHE) >= SCRAPE_RESULT_CACHE_SIZE:
+            SCRAPE_RESULT_CACHE.pop(next(iter(SCRAPE_RESULT_CACHE)))
+        SCRAPE_RESULT_CACHE[job_id] = (now, result)
+    return result
+
+
+def _delete_scrape_jobs(db: Session, job_ids: list[str]) -> None:
+    # Caller commits.
+    if not job_ids:
+        return
+    db.query(ScrapeJobEvent).filter(ScrapeJobEvent.job_id.in_(job_ids)).delete(synchronize_session=False)
+    db.query(ScrapeJobResult).filter(ScrapeJobResult.job_id.in_(job_ids)).delete(synchronize_session=False)
+    db.query(ScrapeJob).filter(ScrapeJob.job_id.in_(job_ids)).delete(synchronize_session=False)
+    for job_id in job_ids:
+        SCRAPE_RESULT_CACHE.pop(job_id, None)
+
+
+def _prune_scrape_jobs(db: Session, user_id: int) -> int:
+    finished = ScrapeJob.status.in_(SCRAPE_JOB_TERMINAL_STATUSES)
+    cutoff = datetime.now(timezone.utc) - timedelta(days=SCRAPE_JOB_RETENTION_DAYS)
+    expired = [row.job_id for row in db.query(ScrapeJob.job_id).filter(finished, ScrapeJob.finished_at < cutoff)]
+    overflow = [
+        row.job_id
+        for row in db.query(ScrapeJob.job_id)
+        .filter(ScrapeJob.user_id == user_id, finished)
+        .order_by(ScrapeJob.finished_at.desc(), ScrapeJob.id.desc())
+        .offset(SCRAPE_JOB_MAX_PER_USER)
+    ]
+    stale = list(dict.fromkeys(expired + overflow))
+    _delete_scrape_jobs(db, stale)
+    db.commit()
+    if stale:
+        incr_metric('scrape_jobs.pruned', len(stale))
+    return len(stale)
+
+
+def _record_scrape_job_events(db: Session, job_id: str, events: list[tuple[str, dict[str, Any]]]) -> None:
+    # Caller commits, so status changes and their events land together.
+    now = datetime.now(timezone.utc)
+    for event_type, data in events:
+        db.add(ScrapeJobEvent(job_id=job_id, event_type=event_type, payload_json=json.dumps(data), created_at=now))
+
+
+def _sync_scrape_job_progress(job_id: str, events: list[tuple[str, dict[str, Any]]]) -> bool:
+    db = SessionLocal()
+    try:
+        if events:
+            _record_scrape_job_events(db, job_id, events)
+            db.commit()
+        return db.query(ScrapeJob.cancel_requested_at).filter(ScrapeJob.job_id == job_id).scalar() is not None
+    finally:
+        db.close()
+
+
+def _enqueue_scrape_job(db: Session, user_id: int, payload: ScrapeAggregateRequest, schedule_id: str | None = None) -> ScrapeJob:
+    job = ScrapeJob(job_id=str(uuid.uuid4()), user_id=user_id, schedule_id=schedule_id, payload_json=json.dumps(payload.model_dump()))
+    db.add(job)
+    _record_scrape_job_events(db, job.job_id, [('queued', {})])
+    db.commit()
+    db.refresh(job)
+    incr_metric('scrape_jobs.queued')
+    return job
 
-    root_domains = {urlparse(url).netloc for url in payload.seed_urls}
 
-    async with httpx.AsyncClient(timeout=12, follow_redirects=True, headers={'User-Agent': 'ShadowGraphCrawler/1.0'}) as client:
-        while queue and len(visited) < payload.max_pages:
-            current_url = queue.popleft()
-            if current_url in visited:
-                continue
-            visited.add(current_url)
+async def _notify_scrape_workers() -> None:
+    if _scrape_wake is not None:
+        _scrape_wake.set()
+    if redis_client is not None:
+        # Wakes one idle worker on any replica; the database remains the source of truth.
+        try:
+            await redis_client.rpush(SCRAPE_QUEUE_WAKE_KEY, '1')
+            await redis_client.ltrim(SCRAPE_QUEUE_WAKE_KEY, -1000, -1)
+        except Exception as exc:
+            logger.warning('Scrape queue wake-up failed: %s', exc)
 
-            try:
-                response = await client.get(current_url)
-                status_code = response.status_code
-                html = response.text if status_code < 400 else ''
-            except httpx.HTTPError:
-                pages.append({'url': current_url, 'status': 'error', 'title': 'Unavailable', 'keyword_hits': {}})
-                continue
 
-            soup = BeautifulSoup(html, 'html.parser')
-            title = _normalize_text(soup.title.string if soup.title and soup.title.string else 'Untitled')
-            body_text = _normalize_text(soup.get_text(' ', strip=True))
-
-            page_keyword_hits: dict[str, int] = {}
-            lowered = body_text.lower()
-            for keyword in keyword_set:
-                count = lowered.count(keyword)
-                if count:
-                    page_keyword_hits[keyword] = count
-
-            page_emails = _extract_emails(body_text)
-            for email in page_emails:
-                discovered_emails.add(email)
-
-            links = _extract_links(current_url, soup)
-            for link in links:
-                discovered_links.add(link)
-                if link in visited:
-                    continue
-                if payload.same_domain_only and urlparse(link).netloc not in root_domains:
-                    continue
-                if len(visited) + len(queue) >= payload.max_pages * 3:
-                    continue
-                queue.append(link)
+async def _wait_for_scrape_work() -> None:
+    if redis_client is not None:
+        try:
+            await redis_client.blpop(SCRAPE_QUEUE_WAKE_KEY, timeout=max(1, int(SCRAPE_JOB_POLL_SECONDS)))
+            return
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            pass
+    if _scrape_wake is None:
+        await asyncio.sleep(SCRAPE_JOB_POLL_SECONDS)
+        return
+    try:
+        await asyncio.wait_for(_scrape_wake.wait(), timeout=SCRAPE_JOB_POLL_SECONDS)
+    except asyncio.TimeoutError:
+        pass
+    _scrape_wake.clear()
 
-            pages.append(
-                {
-                    'url': current_url,
-                    'status': status_code,
-                    'title': title[:180],
-                    'word_count': len(body_text.split()),
-                    'emails_found': page_emails[:10],
-                    'keyword_hits': page_keyword_hits,
-                }
+
+def _claim_scrape_job(owner: str) -> dict[str, Any] | None:
+    now = datetime.now(timezone.utc)
+    claimable = or_(
+        and_(ScrapeJob.status == 'queued', ScrapeJob.available_at <= now),
+        and_(ScrapeJob.status == 'running', ScrapeJob.lease_expires_at < now),
+    )
+    db = SessionLocal()
+    try:
+        # Optimistic claim: the conditional UPDATE only succeeds for one worker when several race for the same row.
+        for _ in range(3):
+            candidate = db.query(ScrapeJob.id).filter(claimable).order_by(ScrapeJob.available_at, ScrapeJob.id).first()
+            if candidate is None:
+                return None
+            claimed = (
+                db.query(ScrapeJob)
+                .filter(ScrapeJob.id == candidate.id, claimable)
+                .update(
+                    {
+                        ScrapeJob.status: 'running',
+                        ScrapeJob.lease_owner: owner,
+                        ScrapeJob.lease_expires_at: now + timedelta(seconds=SCRAPE_JOB_LEASE_SECONDS),
+                        ScrapeJob.attempts: ScrapeJob.attempts + 1,
+                        ScrapeJob.started_at: now,
+                    },
+                    synchronize_session=False,
+                )
             )
+            db.commit()
+            if claimed:
+                job = db.get(ScrapeJob, candidate.id)
+                incr_metric('scrape_jobs.claimed')
+                return {
+                    'job_id': job.job_id,
+                    'user_id': job.user_id,
+                    'schedule_id': job.schedule_id,
+                    'payload': json.loads(job.payload_json),
+                    'attempts': job.attempts,
+                }
+        return None
+    finally:
+        db.close()
 
-    keyword_totals: dict[str, int] = {k: 0 for k in keyword_set}
-    for page in pages:
-        for keyword, count in page.get('keyword_hits', {}).items():
-            keyword_totals[keyword] = keyword_totals.get(keyword, 0) + count
 
-    response_payload = {
-        'seed_urls': payload.seed_urls,
-        'pages': pages,
-        'aggregates': {
-            'pages_scraped': len(pages),
-            'unique_links': len(discovered_links),
-            'emails_found': sorted(discovered_emails)[:100],
-            'keyword_totals': keyword_totals,
-        },
-        'status': 'scraped',
-    }
-    return response_payload
+def _extend_scrape_lease(job_id: str, owner: str) -> bool:
+    db = SessionLocal()
+    try:
+        extended = (
+            db.query(ScrapeJob)
+            .filter(ScrapeJob.job_id == job_id, ScrapeJob.lease_owner == owner, ScrapeJob.status == 'running')
+            .update({ScrapeJob.lease_expires_at: datetime.now(timezone.utc) + timedelta(seconds=SCRAPE_JOB_LEASE_SECONDS)}, synchronize_session=False)
+        )
+        db.commit()
+        return bool(extended)
+    finally:
+        db.close()
+
+
+def _release_scrape_job(job_id: str, owner: str) -> None:
+    # Graceful shutdown hands the job straight back instead of waiting for the lease to lapse.
+    db = SessionLocal()
+    try:
+        db.query(ScrapeJob).filter(ScrapeJob.job_id == job_id, ScrapeJob.lease_owner == owner, ScrapeJob.status == 'running').update(
+            {
+                ScrapeJob.status: 'queued',
+                ScrapeJob.lease_owner: None,
+                ScrapeJob.lease_expires_at: None,
+                ScrapeJob.attempts: ScrapeJob.attempts - 1,
+                ScrapeJob.available_at: datetime.now(timezone.utc),
+            },
+            synchronize_session=False,
+        )
+        db.commit()
+    finally:
+        db.close()
 
 
-async def _run_scrape_job(job_id: str, user_id: int, payload: ScrapeAggregateRequest) -> None:
-    started = datetime.now(timezone.utc)
-    SCRAPE_JOBS[job_id]['status'] = 'running'
-    SCRAPE_JOBS[job_id]['started_at'] = started.isoformat()
+def _finish_scrape_job(job_id: str, owner: str, result: dict[str, Any] | None = None, error: str | None = None) -> None:
+    now = datetime.now(timezone.utc)
+    db = SessionLocal()
     try:
-        result = await _run_scrape_pipeline(payload)
-        SCRAPE_JOBS[job_id]['status'] = 'completed'
-        SCRAPE_JOBS[job_id]['result'] = result
-        SCRAPE_JOBS[job_id]['finished_at'] = datetime.now(timezone.utc).isoformat()
-        db = SessionLocal()
-        try:
-            user = db.query(User).filter(User.id == user_id).first()
+        job = db.query(ScrapeJob).filter(ScrapeJob.job_id == job_id, ScrapeJob.lease_owner == owner, ScrapeJob.status == 'running').first()
+        if job is None:
+            # The lease was lost and another worker owns the job now.
+            return
+        job.lease_owner = None
+        job.lease_expires_at = None
+        if error is None:
+            # A cancelled crawl still returns its partial result, which is kept like a completed one.
+            job.status = 'cancelled' if (result or {}).get('status') == 'cancelled' else 'completed'
+            _store_scrape_result(db, job, result or {})
+            job.error = None
+            job.finished_at = now
+            aggregates = (result or {}).get('aggregates', {})
+            _record_scrape_job_events(
+                db,
+                job_id,
+                [(job.status, {'pages_scraped': aggregates.get('pages_scraped', 0), 'keyword_totals': aggregates.get('keyword_totals', {})})],
+            )
+            db.commit()
+            incr_metric(f'scrape_jobs.{job.status}')
+            user = db.query(User).filter(User.id == job.user_id).first()
             if user:
-                store_scan_event(db, user, 'web_scrape_aggregate', result)
-                store_audit_event(db, 'scrape.job_completed', user.id, {'job_id': job_id})
-        finally:
-            db.close()
+                store_scan_event(db, user, 'web_scrape_aggregate', result or {})
+                store_audit_event(db, f'scrape.job_{job.status}', user.id, {'job_id': job_id})
+            _prune_scrape_jobs(db, job.user_id)
+            return
+
+        job.error = error
+        if job.attempts < SCRAPE_JOB_MAX_ATTEMPTS:
+            delay = SCRAPE_JOB_RETRY_BASE_SECONDS * (2 ** (job.attempts - 1))
+            job.status = 'queued'
+            job.available_at = now + timedelta(seconds=delay)
+            _record_scrape_job_events(db, job_id, [('retry', {'attempt': job.attempts, 'retry_in_seconds': delay, 'error': error})])
+            db.commit()
+            incr_metric('scrape_jobs.retried')
+            store_audit_event(db, 'scrape.job_retry', job.user_id, {'job_id': job_id, 'attempt': job.attempts, 'retry_in_seconds': delay})
+            return
+        job.status = 'failed'
+        job.finished_at = now
+        _record_scrape_job_events(db, job_id, [('failed', {'error': error})])
+        db.commit()
+        incr_metric('scrape_jobs.failed')
+        store_audit_event(db, 'scrape.job_failed', job.user_id, {'job_id': job_id, 'error': error})
+        _prune_scrape_jobs(db, job.user_id)
+    finally:
+        db.close()
+
+
+async def _execute_scrape_job(claim: dict[str, Any], owner: str) -> None:
+    job_id = claim['job_id']
+    if claim['attempts'] > SCRAPE_JOB_MAX_ATTEMPTS:
+        # Reclaimed after its last allowed attempt died with the worker.
+        _finish_scrape_job(job_id, owner, error='Worker lease expired on the final attempt.')
+        return
+    try:
+        payload = ScrapeAggregateRequest(**claim['payload'])
+    except ValueError as exc:
+        _finish_scrape_job(job_id, owner, error=f'Invalid job payload: {exc}')
+        return
+    events: list[tuple[str, dict[str, Any]]] = [('started', {'attempt': claim['attempts']})]
+    cancel = asyncio.Event()
+    pipeline = asyncio.create_task(
+        _run_scrape_pipeline(
+            payload,
+            state_scope=claim.get('schedule_id'),
+            progress=lambda event, data: events.append((event, data)),
+            cancel=cancel,
+        )
+    )
+    lease_renewed = started = time.monotonic()
+    try:
+        while True:
+            done, _ = await asyncio.wait({pipeline}, timeout=SCRAPE_JOB_PROGRESS_SECONDS)
+            # Page events are written in batches; the same round trip sees cancel requests made on any replica.
+            batch = events[:]
+            events.clear()
+            try:
+                if _sync_scrape_job_progress(job_id, batch) and not cancel.is_set():
+                    cancel.set()
+            except SQLAlchemyError as exc:
+                # Transient database trouble must not fail a healthy crawl; the batch is retried next round.
+                logger.warning('Scrape job %s progress sync failed: %s', job_id, exc)
+                events[:0] = batch
+            if done:
+                break
+            if time.monotonic() - started > SCRAPE_JOB_TIMEOUT_SECONDS:
+                incr_metric('scrape_jobs.timed_out')
+                pipeline.cancel()
+                await asyncio.gather(pipeline, return_exceptions=True)
+                _finish_scrape_job(job_id, owner, error=f'Crawl exceeded {SCRAPE_JOB_TIMEOUT_SECONDS}s and was stopped.')
+                return
+            if time.monotonic() - lease_renewed < SCRAPE_JOB_HEARTBEAT_SECONDS:
+                continue
+            try:
+                extended = _extend_scrape_lease(job_id, owner)
+            except SQLAlchemyError as exc:
+                # Retried on the next tick; the lease is long enough to ride out a short outage.
+                logger.warning('Scrape job %s lease renewal failed: %s', job_id, exc)
+                continue
+            if not extended:
+                incr_metric('scrape_jobs.lease_lost')
+                pipeline.cancel()
+                await asyncio.gather(pipeline, return_exceptions=True)
+                return
+            lease_renewed = time.monotonic()
+        result = pipeline.result()
+    except asyncio.CancelledError:
+        pipeline.cancel()
+        await asyncio.gather(pipeline, return_exceptions=True)
+        _release_scrape_job(job_id, owner)
+        raise
     except Exception as exc:
-        SCRAPE_JOBS[job_id]['status'] = 'failed'
-        SCRAPE_JOBS[job_id]['error'] = str(exc)
-        SCRAPE_JOBS[job_id]['finished_at'] = datetime.now(timezone.utc).isoformat()
-        db = SessionLocal()
+        # Never leave a crawl running once its job has been handed back for retry.
+        pipeline.cancel()
+        await asyncio.gather(pipeline, return_exceptions=True)
+        _finish_scrape_job(job_id, owner, error=str(exc) or exc.__class__.__name__)
+        return
+    _finish_scrape_job(job_id, owner, result=result)
+
+
+async def _scrape_worker(owner: str) -> None:
+    while True:
         try:
-            store_audit_event(db, 'scrape.job_failed', user_id, {'job_id': job_id, 'error': str(exc)})
-        finally:
-            db.close()
+            try:
+                claim = _claim_scrape_job(owner)
+            except OperationalError as exc:
+                logger.warning('Scrape job claim failed: %s', exc)
+                claim = None
+            if claim is None:
+                await _wait_for_scrape_work()
+                continue
+            await _execute_scrape_job(claim, owner)
+        except Exception:
+            # The worker outlives any single job; an unfinished job is reclaimed once its lease lapses.
+            logger.exception('Scrape worker %s iteration failed', owner)
+            incr_metric('scrape_jobs.worker_errors')
+            await asyncio.sleep(SCRAPE_JOB_POLL_SECONDS)
 
 
 @app.post('/scrape-aggregate')
@@ -1952,49 +4486,286 @@ async def enqueue_scrape_job(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> dict[str, Any]:
-    job_id = str(uuid.uuid4())
-    SCRAPE_JOBS[job_id] = {
-        'job_id': job_id,
-        'user_id': current_user.id,
-        'status': 'queued',
-        'created_at': datetime.now(timezone.utc).isoformat(),
-        'payload': payload.model_dump(),
-    }
-    asyncio.create_task(_run_scrape_job(job_id, current_user.id, payload))
-    store_audit_event(db, 'scrape.job_queued', current_user.id, {'job_id': job_id})
-    return {'job_id': job_id, 'status': 'queued'}
+    job = _enqueue_scrape_job(db, current_user.id, payload)
+    await _notify_scrape_workers()
+    store_audit_event(db, 'scrape.job_queued', current_user.id, {'job_id': job.job_id})
+    return {'job_id': job.job_id, 'status': 'queued'}
 
 
 @app.get('/jobs/scrape')
-def list_scrape_jobs(current_user: User = Depends(get_current_user)) -> dict[str, Any]:
-    jobs = [job for job in SCRAPE_JOBS.values() if job.get('user_id') == current_user.id]
-    jobs.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-    return {'jobs': jobs[:100]}
+def list_scrape_jobs(
+    limit: int = 20,
+    offset: int = 0,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> dict[str, Any]:
+    limit = max(1, min(limit, 100))
+    offset = max(0, offset)
+    query = db.query(ScrapeJob).filter(ScrapeJob.user_id == current_user.id)
+    jobs = query.order_by(ScrapeJob.created_at.desc(), ScrapeJob.id.desc()).offset(offset).limit(limit).all()
+    return {'jobs': [_serialize_scrape_job(job) for job in jobs], 'total': query.count(), 'limit': limit, 'offset': offset}
 
 
 @app.get('/jobs/scrape/{job_id}')
-def get_scrape_job(job_id: str, current_user: User = Depends(get_current_user)) -> dict[str, Any]:
-    job = SCRAPE_JOBS.get(job_id)
-    if not job or job.get('user_id') != current_user.id:
+def get_scrape_job(
+    job_id: str,
+    pages_offset: int = 0,
+    pages_limit: int = SCRAPE_RESULT_PAGE_LIMIT,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> dict[str, Any]:
+    job = db.query(ScrapeJob).filter(ScrapeJob.job_id == job_id).first()
+    if not job or job.user_id != current_user.id:
         raise HTTPException(status_code=404, detail='Job not found')
-    return job
+    row = _serialize_scrape_job(job)
+    result = _load_scrape_result(db, job_id) if job.summary_json else None
+    if result is not None:
+        pages_offset = max(0, pages_offset)
+        pages_limit = max(1, min(pages_limit, 200))
+        pages = result.get('pages', [])
+        row['result'] = {**result, 'pages': pages[pages_offset : pages_offset + pages_limit]}
+        row['pages'] = {'offset': pages_offset, 'limit': pages_limit, 'total': len(pages)}
+    return row
+
+
+@app.post('/jobs/scrape/{job_id}/cancel')
+def cancel_scrape_job(job_id: str, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)) -> dict[str, Any]:
+    job = db.query(ScrapeJob).filter(ScrapeJob.job_id == job_id).first()
+    if not job or job.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail='Job not found')
+    if job.status in SCRAPE_JOB_TERMINAL_STATUSES:
+        raise HTTPException(status_code=409, detail=f'Job already {job.status}')
+    now = datetime.now(timezone.utc)
+    # Jobs no worker is running (queued, or orphaned by a dead worker) are cancelled on the spot.
+    stopped = (
+        db.query(ScrapeJob)
+        .filter(
+            ScrapeJob.id == job.id,
+            or_(ScrapeJob.status == 'queued', and_(ScrapeJob.status == 'running', ScrapeJob.lease_expires_at < now)),
+        )
+        .update(
+            {
+                ScrapeJob.status: 'cancelled',
+                ScrapeJob.cancel_requested_at: now,
+                ScrapeJob.finished_at: now,
+                ScrapeJob.lease_owner: None,
+                ScrapeJob.lease_expires_at: None,
+            },
+            synchronize_session=False,
+        )
+    )
+    if stopped:
+        _record_scrape_job_events(db, job_id, [('cancelled', {'pages_scraped': 0, 'keyword_totals': {}})])
+        db.commit()
+        incr_metric('scrape_jobs.cancelled')
+        store_audit_event(db, 'scrape.job_cancelled', current_user.id, {'job_id': job_id})
+        return {'job_id': job_id, 'status': 'cancelled'}
+    # Running jobs stop cooperatively; the worker stores the partial result.
+    db.query(ScrapeJob).filter(ScrapeJob.id == job.id, ScrapeJob.status == 'running').update(
+        {ScrapeJob.cancel_requested_at: now}, synchronize_session=False
+    )
+    db.commit()
+    store_audit_event(db, 'scrape.job_cancel_requested', current_user.id, {'job_id': job_id})
+    return {'job_id': job_id, 'status': 'cancelling'}
 
 
-def _schedule_runner(schedule_id: str) -> None:
-    schedule = SCRAPE_SCHEDULES.get(schedule_id)
-    if not schedule:
-        return
-    payload = ScrapeAggregateRequest(**schedule['payload'])
-    job_id = str(uuid.uuid4())
-    SCRAPE_JOBS[job_id] = {
-        'job_id': job_id,
-        'user_id': schedule['user_id'],
-        'status': 'queued',
-        'created_at': datetime.now(timezone.utc).isoformat(),
-        'payload': payload.model_dump(),
-        'schedule_id': schedule_id,
+@app.post('/jobs/scrape/{job_id}/events/token')
+def create_scrape_job_events_token(
+    job_id: str, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+) -> dict[str, Any]:
+    job = db.query(ScrapeJob).filter(ScrapeJob.job_id == job_id).first()
+    if not job or job.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail='Job not found')
+    return {'token': create_scrape_stream_token(current_user.id, job_id), 'expires_in': SCRAPE_JOB_STREAM_TOKEN_SECONDS}
+
+
+@app.get('/jobs/scrape/{job_id}/events')
+def stream_scrape_job_events(
+    job_id: str,
+    request: Request,
+    after: int = 0,
+    token: str = '',
+    bearer: str | None = Depends(optional_oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    # The token is only checked when the stream opens; a reconnect after it expires needs a fresh one.
+    if token:
+        user_id = parse_scrape_stream_token(token, job_id)
+        if user_id is None:
+            raise HTTPException(status_code=401, detail='Invalid or expired stream token')
+    elif bearer:
+        user_id = require_user(db, bearer).id
+    else:
+        raise HTTPException(status_code=401, detail='Not authenticated', headers={'WWW-Authenticate': 'Bearer'})
+    job = db.query(ScrapeJob).filter(ScrapeJob.job_id == job_id).first()
+    if not job or job.user_id != user_id:
+        raise HTTPException(status_code=404, detail='Job not found')
+    last_event_id = request.headers.get('last-event-id', '')
+    cursor = int(last_event_id) if last_event_id.isdigit() else after
+
+    async def stream():
+        nonlocal cursor
+        idle = 0.0
+        while True:
+            db_stream = SessionLocal()
+            try:
+                # Status is read first: once it is terminal, every event up to the terminal one is committed.
+                status_now = db_stream.query(ScrapeJob.status).filter(ScrapeJob.job_id == job_id).scalar()
+                rows = (
+                    db_stream.query(ScrapeJobEvent)
+                    .filter(ScrapeJobEvent.job_id == job_id, ScrapeJobEvent.id > cursor)
+                    .order_by(ScrapeJobEvent.id)
+                    .limit(200)
+                    .all()
+                )
+            finally:
+                db_stream.close()
+            for row in rows:
+                cursor = row.id
+                yield f'id: {row.id}\nevent: {row.event_type}\ndata: {row.payload_json}\n\n'
+            if rows:
+                idle = 0.0
+                continue
+            if status_now is None or status_now in SCRAPE_JOB_TERMINAL_STATUSES or await request.is_disconnected():
+                return
+            await asyncio.sleep(SCRAPE_JOB_EVENTS_POLL_SECONDS)
+            idle += SCRAPE_JOB_EVENTS_POLL_SECONDS
+            if idle >= SCRAPE_JOB_EVENTS_KEEPALIVE_SECONDS:
+                idle = 0.0
+                yield ': keepalive\n\n'
+
+    return StreamingResponse(stream(), media_type='text/event-stream', headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+def _schedule_offset_seconds(schedule_id: str, interval_minutes: int) -> int:
+    spread = min(SCRAPE_SCHEDULE_MAX_JITTER_SECONDS, interval_minutes * 6)
+    return int(hashlib.sha256(schedule_id.encode('utf-8')).hexdigest()[:8], 16) % (spread + 1)
+
+
+def _next_schedule_run(current: datetime, interval_minutes: int, now: datetime) -> datetime:
+    # Skip missed slots instead of replaying them, keeping the schedule's phase.
+    interval = timedelta(minutes=interval_minutes)
+    missed = int((now - current) / interval) + 1 if current <= now else 0
+    return current + interval * missed
+
+
+def _claim_leader_lease_db(name: str, owner: str) -> bool:
+    now = datetime.now(timezone.utc)
+    expires_at = now + timedelta(seconds=SCRAPE_SCHEDULER_LEASE_SECONDS)
+    db = SessionLocal()
+    try:
+        renewed = (
+            db.query(ServiceLease)
+            .filter(ServiceLease.name == name, or_(ServiceLease.owner == owner, ServiceLease.expires_at < now))
+            .update({ServiceLease.owner: owner, ServiceLease.expires_at: expires_at}, synchronize_session=False)
+        )
+        db.commit()
+        if renewed:
+            return True
+        db.add(ServiceLease(name=name, owner=owner, expires_at=expires_at))
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            return False
+        return True
+    finally:
+        db.close()
+
+
+# Claim-or-renew in one step: a separate GET then EXPIRE could renew a lease that expired and was taken in between.
+SCHEDULER_LEASE_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if not current then
+  redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+  return 1
+end
+if current == ARGV[1] then
+  redis.call('EXPIRE', KEYS[1], ARGV[2])
+  return 1
+end
+return 0
+"""
+
+
+async def _claim_scheduler_leadership(owner: str) -> bool:
+    if redis_client is not None:
+        try:
+            result = await redis_client.eval(
+                SCHEDULER_LEASE_SCRIPT, 1, SCRAPE_SCHEDULER_LEASE_KEY, owner, SCRAPE_SCHEDULER_LEASE_SECONDS
+            )
+            return int(result) == 1
+        except Exception as exc:
+            logger.warning('Redis scheduler lease failed, using database lease: %s', exc)
+    return _claim_leader_lease_db(SCRAPE_SCHEDULER_LEASE_KEY, owner)
+
+
+async def _dispatch_scrape_schedules(owner: str = SCRAPE_WORKER_ID) -> int:
+    if not await _claim_scheduler_leadership(owner):
+        return 0
+    now = datetime.now(timezone.utc)
+    dispatched = 0
+    db = SessionLocal()
+    try:
+        due = (
+            db.query(ScrapeSchedule)
+            .filter(ScrapeSchedule.status == 'active', ScrapeSchedule.next_run_at <= now)
+            .order_by(ScrapeSchedule.next_run_at)
+            .all()
+        )
+        for schedule in due:
+            scheduled_for = schedule.next_run_at
+            # Conditional advance: a stale leader that overlaps this tick cannot fire the same slot twice.
+            advanced = (
+                db.query(ScrapeSchedule)
+                .filter(ScrapeSchedule.id == schedule.id, ScrapeSchedule.next_run_at == scheduled_for)
+                .update(
+                    {
+                        ScrapeSchedule.next_run_at: _next_schedule_run(_as_utc(scheduled_for), schedule.interval_minutes, now),
+                        ScrapeSchedule.last_run_at: now,
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            if not advanced:
+                continue
+            in_flight = (
+                db.query(ScrapeJob.id)
+                .filter(ScrapeJob.schedule_id == schedule.schedule_id, ScrapeJob.status.in_(('queued', 'running')))
+                .first()
+            )
+            if in_flight is not None:
+                # The previous run is still queued or crawling; coalesce instead of stacking another.
+                incr_metric('scrape_schedules.coalesced')
+                continue
+            payload = ScrapeAggregateRequest(**json.loads(schedule.payload_json))
+            job = _enqueue_scrape_job(db, schedule.user_id, payload, schedule_id=schedule.schedule_id)
+            db.query(ScrapeSchedule).filter(ScrapeSchedule.id == schedule.id).update(
+                {ScrapeSchedule.last_job_id: job.job_id}, synchronize_session=False
+            )
+            db.commit()
+            incr_metric('scrape_schedules.dispatched')
+            dispatched += 1
+    finally:
+        db.close()
+    if dispatched:
+        await _notify_scrape_workers()
+    return dispatched
+
+
+def _serialize_scrape_schedule(schedule: ScrapeSchedule) -> dict[str, Any]:
+    return {
+        'schedule_id': schedule.schedule_id,
+        'user_id': schedule.user_id,
+        'payload': json.loads(schedule.payload_json),
+        'interval_minutes': schedule.interval_minutes,
+        'created_at': _as_utc(schedule.created_at).isoformat(),
+        'status': schedule.status,
+        'next_run_at': _as_utc(schedule.next_run_at).isoformat(),
+        'last_run_at': _as_utc(schedule.last_run_at).isoformat() if schedule.last_run_at else None,
+        'last_job_id': schedule.last_job_id,
     }
-    asyncio.create_task(_run_scrape_job(job_id, schedule['user_id'], payload))
 
 
 @app.post('/crawler/schedules')
@@ -2004,36 +4775,36 @@ def create_scrape_schedule(
     db: Session = Depends(get_db),
 ) -> dict[str, Any]:
     schedule_id = str(uuid.uuid4())
-    schedule_data = {
-        'schedule_id': schedule_id,
-        'user_id': current_user.id,
-        'payload': payload.model_dump(),
-        'interval_minutes': payload.interval_minutes,
-        'created_at': datetime.now(timezone.utc).isoformat(),
-        'status': 'active',
-    }
-    SCRAPE_SCHEDULES[schedule_id] = schedule_data
-    if scheduler:
-        scheduler.add_job(_schedule_runner, 'interval', minutes=payload.interval_minutes, args=[schedule_id], id=schedule_id, replace_existing=True)
+    now = datetime.now(timezone.utc)
+    schedule = ScrapeSchedule(
+        schedule_id=schedule_id,
+        user_id=current_user.id,
+        payload_json=json.dumps(payload.model_dump()),
+        interval_minutes=payload.interval_minutes,
+        next_run_at=now + timedelta(minutes=payload.interval_minutes, seconds=_schedule_offset_seconds(schedule_id, payload.interval_minutes)),
+        created_at=now,
+    )
+    db.add(schedule)
+    db.commit()
+    db.refresh(schedule)
     store_audit_event(db, 'crawler.schedule_created', current_user.id, {'schedule_id': schedule_id, 'interval_minutes': payload.interval_minutes})
-    return schedule_data
+    return _serialize_scrape_schedule(schedule)
 
 
 @app.get('/crawler/schedules')
-def list_scrape_schedules(current_user: User = Depends(get_current_user)) -> dict[str, Any]:
-    schedules = [s for s in SCRAPE_SCHEDULES.values() if s.get('user_id') == current_user.id]
-    schedules.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-    return {'schedules': schedules}
+def list_scrape_schedules(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)) -> dict[str, Any]:
+    schedules = db.query(ScrapeSchedule).filter(ScrapeSchedule.user_id == current_user.id).order_by(ScrapeSchedule.created_at.desc()).all()
+    return {'schedules': [_serialize_scrape_schedule(schedule) for schedule in schedules]}
 
 
 @app.delete('/crawler/schedules/{schedule_id}')
 def delete_scrape_schedule(schedule_id: str, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)) -> dict[str, Any]:
-    schedule = SCRAPE_SCHEDULES.get(schedule_id)
-    if not schedule or schedule.get('user_id') != current_user.id:
+    schedule = db.query(ScrapeSchedule).filter(ScrapeSchedule.schedule_id == schedule_id).first()
+    if not schedule or schedule.user_id != current_user.id:
         raise HTTPException(status_code=404, detail='Schedule not found')
-    SCRAPE_SCHEDULES.pop(schedule_id, None)
-    if scheduler and scheduler.get_job(schedule_id):
-        scheduler.remove_job(schedule_id)
+    db.delete(schedule)
+    db.query(CrawlPageState).filter(CrawlPageState.schedule_id == schedule_id).delete(synchronize_session=False)
+    db.commit()
     store_audit_event(db, 'crawler.schedule_deleted', current_user.id, {'schedule_id': schedule_id})
     return {'status': 'deleted', 'schedule_id': schedule_id}
 
@@ -2062,87 +4833,265 @@ def _category_for_platform(platform_name: str) -> str:
     return 'Social'
 
 
-def _build_footprint_summary(db: Session, current_user: User) -> dict[str, Any]:
-    events = (
-        db.query(ScanEvent)
-        .filter(ScanEvent.user_id == current_user.id)
-        .order_by(ScanEvent.created_at.desc())
-        .limit(250)
-        .all()
-    )
-
-    profiles: dict[str, dict[str, Any]] = {}
-    papers_count = 0
-    breaches_count = 0
-    active_platforms: set[str] = set()
-    categories = {'Social': 0, 'Coding': 0, 'Academic': 0, 'Blogs': 0}
-
-    for event in events:
-        payload = _safe_json(event.payload_json)
-        if event.scan_type == 'username_scan':
-            queried_value = str(payload.get('username', '')).strip()
-            owner = str(payload.get('query_owner', '')).strip().lower()
+def _profile_sightings(scan_type: str, payload: dict[str, Any], current_user: User) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = []
+    owner = str(payload.get('query_owner', '')).strip().lower()
+    if scan_type == 'username_scan':
+        if owner:
+            is_self_query = owner == 'self'
+        else:
+            is_self_query = _is_self_query_value(str(payload.get('username', '')).strip(), current_user)
+        for row in payload.get('results', []):
+            if row.get('status') != 'Found':
+                continue
+            platform = row.get('platform', 'Unknown')
+            rows.append(
+                {
+                    'platform': platform,
+                    'category': _category_for_platform(platform),
+                    'username': row.get('username', ''),
+                    'profile_url': row.get('profile_url', ''),
+                    'source': 'username_scan',
+                    'is_self': is_self_query,
+                }
+            )
+    elif scan_type == 'face_scan':
+        for row in payload.get('matched_profiles', []):
+            platform = row.get('platform', 'Unknown')
+            rows.append(
+                {
+                    'platform': platform,
+                    'category': row.get('category') or _category_for_platform(platform),
+                    'username': row.get('username', ''),
+                    'profile_url': row.get('profile_url', ''),
+                    'source': 'face_match',
+                    'is_self': owner in ('', 'self'),
+                }
+            )
+        for row in payload.get('online_presence', []):
             if owner:
-                is_self_query = owner == 'self'
+                is_self = owner == 'self'
             else:
-                is_self_query = _is_self_query_value(queried_value, current_user)
-            if not is_self_query:
+                is_self = _is_self_profile_username(str(row.get('username', '')), current_user)
+            platform = row.get('platform', 'Unknown')
+            rows.append(
+                {
+                    'platform': platform,
+                    'category': row.get('category') or _category_for_platform(platform),
+                    'username': row.get('username', ''),
+                    'profile_url': row.get('profile_url', ''),
+                    'image_preview': row.get('image_preview', ''),
+                    'source': 'face_presence',
+                    'is_self': is_self,
+                }
+            )
+    return rows
+
+
+def _fold_footprint_event(state: dict[str, Any], scan_type: str, payload: dict[str, Any], current_user: User) -> None:
+    found: dict[str, dict[str, Any]] = {}
+    for row in _profile_sightings(scan_type, payload, current_user):
+        # Gallery face matches feed the graph and report, not the footprint.
+        if not row['is_self'] or row['source'] == 'face_match':
+            continue
+        profile = {key: row[key] for key in ('platform', 'category', 'username', 'profile_url')}
+        if 'image_preview' in row:
+            profile['image_preview'] = row['image_preview']
+        found.setdefault(f"{row['platform']}:{row['profile_url']}", profile)
+    # Events are folded oldest first, so the latest sighting of a profile wins.
+    state['profiles'].update(found)
+
+
+def _scan_index_key(user_id: int, *parts: str) -> str:
+    return hashlib.sha256('\n'.join([str(user_id), *parts]).encode('utf-8')).hexdigest()
+
+
+def _index_scan_event(db: Session, user: User, event_id: int, scan_type: str, payload: dict[str, Any]) -> None:
+    # Upserts the normalized rows for one scan event; caller commits. Re-indexing an event is a no-op.
+    now = datetime.now(timezone.utc)
+    if scan_type in ('username_scan', 'face_scan'):
+        sightings: dict[str, dict[str, Any]] = {}
+        for row in _profile_sightings(scan_type, payload, user):
+            key = _scan_index_key(user.id, str(row['platform']).lower(), row['profile_url'])
+            seen = sightings.setdefault(key, {**row, 'face_matched': False})
+            seen['face_matched'] = seen['face_matched'] or row['source'] == 'face_match'
+            seen['is_self'] = seen['is_self'] or row['is_self']
+        existing = {
+            row.profile_key: row
+            for row in db.query(DiscoveredProfile).filter(DiscoveredProfile.profile_key.in_(list(sightings))).all()
+        }
+        for key, row in sightings.items():
+            profile = existing.get(key)
+            if profile is None:
+                profile = DiscoveredProfile(profile_key=key, user_id=user.id, platform=row['platform'], first_seen_at=now, sightings=0)
+                db.add(profile)
+            elif profile.last_event_id >= event_id:
                 continue
-            for row in payload.get('results', []):
-                if row.get('status') != 'Found':
-                    continue
-                platform = row.get('platform', 'Unknown')
-                profile_url = row.get('profile_url', '')
-                key = f'{platform}:{profile_url}'
-                if key not in profiles:
-                    category = _category_for_platform(platform)
-                    profiles[key] = {
-                        'platform': platform,
-                        'category': category,
-                        'username': row.get('username', ''),
-                        'profile_url': profile_url,
-                    }
-        elif event.scan_type == 'face_scan':
-            owner = str(payload.get('query_owner', '')).strip().lower()
-            if owner and owner != 'self':
+            profile.profile_url = row['profile_url']
+            profile.username = row['username']
+            profile.category = row['category']
+            profile.source = row['source']
+            profile.is_self = int(bool(profile.is_self) or row['is_self'])
+            profile.face_matched = int(bool(profile.face_matched) or row['face_matched'])
+            profile.sightings += 1
+            profile.last_event_id = event_id
+            profile.last_seen_at = now
+    elif scan_type == 'research_search':
+        papers: dict[str, dict[str, Any]] = {}
+        for paper in payload.get('papers', []):
+            title = paper.get('title') or 'Untitled'
+            dedupe_key = _paper_dedupe_key(paper.get('doi'), title, paper.get('year'))
+            papers.setdefault(_scan_index_key(user.id, dedupe_key), {**paper, 'title': title, 'dedupe_key': dedupe_key})
+        existing = {
+            row.entry_key: row for row in db.query(UserPublication).filter(UserPublication.entry_key.in_(list(papers))).all()
+        }
+        for key, paper in papers.items():
+            row = existing.get(key)
+            if row is None:
+                row = UserPublication(entry_key=key, user_id=user.id, dedupe_key=paper['dedupe_key'][:512], first_seen_at=now, sightings=0)
+                db.add(row)
+            elif row.last_event_id >= event_id:
                 continue
-            for row in payload.get('online_presence', []):
-                if not owner and not _is_self_profile_username(str(row.get('username', '')), current_user):
-                    continue
-                platform = row.get('platform', 'Unknown')
-                profile_url = row.get('profile_url', '')
-                key = f'{platform}:{profile_url}'
-                if key not in profiles:
-                    profiles[key] = {
-                        'platform': platform,
-                        'category': row.get('category') or _category_for_platform(platform),
-                        'username': row.get('username', ''),
-                        'profile_url': profile_url,
-                        'image_preview': row.get('image_preview', ''),
-                    }
-        elif event.scan_type == 'research_search':
-            papers_count += len(payload.get('papers', []))
-        elif event.scan_type == 'breach_check':
-            breaches_count += len(payload.get('breaches', []))
-
-    for row in profiles.values():
+            row.doi = paper.get('doi')
+            row.title = paper['title']
+            row.year = paper.get('year')
+            row.citations = int(paper.get('citations') or 0)
+            row.sightings += 1
+            row.last_event_id = event_id
+            row.last_seen_at = now
+    elif scan_type == 'breach_check':
+        breaches: dict[str, dict[str, Any]] = {}
+        for breach in payload.get('breaches', []):
+            site = str(breach.get('site') or '').strip()
+            if site:
+                breaches.setdefault(_scan_index_key(user.id, site.lower()), {**breach, 'site': site})
+        existing = {
+            row.exposure_key: row
+            for row in db.query(BreachExposure).filter(BreachExposure.exposure_key.in_(list(breaches))).all()
+        }
+        for key, breach in breaches.items():
+            row = existing.get(key)
+            if row is None:
+                row = BreachExposure(exposure_key=key, user_id=user.id, site=breach['site'][:255], first_seen_at=now)
+                db.add(row)
+            elif row.last_event_id >= event_id:
+                continue
+            row.email = str(payload.get('email') or '')[:255]
+            row.data_classes = breach.get('data') or ''
+            row.breach_date = breach.get('date')
+            row.risk = breach.get('risk') or 'low'
+            row.records = int(breach.get('records') or 0)
+            row.last_event_id = event_id
+            row.last_seen_at = now
+
+
+def _footprint_summary_view(state: dict[str, Any]) -> dict[str, Any]:
+    active_platforms: set[str] = set()
+    categories = {'Social': 0, 'Coding': 0, 'Academic': 0, 'Blogs': 0}
+    for row in state['profiles'].values():
         platform = row.get('platform')
         if platform:
             active_platforms.add(platform)
         category = row.get('category', 'Social')
         categories[category] = categories.get(category, 0) + 1
 
-    profile_rows = sorted(profiles.values(), key=lambda x: (x.get('category', ''), x.get('platform', '')))[:120]
+    profile_rows = sorted(state['profiles'].values(), key=lambda x: (x.get('category', ''), x.get('platform', '')))[:120]
     return {
         'total_accounts_found': len(profile_rows),
         'active_platforms': sorted(active_platforms),
         'categories': categories,
-        'research_papers_found': papers_count,
-        'breach_records_found': breaches_count,
+        'research_papers_found': state['papers'],
+        'breach_records_found': state['breaches'],
         'profiles': profile_rows,
     }
 
 
+def _footprint_counts(db: Session, user_id: int) -> tuple[int, int]:
+    # Distinct papers and breaches come from the normalized tables, so repeated scans never inflate them.
+    papers = db.query(func.count(UserPublication.id)).filter(UserPublication.user_id == user_id).scalar() or 0
+    breaches = db.query(func.count(BreachExposure.id)).filter(BreachExposure.user_id == user_id).scalar() or 0
+    return papers, breaches
+
+
+def _footprint_state(row: FootprintSummary) -> dict[str, Any]:
+    return {'profiles': _safe_json(row.profiles_json), 'papers': row.papers_count, 'breaches': row.breaches_count}
+
+
+def _rebuild_footprint_summary(db: Session, current_user: User) -> FootprintSummary:
+    state: dict[str, Any] = {'profiles': {}, 'papers': 0, 'breaches': 0}
+    last_event_id = 0
+    events = (
+        db.query(ScanEvent)
+        .filter(ScanEvent.user_id == current_user.id, ScanEvent.scan_type.in_(FOOTPRINT_SCAN_TYPES))
+        .order_by(ScanEvent.id)
+        .yield_per(200)
+    )
+    for event in events:
+        _fold_footprint_event(state, event.scan_type, _safe_json(event.payload_json), current_user)
+        last_event_id = event.id
+    state['papers'], state['breaches'] = _footprint_counts(db, current_user.id)
+    db.query(FootprintSummary).filter(FootprintSummary.user_id == current_user.id).delete()
+    row = FootprintSummary(
+        user_id=current_user.id,
+        profiles_json=json.dumps(state['profiles']),
+        papers_count=state['papers'],
+        breaches_count=state['breaches'],
+        last_event_id=last_event_id,
+        updated_at=datetime.now(timezone.utc),
+    )
+    db.add(row)
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent request rebuilt it first; both folded the same events.
+        db.rollback()
+        return db.query(FootprintSummary).filter(FootprintSummary.user_id == current_user.id).one()
+    incr_metric('footprint.rebuilt')
+    return row
+
+
+def _apply_footprint_event(db: Session, user: User, event_id: int, scan_type: str, payload: dict[str, Any]) -> None:
+    row = db.query(FootprintSummary).filter(FootprintSummary.user_id == user.id).first()
+    if row is None:
+        # No summary yet: the lazy rebuild on next read includes this event.
+        return
+    if row.last_event_id >= event_id:
+        # A newer event was folded first, so the high-water mark cannot tell whether this one is in.
+        # Drop the row; the next read rebuilds it from every stored event.
+        incr_metric('footprint.out_of_order')
+        db.query(FootprintSummary).filter(FootprintSummary.user_id == user.id).delete(synchronize_session=False)
+        db.commit()
+        return
+    state = _footprint_state(row)
+    _fold_footprint_event(state, scan_type, payload, user)
+    state['papers'], state['breaches'] = _footprint_counts(db, user.id)
+    applied = (
+        db.query(FootprintSummary)
+        .filter(FootprintSummary.user_id == user.id, FootprintSummary.last_event_id == row.last_event_id)
+        .update(
+            {
+                FootprintSummary.profiles_json: json.dumps(state['profiles']),
+                FootprintSummary.papers_count: state['papers'],
+                FootprintSummary.breaches_count: state['breaches'],
+                FootprintSummary.last_event_id: event_id,
+                FootprintSummary.updated_at: datetime.now(timezone.utc),
+            },
+            synchronize_session=False,
+        )
+    )
+    if not applied:
+        # Lost a race with another writer; drop the row so the next read rebuilds from events.
+        db.query(FootprintSummary).filter(FootprintSummary.user_id == user.id).delete(synchronize_session=False)
+    db.commit()
+
+
+def _build_footprint_summary(db: Session, current_user: User) -> dict[str, Any]:
+    row = db.query(FootprintSummary).filter(FootprintSummary.user_id == current_user.id).first()
+    if row is None:
+        row = _rebuild_footprint_summary(db, current_user)
+    return _footprint_summary_view(_footprint_state(row))
+
+
 def _build_reputation_insight(summary: dict[str, Any]) -> dict[str, Any]:
     accounts = int(summary.get('total_accounts_found', 0))
     papers = int(summary.get('research_papers_found', 0))
@@ -2445,14 +5394,6 @@ def _safe_json(raw: str) -> dict[str, Any]:
 
 @app.get('/graph-data')
 def graph_data(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)) -> dict[str, Any]:
-    events = (
-        db.query(ScanEvent)
-        .filter(ScanEvent.user_id == current_user.id)
-        .order_by(ScanEvent.created_at.desc())
-        .limit(200)
-        .all()
-    )
-
     user_node_id = f'user-{current_user.id}'
     nodes: dict[str, dict[str, Any]] = {
         user_node_id: {
@@ -2474,42 +5415,51 @@ def graph_data(current_user: User = Depends(get_current_user), db: Session = Dep
         if edge_id not in edges:
             edges[edge_id] = {'data': {'source': source, 'target': target, 'label': label}}
 
-    for event in events:
-        payload = _safe_json(event.payload_json)
-
-        if event.scan_type in ('username_scan', 'face_scan'):
-            matches = payload.get('results', []) if event.scan_type == 'username_scan' else payload.get('matched_profiles', [])
-            for match in matches:
-                platform = match.get('platform')
-                if not platform:
-                    continue
-                node_id = f'platform:{platform.lower()}'
-                add_node(node_id, platform, 'Platform')
-                add_edge(user_node_id, node_id, 'appears_on')
-
-        if event.scan_type == 'research_search':
-            for idx, paper in enumerate(payload.get('papers', [])[:15]):
-                title = paper.get('title', 'Untitled')
-                node_id = f'paper:{abs(hash(title)) % 10000000}:{idx}'
-                add_node(node_id, title[:60], 'Research Paper')
-                add_edge(user_node_id, node_id, 'authored')
-
-        if event.scan_type == 'breach_check':
-            for breach in payload.get('breaches', [])[:20]:
-                site = breach.get('site')
-                if not site:
-                    continue
-                node_id = f'breach:{site.lower()}'
-                add_node(node_id, site, 'Breach Event')
-                add_edge(user_node_id, node_id, 'exposed_in')
+    platforms = (
+        db.query(DiscoveredProfile.platform)
+        .filter(DiscoveredProfile.user_id == current_user.id)
+        .group_by(DiscoveredProfile.platform)
+        .order_by(func.max(DiscoveredProfile.last_seen_at).desc())
+        .limit(GRAPH_PLATFORM_LIMIT)
+        .all()
+    )
+    for (platform,) in platforms:
+        node_id = f'platform:{platform.lower()}'
+        add_node(node_id, platform, 'Platform')
+        add_edge(user_node_id, node_id, 'appears_on')
+
+    papers = (
+        db.query(UserPublication.id, UserPublication.title)
+        .filter(UserPublication.user_id == current_user.id)
+        .order_by(UserPublication.last_seen_at.desc(), UserPublication.citations.desc())
+        .limit(GRAPH_PAPER_LIMIT)
+        .all()
+    )
+    for paper_id, title in papers:
+        node_id = f'paper:{paper_id}'
+        add_node(node_id, (title or 'Untitled')[:60], 'Research Paper')
+        add_edge(user_node_id, node_id, 'authored')
+
+    breaches = (
+        db.query(BreachExposure.site)
+        .filter(BreachExposure.user_id == current_user.id)
+        .order_by(BreachExposure.last_seen_at.desc())
+        .limit(GRAPH_BREACH_LIMIT)
+        .all()
+    )
+    for (site,) in breaches:
+        node_id = f'breach:{site.lower()}'
+        add_node(node_id, site, 'Breach Event')
+        add_edge(user_node_id, node_id, 'exposed_in')
 
+    events_ingested = db.query(func.count(ScanEvent.id)).filter(ScanEvent.user_id == current_user.id).scalar() or 0
     return {
         'nodes': list(nodes.values()),
         'edges': list(edges.values()),
         'summary': {
             'nodes': len(nodes),
             'edges': len(edges),
-            'events_ingested': len(events),
+            'events_ingested': events_ingested,
         },
         'status': 'dynamic-graph',
     }
@@ -2583,31 +5533,25 @@ def export_report_json(current_user: User = Depends(get_current_user), db: Sessi
 
 @app.get('/report/export/pdf')
 def export_report_pdf(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)) -> StreamingResponse:
-    events = (
-        db.query(ScanEvent)
+    counts: dict[str, int] = dict(
+        db.query(ScanEvent.scan_type, func.count(ScanEvent.id))
         .filter(ScanEvent.user_id == current_user.id)
-        .order_by(ScanEvent.created_at.desc())
-        .limit(300)
+        .group_by(ScanEvent.scan_type)
         .all()
     )
-
-    counts: dict[str, int] = defaultdict(int)
-    risk_score = None
-    breaches_count = 0
-    matched_profiles = 0
-    papers_count = 0
-
-    for event in events:
-        counts[event.scan_type] += 1
-        payload = _safe_json(event.payload_json)
-        if event.scan_type == 'risk_calculation' and risk_score is None:
-            risk_score = payload.get('score')
-        if event.scan_type == 'breach_check':
-            breaches_count += len(payload.get('breaches', []))
-        if event.scan_type == 'face_scan':
-            matched_profiles += len(payload.get('matched_profiles', []))
-        if event.scan_type == 'research_search':
-            papers_count += len(payload.get('papers', []))
+    latest_risk = (
+        db.query(ScanEvent.payload_json)
+        .filter(ScanEvent.user_id == current_user.id, ScanEvent.scan_type == 'risk_calculation')
+        .order_by(ScanEvent.created_at.desc(), ScanEvent.id.desc())
+        .first()
+    )
+    risk_score = _safe_json(latest_risk.payload_json).get('score') if latest_risk else None
+    matched_profiles = (
+        db.query(func.count(DiscoveredProfile.id))
+        .filter(DiscoveredProfile.user_id == current_user.id, DiscoveredProfile.face_matched == 1)
+        .scalar()
+    )
+    papers_count, breaches_count = _footprint_counts(db, current_user.id)
 
     buffer = io.BytesIO()
     pdf = canvas.Canvas(buffer, pagesize=letter)
@@ -2628,7 +5572,7 @@ def export_report_pdf(current_user: User = Depends(get_current_user), db: Sessio
     y -= 18
     pdf.setFont('Helvetica', 10)
     lines = [
-        f"Total scan events: {len(events)}",
+        f"Total scan events: {sum(counts.values())}",
         f"Latest risk score: {risk_score if risk_score is not None else 'N/A'}",
         f"Matched profiles detected: {matched_profiles}",
         f"Research papers detected: {papers_count}",
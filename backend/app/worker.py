@@ -0,0 +1,41 @@
+import asyncio
+import signal
+
+from app.main import (
+    PROCESS_ROLE,
+    SCRAPE_WORKER_COUNT,
+    SCRAPE_WORKER_ID,
+    ensure_schema,
+    logger,
+    shutdown,
+    start_background_services,
+    stop_background_services,
+)
+
+
+async def run() -> None:
+    ensure_schema()
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+
+    await start_background_services()
+    logger.info('Background worker %s started with %s scrape workers', SCRAPE_WORKER_ID, SCRAPE_WORKER_COUNT)
+    try:
+        await stopping.wait()
+    finally:
+        # Cancelled jobs are released back to the queue for the next worker.
+        await stop_background_services()
+        shutdown()
+        logger.info('Background worker %s stopped', SCRAPE_WORKER_ID)
+
+
+def main() -> None:
+    if PROCESS_ROLE == 'api':
+        logger.warning('SHADOWGRAPH_PROCESS_ROLE=api is set for the worker entry point; running background work anyway.')
+    asyncio.run(run())
+
+
+if __name__ == '__main__':
+    main()
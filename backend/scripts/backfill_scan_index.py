@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.main import FOOTPRINT_SCAN_TYPES, FootprintSummary, ScanEvent, SessionLocal, User, _index_scan_event, _safe_json, ensure_schema  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Backfill discovered_profiles, user_publications and breach_exposures from scan events.')
+    parser.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args()
+
+    print('== ShadowGraph Scan Index Backfill ==')
+    ensure_schema()
+    db = SessionLocal()
+    try:
+        users: dict[int, User | None] = {}
+        started = time.perf_counter()
+        indexed = 0
+        cursor = 0
+        while True:
+            # Oldest first, so the latest sighting wins exactly as with live writes; already-indexed events are skipped.
+            events = (
+                db.query(ScanEvent)
+                .filter(ScanEvent.id > cursor, ScanEvent.scan_type.in_(FOOTPRINT_SCAN_TYPES))
+                .order_by(ScanEvent.id)
+                .limit(args.batch_size)
+                .all()
+            )
+            if not events:
+                break
+            for event in events:
+                if event.user_id not in users:
+                    users[event.user_id] = db.query(User).filter(User.id == event.user_id).first()
+                user = users[event.user_id]
+                if user is not None:
+                    _index_scan_event(db, user, event.id, event.scan_type, _safe_json(event.payload_json))
+                    indexed += 1
+                cursor = event.id
+            db.commit()
+            print(f'indexed {indexed} events (up to id {cursor})')
+        # Summaries built before the backfill counted papers and breaches from empty tables; drop them so the
+        # next read rebuilds them from the filled tables.
+        touched = [user_id for user_id, user in users.items() if user is not None]
+        dropped = 0
+        for idx in range(0, len(touched), args.batch_size):
+            chunk = touched[idx : idx + args.batch_size]
+            dropped += db.query(FootprintSummary).filter(FootprintSummary.user_id.in_(chunk)).delete(synchronize_session=False)
+        db.commit()
+        print(f'[OK] backfilled {indexed} events in {time.perf_counter() - started:.1f}s; reset {dropped} footprint summaries')
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
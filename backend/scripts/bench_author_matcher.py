@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.main import AuthorMatcher, _author_match_score, _name_profiles, _name_variants  # noqa: E402
+
+GIVEN = ['Ada', 'A.', 'Charles', 'Grace', 'Alan', 'Mary Ann', 'J. R.', 'Sadia', 'Wei', 'Priya']
+FAMILY = ['Babbage', 'Hopper', 'Turing', 'Sakharkar', 'Zhang', 'Patel', 'Smith', 'Garcia', 'Adams', 'Lovell']
+
+
+def build_items(count: int, authors_per_item: int, seed: int = 11) -> list[dict]:
+    rng = random.Random(seed)
+    # Large collaborations reuse a roster of names, and most authors do not match the query.
+    roster = [
+        {'given': rng.choice(GIVEN), 'family': rng.choice(FAMILY) + ''.join(rng.choice('abcdefghij') for _ in range(3))}
+        for _ in range(authors_per_item * 2)
+    ]
+    items = [{'author': rng.sample(roster, authors_per_item)} for _ in range(count)]
+    for item in items[::10]:
+        item['author'].append({'given': 'A.', 'family': 'Lovelace'})
+    return items
+
+
+def reference_pass(item: dict, profiles: list[dict]) -> bool:
+    return any(_author_match_score(author, profiles) >= 0.65 for author in item.get('author', []))
+
+
+def main() -> int:
+    print('== ShadowGraph Author Matcher Benchmark ==')
+    profiles = _name_profiles(_name_variants('Ada Lovelace'))
+    for count, authors_per_item in ((200, 10), (60, 500), (20, 3000)):
+        items = build_items(count, authors_per_item)
+
+        started = time.perf_counter()
+        reference = [reference_pass(item, profiles) for item in items]
+        reference_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        matcher = AuthorMatcher(profiles)
+        compiled = [any(matcher.matches(author) for author in item['author']) for item in items]
+        compiled_ms = (time.perf_counter() - started) * 1000
+
+        if reference != compiled:
+            print('[FAIL] compiled matcher disagrees with reference scoring')
+            return 1
+        speedup = reference_ms / compiled_ms if compiled_ms else float('inf')
+        print(f'{count:4} items x {authors_per_item:5} authors: reference {reference_ms:8.1f} ms | compiled {compiled_ms:8.1f} ms | {speedup:5.1f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
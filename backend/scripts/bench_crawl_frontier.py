@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+import asyncio
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import app.main as main  # noqa: E402
+from app.main import ScrapeAggregateRequest, _run_scrape_pipeline  # noqa: E402
+
+NAV = ['about', 'contact', 'careers', 'events', 'press', 'news', 'team', 'partners', 'legal', 'support', 'store', 'blog']
+TOPICS = ['privacy', 'graph', 'breach', 'exposure']
+FILLER = ['lorem', 'ipsum', 'dolor', 'sit', 'amet', 'tempor', 'labore', 'magna', 'aliqua', 'veniam']
+
+
+def build_site(seed: int = 5, fanout: int = 6, depth: int = 4) -> dict[str, str]:
+    # A navigation-heavy tree with one on-topic branch that links deeper into keyword-dense pages.
+    rng = random.Random(seed)
+    pages: dict[str, str] = {}
+
+    def make(path: str, level: int, topical: bool) -> None:
+        children: list[tuple[str, str, bool]] = []
+        if level < depth:
+            for idx in range(fanout):
+                child_topical = topical or (level == 0 and idx == fanout - 1)
+                if child_topical:
+                    topic = rng.choice(TOPICS)
+                    children.append((f'{path.rstrip("/")}/{topic}-{idx}', f'{topic.title()} research {idx}', True))
+                else:
+                    name = rng.choice(NAV)
+                    children.append((f'{path.rstrip("/")}/{name}-{idx}', name.title(), False))
+        words = [rng.choice(FILLER) for _ in range(200)]
+        if topical:
+            for pos in rng.sample(range(len(words)), 25):
+                words[pos] = rng.choice(TOPICS)
+        links = ''.join(f'<li><a href="{href}">{label}</a></li>' for href, label, _ in children)
+        pages[path] = f'<html><title>{path}</title><body><ul>{links}</ul><p>{" ".join(words)}</p></body></html>'
+        for href, _, child_topical in children:
+            make(href, level + 1, child_topical)
+
+    make('/', 0, False)
+    return pages
+
+
+def transport_for(site: dict[str, str]) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = site.get(request.url.path)
+        if body is None:
+            return httpx.Response(404, text='missing', headers={'content-type': 'text/html'})
+        return httpx.Response(200, text=body, headers={'content-type': 'text/html'})
+
+    return httpx.MockTransport(handler)
+
+
+def run(site: dict[str, str], frontier: str, max_pages: int) -> tuple[dict, float]:
+    payload = ScrapeAggregateRequest(
+        seed_urls=['https://fixture.test/'], keywords=TOPICS, max_pages=max_pages, same_domain_only=True, frontier=frontier
+    )
+    started = time.perf_counter()
+    result = asyncio.run(_run_scrape_pipeline(payload, transport=transport_for(site)))
+    return result, (time.perf_counter() - started) * 1000
+
+
+def main_bench() -> int:
+    print('== ShadowGraph Crawl Frontier Benchmark ==')
+    logging.getLogger('httpx').setLevel(logging.WARNING)
+    main.CRAWLER_DOMAIN_DELAY_SECONDS = 0.0
+    main.CRAWLER_RESPECT_ROBOTS = False
+    main.CRAWLER_USE_SITEMAPS = False
+    site = build_site()
+    print(f'fixture site: {len(site)} pages')
+    for max_pages in (6, 10, 20):
+        rows = []
+        for frontier in ('bfs', 'best_first'):
+            result, elapsed_ms = run(site, frontier, max_pages)
+            fetched = result['aggregates']['pages_scraped']
+            hits = sum(result['aggregates']['keyword_totals'].values())
+            on_topic = sum(1 for page in result['pages'] if sum(page['keyword_hits'].values()) > 0)
+            rows.append((frontier, fetched, hits, on_topic, elapsed_ms))
+        for frontier, fetched, hits, on_topic, elapsed_ms in rows:
+            per_page = hits / fetched if fetched else 0.0
+            print(
+                f'max_pages={max_pages:2} {frontier:10}: {fetched:2} fetched | {on_topic:2} on-topic '
+                f'| {hits:4} keyword hits | {per_page:5.1f} hits/page | {elapsed_ms:6.1f} ms'
+            )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main_bench())
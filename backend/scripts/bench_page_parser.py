@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+import asyncio
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from app.main import (  # noqa: E402
+    KeywordCounter,
+    _absolute_link,
+    _analyze_page,
+    _analyze_page_offloaded,
+    _extract_emails,
+    _normalize_text,
+    _simhash,
+)
+
+WORDS = ['graph', 'privacy', 'research', 'profile', 'exposure', 'network', 'open', 'source', 'data', 'lab']
+KEYWORDS = KeywordCounter(['graph', 'privacy', 'open source', 'open', 'data lab'])
+
+
+def build_page(sections: int, seed: int) -> str:
+    rng = random.Random(seed)
+    parts = ['<!doctype html><html><head><title>Fixture &amp; Page</title>', '<style>.x{color:red}</style>']
+    parts.append('<script>var tracking = "graph graph";</script></head><body>')
+    for idx in range(sections):
+        text = ' '.join(rng.choice(WORDS) for _ in range(60))
+        parts.append(f'<div class="s"><h2>Section {idx}</h2><p>{text} <b>bold</b> &lt;tag&gt;</p>')
+        parts.append(f'<a href="/page/{idx}">next</a> <a href="https://ext{idx % 7}.example/x?i={idx}">ext</a>')
+        if idx % 25 == 0:
+            parts.append(f'<!-- comment {idx} --><p>contact person{idx}@example.org</p><a href="mailto:x@y.z">m</a>')
+        parts.append('</div>')
+    parts.append('</body></html>')
+    return ''.join(parts)
+
+
+def reference_analyze(url: str, html: str, keywords: KeywordCounter) -> dict:
+    # The previous BeautifulSoup-based implementation, kept here as the correctness baseline.
+    soup = BeautifulSoup(html, 'html.parser')
+    title = _normalize_text(soup.title.string if soup.title and soup.title.string else 'Untitled')
+    body_text = _normalize_text(soup.get_text(' ', strip=True))
+    # Whole-text count; the tokenizer streams the same counts chunk by chunk.
+    hits = keywords.count(body_text)
+    links: list[str] = []
+    link_texts: list[str] = []
+    for tag in soup.find_all('a', href=True):
+        link = _absolute_link(url, tag.get('href', ''))
+        if link:
+            links.append(link)
+            link_texts.append(' '.join(tag.stripped_strings)[:200])
+    return {
+        'title': title,
+        'word_count': len(body_text.split()),
+        'emails': _extract_emails(body_text),
+        'links': links,
+        'link_texts': link_texts,
+        'keyword_hits': hits,
+        'simhash': f'{_simhash(body_text):016x}',
+    }
+
+
+async def offloaded(pages: list[str]) -> list[dict]:
+    return list(await asyncio.gather(*(_analyze_page_offloaded('https://site.test/', html, KEYWORDS) for html in pages)))
+
+
+def main() -> int:
+    print('== ShadowGraph Page Parser Benchmark ==')
+    fixture_paths = [Path(arg) for arg in sys.argv[1:]]
+    for sections, count in ((50, 40), (500, 10), (4000, 3)):
+        if fixture_paths:
+            pages = [path.read_text(encoding='utf-8', errors='replace') for path in fixture_paths]
+        else:
+            pages = [build_page(sections, seed) for seed in range(count)]
+        size_kb = sum(len(page) for page in pages) / len(pages) / 1024
+
+        started = time.perf_counter()
+        reference = [reference_analyze('https://site.test/', html, KEYWORDS) for html in pages]
+        reference_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        tokenized = [_analyze_page('https://site.test/', html, KEYWORDS) for html in pages]
+        tokenized_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        pooled = asyncio.run(offloaded(pages))
+        pooled_ms = (time.perf_counter() - started) * 1000
+
+        if reference != tokenized or tokenized != pooled:
+            print('[FAIL] tokenizer output disagrees with BeautifulSoup baseline')
+            return 1
+        texts = [_normalize_text(BeautifulSoup(html, 'html.parser').get_text(' ', strip=True)).lower() for html in pages]
+        many = KeywordCounter(WORDS * 2 + [f'{a} {b}' for a, b in zip(WORDS, reversed(WORDS))])
+        per_keyword = [re.compile(rf'(?<!\w)(?={re.escape(keyword)}(?!\w))') for keyword in many.keywords]
+        started = time.perf_counter()
+        for text in texts:
+            baseline = {}
+            for keyword, pattern in zip(many.keywords, per_keyword):
+                hits = len(pattern.findall(text))
+                if hits:
+                    baseline[keyword] = hits
+        per_keyword_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        for text in texts:
+            compiled = many.count(text)
+        compiled_ms = (time.perf_counter() - started) * 1000
+        if compiled != baseline:
+            print('[FAIL] compiled keyword counts disagree with per-keyword scans')
+            return 1
+        speedup = reference_ms / tokenized_ms if tokenized_ms else float('inf')
+        print(
+            f'{len(pages):3} pages x {size_kb:7.1f} KB: bs4 {reference_ms:8.1f} ms | tokenizer {tokenized_ms:8.1f} ms '
+            f'| pooled {pooled_ms:8.1f} ms | {speedup:4.1f}x'
+        )
+        print(
+            f'    {len(many.keywords)} whole-word keywords: one scan per keyword {per_keyword_ms:8.1f} ms '
+            f'| compiled single pass {compiled_ms:8.1f} ms'
+        )
+        if fixture_paths:
+            break
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
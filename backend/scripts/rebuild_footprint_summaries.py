@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.main import SessionLocal, User, _rebuild_footprint_summary, ensure_schema  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Rebuild materialized footprint summaries from stored scan events.')
+    parser.add_argument('--user-id', type=int, action='append', help='Only rebuild these users (repeatable).')
+    args = parser.parse_args()
+
+    print('== ShadowGraph Footprint Summary Rebuild ==')
+    ensure_schema()
+    db = SessionLocal()
+    try:
+        query = db.query(User).order_by(User.id)
+        if args.user_id:
+            query = query.filter(User.id.in_(args.user_id))
+        started = time.perf_counter()
+        rebuilt = 0
+        for user in query.all():
+            row = _rebuild_footprint_summary(db, user)
+            rebuilt += 1
+            print(f'user {user.id:6}: {row.papers_count} papers | {row.breaches_count} breaches | up to event {row.last_event_id}')
+        print(f'[OK] rebuilt {rebuilt} summaries in {time.perf_counter() - started:.1f}s')
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,7 @@
 import pytest
 from fastapi.testclient import TestClient
 
-from app.main import Base, SessionLocal, app, engine
+from app.main import RATE_BUCKETS, ROBOTS_CACHE, SCRAPE_RESULT_CACHE, Base, SessionLocal, app, engine
 
 
 @pytest.fixture(scope='session', autouse=True)
@@ -19,6 +19,9 @@ def clean_db():
         db.commit()
     finally:
         db.close()
+    RATE_BUCKETS.clear()
+    ROBOTS_CACHE.clear()
+    SCRAPE_RESULT_CACHE.clear()
     yield
 
 
@@ -0,0 +1,18 @@
+import random
+
+from app.main import AuthorMatcher, _author_match_score, _name_profiles, _name_variants
+
+
+def test_author_matcher_agrees_with_reference_scoring():
+    rng = random.Random(7)
+    givens = ['Ada', 'A.', 'Augusta', 'Charles', 'C', 'Lovelace', '', 'Mary Ann']
+    families = ['Lovelace', 'Love', 'Lovelaces', 'Babbage', 'King-Noel', '', 'lovelace', 'Ada']
+    authors = [{'given': rng.choice(givens), 'family': rng.choice(families)} for _ in range(400)]
+
+    for query in ('Ada Lovelace', 'Lovelace', 'A King Noel', 'Ada'):
+        profiles = _name_profiles(_name_variants(query))
+        matcher = AuthorMatcher(profiles)
+        for author in authors:
+            expected = _author_match_score(author, profiles)
+            assert matcher.score(author) == expected
+            assert matcher.matches(author) == (expected >= 0.65)
@@ -0,0 +1,170 @@
+import asyncio
+import json
+
+import httpx
+
+import app.main as main
+
+
+def test_hibp_schedule_spaces_and_caps_requests(monkeypatch):
+    monkeypatch.setattr(main, 'HIBP_BURST', 1)
+    main.HIBP_BUCKET_STATE.clear()
+    waits = [main._hibp_reserve_local(100.0, 6.0, 15.0) for _ in range(4)]
+    assert waits == [0.0, 6.0, 12.0, -1.0]
+
+    # Retry-After pushes the shared schedule out without consuming a slot.
+    main._hibp_reserve_local(100.0, 6.0, -1, penalty_until=200.0, cost=0)
+    assert main._hibp_reserve_local(100.0, 6.0, -1) == 100.0
+
+
+def test_hibp_schedule_fails_closed_when_redis_is_down(monkeypatch):
+    class BrokenRedis:
+        async def eval(self, *args):
+            raise ConnectionError('redis down')
+
+    monkeypatch.setattr(main, 'redis_client', BrokenRedis())
+    main.HIBP_BUCKET_STATE.clear()
+    main.METRICS.clear()
+    assert asyncio.run(main._hibp_reserve(30.0)) == -1.0
+    assert not asyncio.run(main._hibp_acquire(30.0))
+    assert main.METRICS['hibp.redis_unavailable'] == 2
+    assert main.HIBP_BUCKET_STATE == {}
+
+
+def test_hibp_lookup_maps_statuses(monkeypatch):
+    monkeypatch.setattr(main, 'redis_client', None)
+    main.HIBP_BUCKET_STATE.clear()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if 'clean' in request.url.path:
+            return httpx.Response(404)
+        assert request.url.params['truncateResponse'] == 'true'
+        if 'fresh' in request.url.path:
+            return httpx.Response(200, json=[{'Name': 'Adobe'}, {'Name': 'Brandnew'}])
+        return httpx.Response(200, json=[{'Name': 'Adobe'}])
+
+    db = main.SessionLocal()
+    try:
+        main._store_hibp_catalog(
+            db, [{'Name': 'Adobe', 'DataClasses': ['Emails', 'Passwords'], 'BreachDate': '2013-10-04', 'PwnCount': 5}]
+        )
+    finally:
+        db.close()
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            monkeypatch.setattr(main, 'HIBP_RATE_PER_MINUTE', 60000)
+            emails = ('clean@example.com', 'pwned@example.com', 'fresh@example.com')
+            return [await main._hibp_lookup(client, email) for email in emails]
+
+    # The forced catalog refresh for unknown names is throttled, so the lookup stays offline.
+    monkeypatch.setitem(main.HIBP_CATALOG_STATE, 'attempted_at', main.time.time())
+    clean, pwned, fresh = asyncio.run(run())
+    assert clean['status'] == 'no-breaches'
+    assert pwned['status'] == 'live-check'
+    assert pwned['breaches'] == [
+        {'site': 'Adobe', 'data': 'Emails, Passwords', 'date': '2013-10-04', 'risk': 'low', 'records': 5}
+    ]
+    # A breach missing from the catalog is flagged instead of being reported as low risk.
+    assert fresh['breaches'][1] == {
+        'site': 'Brandnew', 'data': '', 'date': None, 'risk': 'unknown', 'records': 0, 'metadata': 'unavailable'
+    }
+
+
+def test_batch_breach_check_streams_rows(client, auth_headers, monkeypatch):
+    monkeypatch.delenv('HIBP_API_KEY', raising=False)
+    response = client.post(
+        '/check-breach/batch',
+        json={'emails': ['one@example.com', 'two@example.com', 'ONE@example.com']},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row.get('email') for row in rows[:-1]] == ['one@example.com', 'two@example.com']
+    assert rows[-1] == {'status': 'batch-complete', 'checked': 2}
+
+
+def test_batch_wait_budget_fits_the_batch(client, auth_headers, monkeypatch):
+    budgets = []
+
+    async def fake_lookup(client, email, max_wait=0):
+        budgets.append(max_wait)
+        if email.startswith('late'):
+            return main._breach_payload(email, 'rate-limited')
+        return main._breach_payload(email, 'no-breaches')
+
+    monkeypatch.setenv('HIBP_API_KEY', 'test-key')
+    monkeypatch.setattr(main, '_hibp_lookup', fake_lookup)
+    monkeypatch.setattr(main, 'HIBP_RATE_PER_MINUTE', 10)
+    emails = [f'user{idx}@example.com' for idx in range(19)] + ['late@example.com']
+    response = client.post('/check-breach/batch', json={'emails': emails}, headers=auth_headers)
+    assert response.status_code == 200
+    # Twenty lookups at 10/min need two minutes of schedule on top of the usual queue wait.
+    assert set(budgets) == {120.0 + main.HIBP_MAX_QUEUE_WAIT_SECONDS}
+    history = client.get('/report/history', headers=auth_headers).json()['events']
+    assert sum(1 for event in history if event['scan_type'] == 'breach_check') == 19
+
+    monkeypatch.setattr(main, 'HIBP_BATCH_MAX_WAIT_SECONDS', 60)
+    rejected = client.post('/check-breach/batch', json={'emails': emails}, headers=auth_headers)
+    assert rejected.status_code == 429
+
+
+def test_breach_monitor_persists_only_new_exposures(client, auth_headers, monkeypatch):
+    client.put(
+        '/settings',
+        json={'profile_visible': True, 'allow_aggregation': True, 'breach_alerts': True, 'light_theme': False},
+        headers=auth_headers,
+    )
+    opted_out = client.post('/auth/signup', json={'email': 'quiet@example.com', 'password': 'StrongPass1', 'name': 'Quiet'})
+    quiet_headers = {'Authorization': f"Bearer {opted_out.json()['access_token']}"}
+    client.put(
+        '/settings',
+        json={'profile_visible': True, 'allow_aggregation': True, 'breach_alerts': False, 'light_theme': False},
+        headers=quiet_headers,
+    )
+
+    sites = [['Adobe']]
+    looked_up = []
+
+    async def fake_lookup(client, email, max_wait=0):
+        looked_up.append(email)
+        breaches = [{'site': site, 'data': '', 'date': None, 'risk': 'low', 'records': 0} for site in sites[0]]
+        return main._breach_payload(email, 'live-check', breaches)
+
+    monkeypatch.setenv('HIBP_API_KEY', 'test-key')
+    monkeypatch.setattr(main, '_hibp_lookup', fake_lookup)
+    monkeypatch.setattr(main, 'HIBP_RATE_PER_MINUTE', 600000)
+
+    # The first check of an address records a silent baseline instead of alerting on every known breach.
+    first = asyncio.run(main._run_breach_monitor())
+    assert (first['new_exposures'], first['baselined']) == (0, 1)
+    assert looked_up == ['test_user@example.com']
+
+    assert asyncio.run(main._run_breach_monitor())['new_exposures'] == 0
+
+    sites[0] = ['Adobe', 'LinkedIn']
+    assert asyncio.run(main._run_breach_monitor())['new_exposures'] == 1
+    events = client.get('/audit/events', headers=auth_headers).json()['events']
+    alerts = [row['details']['sites'] for row in events if row['event_type'] == 'breach.new_exposure']
+    assert alerts == [['LinkedIn']]
+
+
+def test_breach_monitor_cursor_survives_restarts(client, auth_headers, monkeypatch):
+    for idx in range(3):
+        client.post('/auth/signup', json={'email': f'user{idx}@example.com', 'password': 'StrongPass1', 'name': f'User {idx}'})
+    looked_up = []
+
+    async def fake_lookup(client, email, max_wait=0):
+        looked_up.append(email)
+        return main._breach_payload(email, 'no-breaches')
+
+    monkeypatch.setenv('HIBP_API_KEY', 'test-key')
+    monkeypatch.setattr(main, '_hibp_lookup', fake_lookup)
+    monkeypatch.setattr(main, 'HIBP_RATE_PER_MINUTE', 600000)
+    monkeypatch.setattr(main, 'BREACH_MONITOR_BATCH_SIZE', 2)
+
+    asyncio.run(main._run_breach_monitor())
+    # The cursor lives in the database, so the next run (any process) continues after the last checked user.
+    assert main._load_service_state(main.BREACH_MONITOR_CURSOR_KEY) != '0'
+    asyncio.run(main._run_breach_monitor())
+    assert looked_up == ['test_user@example.com', 'user0@example.com', 'user1@example.com', 'user2@example.com']
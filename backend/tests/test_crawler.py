@@ -0,0 +1,374 @@
+import asyncio
+
+import httpx
+
+import app.main as main
+
+SITE = {
+    '/': '<html><title>Home</title><body>graph home <a href="/a">A</a> <a href="/b">B</a> <a href="https://other.test/x">X</a></body></html>',
+    '/a': '<html><title>A</title><body>graph graph <a href="/c">C</a> contact ada@example.com</body></html>',
+    '/b': '<html><title>B</title><body>nothing here <a href="/d">D</a></body></html>',
+    '/c': '<html><title>C</title><body>leaf</body></html>',
+    '/d': '<html><title>D</title><body>leaf</body></html>',
+}
+
+
+def site_transport(delay: float = 0.0, stats: dict | None = None) -> httpx.MockTransport:
+    stats = stats if stats is not None else {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        stats['active'] = stats.get('active', 0) + 1
+        stats['peak'] = max(stats.get('peak', 0), stats['active'])
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            stats['active'] -= 1
+        body = SITE.get(request.url.path) if host == 'site.test' else None
+        if body is None:
+            return httpx.Response(404, text='missing')
+        return httpx.Response(200, text=body, headers={'content-type': 'text/html'})
+
+    return httpx.MockTransport(handler)
+
+
+def crawl(payload: dict, transport: httpx.MockTransport) -> dict:
+    return asyncio.run(main._run_scrape_pipeline(main.ScrapeAggregateRequest(**payload), transport=transport))
+
+
+def crawl_scoped(payload: dict, transport: httpx.MockTransport, scope: str) -> dict:
+    request = main.ScrapeAggregateRequest(**payload)
+    return asyncio.run(main._run_scrape_pipeline(request, transport=transport, state_scope=scope))
+
+
+def test_concurrent_crawl_keeps_discovery_order_and_budget(monkeypatch):
+    monkeypatch.setattr(main, 'CRAWLER_DOMAIN_DELAY_SECONDS', 0.0)
+    stats: dict = {}
+    result = crawl(
+        {'seed_urls': ['https://site.test/'], 'keywords': ['graph'], 'max_pages': 4, 'same_domain_only': True},
+        site_transport(delay=0.02, stats=stats),
+    )
+    assert [page['title'] for page in result['pages']] == ['Home', 'A', 'B', 'C']
+    assert result['aggregates']['pages_scraped'] == 4
+    assert result['aggregates']['keyword_totals'] == {'graph': 3}
+    assert result['aggregates']['emails_found'] == ['ada@example.com']
+    assert stats['peak'] <= main.CRAWLER_PER_DOMAIN_CONCURRENCY
+
+
+def test_page_analysis_skips_scripts_and_runs_in_pool(monkeypatch):
+    html = (
+        '<html><head><title>Lab &amp; Team</title><script>var graph = 1;</script><style>.graph{}</style></head>'
+        '<body>Graph research<b>graph</b><!-- graph --> <a href=" /people ">People</a><a href="">x</a>'
+        '<a href="mailto:ada@example.com">mail</a> ada@example.com</body></html>'
+    )
+    monkeypatch.setattr(main, 'CRAWLER_PARSE_INLINE_BYTES', 0)
+    analysis = asyncio.run(main._analyze_page_offloaded('https://site.test/lab/', html, main.KeywordCounter(['graph'])))
+    assert analysis == {
+        'title': 'Lab & Team',
+        'word_count': 10,
+        'emails': ['ada@example.com'],
+        'links': ['https://site.test/people'],
+        'link_texts': ['People'],
+        'keyword_hits': {'graph': 2},
+        'simhash': None,
+    }
+
+
+def test_keyword_counter_counts_whole_words_in_one_pass():
+    counter = main.KeywordCounter(['Open', 'open  source', 'graph', 'source code'])
+    text = 'Open source code, opensource graphs and an open\ngraph. OPEN SOURCE!'
+    expected = {'open': 3, 'open source': 2, 'source code': 1, 'graph': 1}
+    assert counter.count(text) == expected
+    assert main.KeywordCounter([' ', '']).count(text) == {}
+
+
+def test_scheduled_recrawl_reuses_unchanged_pages(monkeypatch):
+    monkeypatch.setattr(main, 'CRAWLER_DOMAIN_DELAY_SECONDS', 0.0)
+    site = dict(SITE)
+    full_fetches: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        body = site.get(path)
+        if body is None:
+            return httpx.Response(404, text='missing')
+        etag = f'"{hash(body) & 0xFFFF}"' if path != '/b' else None
+        if etag and request.headers.get('if-none-match') == etag:
+            return httpx.Response(304)
+        full_fetches.append(path)
+        headers = {'content-type': 'text/html'}
+        if etag:
+            headers['etag'] = etag
+        return httpx.Response(200, text=body, headers=headers)
+
+    payload = {'seed_urls': ['https://site.test/'], 'keywords': ['graph'], 'max_pages': 5, 'same_domain_only': True}
+    first = crawl_scoped(payload, httpx.MockTransport(handler), 'schedule-1')
+    assert first['aggregates']['pages_new'] == 5
+    assert first['aggregates']['delta']['keyword_totals'] == {'graph': 3}
+
+    site['/a'] = '<html><title>A</title><body>graph <a href="/c">C</a> contact grace@example.com</body></html>'
+    full_fetches.clear()
+    second = crawl_scoped(payload, httpx.MockTransport(handler), 'schedule-1')
+    aggregates = second['aggregates']
+    # '/b' has no validators, so it is re-downloaded but its unchanged hash skips re-analysis.
+    assert sorted(full_fetches) == ['/a', '/b']
+    assert (aggregates['pages_new'], aggregates['pages_changed'], aggregates['pages_unchanged']) == (0, 1, 4)
+    assert aggregates['keyword_totals'] == {'graph': 2}
+    assert aggregates['delta'] == {'keyword_totals': {'graph': -1}, 'emails_added': ['grace@example.com']}
+    assert [page['change'] for page in second['pages']] == ['unchanged', 'changed', 'unchanged', 'unchanged', 'unchanged']
+
+
+def test_robots_rules_and_sitemaps_plan_the_crawl(monkeypatch):
+    monkeypatch.setattr(main, 'CRAWLER_DOMAIN_DELAY_SECONDS', 0.0)
+    monkeypatch.setattr(main, 'CRAWLER_MAX_CRAWL_DELAY_SECONDS', 0.01)
+    site = {
+        '/robots.txt': 'User-agent: *\nDisallow: /b\nCrawl-delay: 3\nSitemap: https://site.test/sitemap-index.xml\n',
+        '/sitemap-index.xml': (
+            '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            '<sitemap><loc>https://site.test/pages.xml</loc></sitemap></sitemapindex>'
+        ),
+        '/pages.xml': (
+            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            '<url><loc>https://site.test/deep/low</loc><priority>0.2</priority></url>'
+            '<url><loc>https://site.test/deep/high</loc><priority>0.9</priority></url>'
+            '<url><loc>https://elsewhere.test/x</loc></url></urlset>'
+        ),
+        '/': SITE['/'],
+        '/a': SITE['/a'],
+        '/deep/high': '<html><title>High</title><body>graph</body></html>',
+        '/deep/low': '<html><title>Low</title><body>low</body></html>',
+    }
+    requested: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.path)
+        body = site.get(request.url.path)
+        if body is None:
+            return httpx.Response(404, text='missing')
+        return httpx.Response(200, text=body)
+
+    payload = {'seed_urls': ['https://site.test/'], 'keywords': ['graph'], 'max_pages': 4, 'same_domain_only': True}
+    result = crawl(payload, httpx.MockTransport(handler))
+
+    assert '/b' not in requested
+    assert [page['title'] for page in result['pages']] == ['Home', 'A', 'High', 'Low']
+    assert result['aggregates']['robots_blocked'] == 1
+    assert result['aggregates']['sitemap_seeded'] == 2
+    assert main.ROBOTS_CACHE['https://site.test']['crawl_delay'] == 0.01
+
+    requested.clear()
+    crawl(payload, httpx.MockTransport(handler))
+    # robots.txt and sitemaps are served from the per-host cache on the next run.
+    assert not {'/robots.txt', '/sitemap-index.xml', '/pages.xml'} & set(requested)
+
+
+def test_url_variants_collapse_to_one_canonical_page(monkeypatch):
+    monkeypatch.setattr(main, 'CRAWLER_DOMAIN_DELAY_SECONDS', 0.0)
+    assert main._canonicalize_url('HTTPS://Site.TEST:443/a/./b/../c/?utm_source=x&b=2&a=1&b=1#top') == 'https://site.test/a/c?a=1&b=2&b=1'
+    assert main._canonicalize_url('http://[::1]:8080/x/') == 'http://[::1]:8080/x'
+    # Malformed authorities are kept as-is instead of raising.
+    assert main._canonicalize_url('http://site.test:99999/') == 'http://site.test:99999/'
+    assert main._canonicalize_url('http://[oops/') == 'http://[oops/'
+    site = {
+        '/': (
+            '<html><title>Home</title><body><a href="/a">A</a><a href="/a/">A</a><a href="/a#team">A</a>'
+            '<a href="HTTPS://SITE.TEST/a?utm_campaign=spring">A</a><a href="/b">B</a></body></html>'
+        ),
+        '/a': '<html><title>A</title><body><a href="/">home</a></body></html>',
+        '/b': '<html><title>B</title><body>b</body></html>',
+    }
+    fetched: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = site.get(request.url.path)
+        if body is None:
+            return httpx.Response(404, text='missing')
+        fetched.append(request.url.path)
+        return httpx.Response(200, text=body)
+
+    payload = {'seed_urls': ['https://site.test/'], 'keywords': [], 'max_pages': 10, 'same_domain_only': True}
+    result = crawl(payload, httpx.MockTransport(handler))
+    assert sorted(fetched) == ['/', '/a', '/b']
+    assert result['aggregates']['unique_links'] == 3
+    assert result['aggregates']['canonical_duplicates'] == 3
+
+
+def test_bloom_filter_tracks_membership():
+    bloom = main.BloomFilter(capacity=1000, error_rate=0.01)
+    urls = [f'https://site.test/page/{idx}' for idx in range(1000)]
+    assert all(bloom.add(url) for url in urls[:500])
+    assert not bloom.add(urls[0])
+    assert all(url in bloom for url in urls[:500])
+    false_positives = sum(url in bloom for url in urls[500:])
+    assert false_positives < 25
+    assert len(bloom) == 500
+
+
+def test_streaming_fetch_gates_content_type_and_size(monkeypatch):
+    monkeypatch.setattr(main, 'CRAWLER_DOMAIN_DELAY_SECONDS', 0.0)
+    monkeypatch.setattr(main, 'CRAWLER_MAX_BYTES', 2048)
+    home = (
+        '<html><title>Home</title><body><a href="/report.pdf">pdf</a><a href="/report.pdf#p2">pdf</a>'
+        '<a href="/download">blob</a><a href="/huge">huge</a><a href="/long">long</a></body></html>'
+    )
+    long_page = '<html><title>Long</title><body>' + 'graph ' * 1000 + '</body></html>'
+
+    async def chunks(text: str):
+        for start in range(0, len(text), 512):
+            yield text[start : start + 512].encode()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == '/':
+            return httpx.Response(200, text=home, headers={'content-type': 'text/html; charset=utf-8'})
+        if path == '/download':
+            return httpx.Response(200, content=b'%PDF-1.7', headers={'content-type': 'application/pdf'})
+        if path == '/huge':
+            return httpx.Response(200, content=b'x' * 10, headers={'content-type': 'text/html', 'content-length': '999999'})
+        if path == '/long':
+            # No Content-Length: the body is streamed and cut at CRAWLER_MAX_BYTES.
+            return httpx.Response(200, content=chunks(long_page), headers={'content-type': 'text/html'})
+        assert path != '/report.pdf'
+        return httpx.Response(404, text='missing')
+
+    payload = {'seed_urls': ['https://site.test/'], 'keywords': ['graph'], 'max_pages': 10, 'same_domain_only': True}
+    result = crawl(payload, httpx.MockTransport(handler))
+    aggregates = result['aggregates']
+    assert [page['title'] for page in result['pages']] == ['Home', 'Long']
+    assert (aggregates['skipped_non_html'], aggregates['skipped_too_large'], aggregates['truncated']) == (2, 1, 1)
+    long_row = result['pages'][1]
+    assert long_row['truncated'] is True
+    assert 0 < long_row['keyword_hits']['graph'] < 1000
+
+
+def test_best_first_frontier_follows_relevant_links(monkeypatch):
+    monkeypatch.setattr(main, 'CRAWLER_DOMAIN_DELAY_SECONDS', 0.0)
+    monkeypatch.setattr(main, 'CRAWLER_WORKERS', 1)
+    site = {
+        '/': (
+            '<html><title>Home</title><body><a href="/about">About</a><a href="/contact">Contact</a>'
+            '<a href="/jobs">Jobs</a><a href="/lab">Privacy lab</a></body></html>'
+        ),
+        '/about': '<html><title>About</title><body>company</body></html>',
+        '/contact': '<html><title>Contact</title><body>phone</body></html>',
+        '/jobs': '<html><title>Jobs</title><body>hiring</body></html>',
+        '/lab': '<html><title>Lab</title><body>privacy privacy <a href="/lab/graph-privacy">Paper</a></body></html>',
+        '/lab/graph-privacy': '<html><title>Paper</title><body>privacy graph</body></html>',
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = site.get(request.url.path)
+        if body is None:
+            return httpx.Response(404, text='missing')
+        return httpx.Response(200, text=body)
+
+    base = {'seed_urls': ['https://site.test/'], 'keywords': ['privacy'], 'max_pages': 3, 'same_domain_only': True}
+    bfs = crawl(base, httpx.MockTransport(handler))
+    best = crawl({**base, 'frontier': 'best_first'}, httpx.MockTransport(handler))
+    assert [page['title'] for page in bfs['pages']] == ['Home', 'About', 'Contact']
+    assert sorted(page['title'] for page in best['pages']) == ['Home', 'Lab', 'Paper']
+    assert best['frontier'] == 'best_first'
+    assert best['aggregates']['keyword_totals']['privacy'] > bfs['aggregates']['keyword_totals']['privacy']
+
+
+def test_near_duplicate_pages_are_collapsed_and_remembered(monkeypatch):
+    monkeypatch.setattr(main, 'CRAWLER_DOMAIN_DELAY_SECONDS', 0.0)
+    monkeypatch.setattr(main, 'CRAWLER_WORKERS', 1)
+    article = ' '.join(f'graph privacy study section {idx} covers exposure data' for idx in range(12))
+    site = {
+        '/': '<html><title>Home</title><body><a href="/article">Article</a><a href="/article/print">Print</a></body></html>',
+        '/article': f'<html><title>Article</title><body>{article}</body></html>',
+        '/article/print': f'<html><title>Print</title><body>{article} printed copy <a href="/print-only">x</a></body></html>',
+        '/print-only': '<html><title>Print only</title><body>graph</body></html>',
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = site.get(request.url.path)
+        if body is None:
+            return httpx.Response(404, text='missing')
+        return httpx.Response(200, text=body)
+
+    fingerprint = main._simhash(article)
+    assert (fingerprint ^ main._simhash(article + ' printed copy')).bit_count() <= main.CRAWLER_SIMHASH_DISTANCE
+
+    payload = {'seed_urls': ['https://site.test/'], 'keywords': ['graph'], 'max_pages': 10, 'same_domain_only': True}
+    first = crawl_scoped(payload, httpx.MockTransport(handler), 'schedule-dup')
+    assert [page.get('duplicate_of') for page in first['pages']] == [None, None, 'https://site.test/article']
+    assert first['aggregates']['near_duplicates'] == 1
+    assert first['aggregates']['keyword_totals'] == {'graph': 12}
+
+    # The print view is now discovered first, but the article stays canonical across runs of the schedule.
+    site['/'] = '<html><title>Home</title><body><a href="/article/print">Print</a><a href="/article">Article</a></body></html>'
+    second = crawl_scoped(payload, httpx.MockTransport(handler), 'schedule-dup')
+    duplicates = {page['url']: page.get('duplicate_of') for page in second['pages']}
+    assert duplicates['https://site.test/article/print'] == 'https://site.test/article'
+    assert duplicates['https://site.test/article'] is None
+
+    db = main.SessionLocal()
+    try:
+        row = db.query(main.CrawlPageState).filter(main.CrawlPageState.url == 'https://site.test/article/print').one()
+        assert row.duplicate_of == 'https://site.test/article'
+        assert row.simhash is not None
+    finally:
+        db.close()
+
+
+def test_malformed_urls_become_error_pages_without_stalling(monkeypatch):
+    monkeypatch.setattr(main, 'CRAWLER_DOMAIN_DELAY_SECONDS', 0.0)
+    site = {'/': '<html><title>Home</title><body><a href="http://[oops/">bad</a><a href="/a">A</a></body></html>'}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.port == 99999:
+            # Stands in for any non-HTTP error raised while fetching.
+            raise ValueError('port out of range')
+        body = site.get(request.url.path)
+        return httpx.Response(200, text=body) if body else httpx.Response(404, text='missing')
+
+    payload = {'seed_urls': ['https://site.test/', 'http://site.test:99999/'], 'keywords': [], 'max_pages': 3, 'same_domain_only': False}
+    request = main.ScrapeAggregateRequest(**payload)
+    result = asyncio.run(asyncio.wait_for(main._run_scrape_pipeline(request, transport=httpx.MockTransport(handler)), timeout=5))
+    by_url = {page['url']: page for page in result['pages']}
+    assert by_url['https://site.test/']['title'] == 'Home'
+    assert by_url['http://site.test:99999/']['status'] == 'error'
+    assert 'https://site.test/a' in by_url
+
+
+def test_skipped_responses_do_not_spend_the_page_budget(monkeypatch):
+    monkeypatch.setattr(main, 'CRAWLER_DOMAIN_DELAY_SECONDS', 0.0)
+    links = ''.join(f'<a href="/file{idx}">f</a>' for idx in range(4)) + '<a href="/a">A</a><a href="/b">B</a>'
+    site = {
+        '/': f'<html><title>Home</title><body>{links}</body></html>',
+        '/a': '<html><title>A</title><body>leaf</body></html>',
+        '/b': '<html><title>B</title><body>leaf</body></html>',
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.startswith('/file'):
+            return httpx.Response(200, content=b'%PDF-1.7', headers={'content-type': 'application/pdf'})
+        if path not in site:
+            return httpx.Response(404, text='missing')
+        return httpx.Response(200, text=site[path], headers={'content-type': 'text/html'})
+
+    payload = {'seed_urls': ['https://site.test/'], 'keywords': [], 'max_pages': 3, 'same_domain_only': True}
+    result = crawl(payload, httpx.MockTransport(handler))
+    # Four PDFs are skipped ahead of the HTML links, yet the budget still buys three analyzed pages.
+    assert [page['title'] for page in result['pages']] == ['Home', 'A', 'B']
+    assert result['aggregates']['skipped_non_html'] == 4
+
+
+def test_failed_progress_report_does_not_duplicate_the_page(monkeypatch):
+    monkeypatch.setattr(main, 'CRAWLER_DOMAIN_DELAY_SECONDS', 0.0)
+    failed = []
+
+    def progress(event: str, data: dict) -> None:
+        if event == 'page' and not failed:
+            failed.append(data['url'])
+            raise RuntimeError('progress sink unavailable')
+
+    payload = {'seed_urls': ['https://site.test/'], 'keywords': ['graph'], 'max_pages': 4, 'same_domain_only': True}
+    request = main.ScrapeAggregateRequest(**payload)
+    result = asyncio.run(main._run_scrape_pipeline(request, transport=site_transport(), progress=progress))
+    urls = [page['url'] for page in result['pages']]
+    assert failed == ['https://site.test/']
+    assert len(urls) == len(set(urls)) == 4
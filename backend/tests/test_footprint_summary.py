@@ -0,0 +1,86 @@
+import app.main as main
+
+
+def _store(user_id: int, scan_type: str, payload: dict) -> None:
+    db = main.SessionLocal()
+    try:
+        user = db.query(main.User).filter(main.User.id == user_id).one()
+        main.store_scan_event(db, user, scan_type, payload)
+    finally:
+        db.close()
+
+
+def _summary_row(user_id: int):
+    db = main.SessionLocal()
+    try:
+        return db.query(main.FootprintSummary).filter(main.FootprintSummary.user_id == user_id).first()
+    finally:
+        db.close()
+
+
+def test_footprint_summary_is_materialized_and_updated_incrementally(client, auth_headers):
+    db = main.SessionLocal()
+    try:
+        user_id = db.query(main.User).one().id
+    finally:
+        db.close()
+    github = {'platform': 'GitHub', 'username': 'tester', 'profile_url': 'https://github.com/tester', 'status': 'Found'}
+    _store(user_id, 'username_scan', {'username': 'tester', 'query_owner': 'self', 'results': [github]})
+    _store(user_id, 'username_scan', {'username': 'someone', 'query_owner': 'other', 'results': [{**github, 'profile_url': 'x'}]})
+    assert _summary_row(user_id) is None
+
+    # First read builds the summary from stored events.
+    summary = client.get('/digital-footprint-summary', headers=auth_headers).json()['summary']
+    assert summary['total_accounts_found'] == 1
+    assert summary['categories']['Coding'] == 1
+    built = _summary_row(user_id)
+    assert built is not None
+
+    # Later scans are folded in as they are stored.
+    _store(user_id, 'research_search', {'papers': [{'title': 'A'}, {'title': 'B'}]})
+    _store(user_id, 'breach_check', {'email': 'test_user@example.com', 'breaches': [{'site': 'Adobe'}]})
+    # Repeating a scan finds the same papers and breaches again; the counts stay distinct.
+    _store(user_id, 'research_search', {'papers': [{'title': 'B'}]})
+    _store(user_id, 'breach_check', {'email': 'test_user@example.com', 'breaches': [{'site': 'Adobe'}]})
+    gitlab = {'platform': 'GitLab', 'username': 'tester', 'profile_url': 'https://gitlab.com/tester', 'status': 'Found'}
+    _store(user_id, 'username_scan', {'username': 'tester', 'query_owner': 'self', 'results': [gitlab, github]})
+    row = _summary_row(user_id)
+    assert row.last_event_id > built.last_event_id
+    assert (row.papers_count, row.breaches_count) == (2, 1)
+
+    incremental = client.get('/reputation-insight', headers=auth_headers).json()['summary']
+    db = main.SessionLocal()
+    try:
+        user = db.query(main.User).filter(main.User.id == user_id).one()
+        rebuilt = main._footprint_summary_view(main._footprint_state(main._rebuild_footprint_summary(db, user)))
+    finally:
+        db.close()
+    assert incremental == rebuilt
+    assert incremental['total_accounts_found'] == 2
+    assert incremental['research_papers_found'] == 2
+    assert incremental['breach_records_found'] == 1
+
+    assert client.delete('/account', headers=auth_headers).status_code == 200
+    assert _summary_row(user_id) is None
+
+
+def test_out_of_order_fold_drops_the_summary_for_rebuild(client, auth_headers):
+    client.get('/digital-footprint-summary', headers=auth_headers)
+    db = main.SessionLocal()
+    try:
+        user = db.query(main.User).one()
+        github = {'platform': 'GitHub', 'username': 'tester', 'profile_url': 'https://github.com/tester', 'status': 'Found'}
+        payload = {'username': 'tester', 'query_owner': 'self', 'results': [github]}
+        # Event N commits, but a concurrent writer folds the later event M before N is applied.
+        older = main.ScanEvent(user_id=user.id, scan_type='username_scan', payload_json=main.json.dumps(payload))
+        db.add(older)
+        db.commit()
+        main.store_scan_event(db, user, 'username_scan', {'username': 'x', 'query_owner': 'self', 'results': []})
+        main._index_scan_event(db, user, older.id, 'username_scan', payload)
+        main._apply_footprint_event(db, user, older.id, 'username_scan', payload)
+        user_id = user.id
+    finally:
+        db.close()
+    assert _summary_row(user_id) is None
+    summary = client.get('/digital-footprint-summary', headers=auth_headers).json()['summary']
+    assert summary['total_accounts_found'] == 1
@@ -1,9 +1,21 @@
+from sqlalchemy import text
+
+import app.main as main
+
+
 def test_ops_readiness(client):
     response = client.get('/ops/readiness')
     assert response.status_code == 200
     assert 'checks' in response.json()
 
 
+def test_sqlite_connections_use_wal_and_busy_timeout():
+    # API and worker processes share the file, so writers must queue instead of failing with 'database is locked'.
+    with main.engine.connect() as conn:
+        assert conn.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+        assert conn.execute(text('PRAGMA busy_timeout')).scalar() == main.SQLITE_BUSY_TIMEOUT_MS
+
+
 def test_scrape_schedule_crud(client, auth_headers):
     payload = {
         'seed_urls': ['https://example.com'],
@@ -0,0 +1,239 @@
+import asyncio
+import json
+
+import httpx
+from sqlalchemy import event
+
+import app.main as main
+
+
+def _crossref_item(title: str, family: str, given: str, citations: int = 1) -> dict:
+    return {
+        'title': [title],
+        'author': [{'given': given, 'family': family}],
+        'container-title': ['Journal'],
+        'issued': {'date-parts': [[2024]]},
+        'DOI': f'10.1000/{title.lower().replace(" ", "-")}',
+        'is-referenced-by-count': citations,
+    }
+
+
+def test_research_search_keeps_partial_results(client, auth_headers, monkeypatch):
+    async def fake_get(client, semaphore, query_params, force_refresh=False, cache_params=None):
+        if 'query.affiliation' in query_params and 'query.author' not in query_params:
+            raise httpx.ConnectError('boom')
+        items = [_crossref_item('Graph Mining', 'Lovelace', 'Ada', citations=5), _crossref_item('Other', 'Babbage', 'Charles')]
+        return json.dumps({'message': {'items': items}}).encode('utf-8'), True
+
+    monkeypatch.setattr(main, '_crossref_cached_get', fake_get)
+    response = client.post(
+        '/search-research',
+        json={'full_name': 'Ada Lovelace', 'institution': 'Analytical Society'},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data['status'] == 'partial-results'
+    assert [paper['title'] for paper in data['papers']] == ['Graph Mining']
+    assert data['query_status']['institution_only']['failed'] == 1
+    assert data['query_status']['name_only']['failed'] == 0
+
+
+def test_crossref_cache_hit_and_revalidation(monkeypatch):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(dict(request.headers))
+        if request.headers.get('if-none-match') == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={'message': {'items': [{'title': ['Cached']}]}}, headers={'ETag': '"v1"'})
+
+    async def run(force_refresh: bool = False):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await main._stream_crossref_query(
+                client, asyncio.Semaphore(1), {'query.author': 'Ada  Lovelace'}, 5, lambda item: True, force_refresh
+            )
+
+    main.METRICS.clear()
+    assert asyncio.run(run())[0]['title'] == ['Cached']
+    assert asyncio.run(run())[0]['title'] == ['Cached']
+    assert len(calls) == 1
+
+    monkeypatch.setattr(main, 'CROSSREF_CACHE_TTL_SECONDS', 0)
+    assert asyncio.run(run())[0]['title'] == ['Cached']
+    assert calls[-1]['if-none-match'] == '"v1"'
+
+    asyncio.run(run(force_refresh=True))
+    assert 'if-none-match' not in calls[-1]
+    assert main.METRICS['crossref_cache.miss'] == 1
+    assert main.METRICS['crossref_cache.hit'] == 1
+    assert main.METRICS['crossref_cache.revalidated'] == 1
+    assert main.METRICS['crossref_cache.bypass'] == 1
+
+
+def test_crossref_stream_pages_until_target(monkeypatch):
+    seen_params = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = dict(request.url.params)
+        seen_params.append(params)
+        page = len(seen_params)
+        items = [_crossref_item(f'Paper {page}-{idx}', 'Lovelace' if idx % 2 else 'Babbage', 'Ada') for idx in range(2)]
+        return httpx.Response(200, json={'message': {'items': items, 'next-cursor': f'c{page}'}})
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            accept = lambda item: item['author'][0]['family'] == 'Lovelace'
+            return await main._stream_crossref_query(client, asyncio.Semaphore(1), {'query.author': 'stream'}, 2, accept, True)
+
+    monkeypatch.setattr(main, 'CROSSREF_PAGE_ROWS', 2)
+    items = asyncio.run(run())
+    assert [item['title'][0] for item in items] == ['Paper 1-1', 'Paper 2-1']
+    assert [params['cursor'] for params in seen_params] == ['*', 'c1']
+    assert seen_params[0]['select'] == main.CROSSREF_SELECT_FIELDS
+
+
+def test_research_search_serves_local_index(client, auth_headers, monkeypatch):
+    async def live_get(client, semaphore, query_params, force_refresh=False, cache_params=None):
+        items = [_crossref_item('Analytical Engines', 'Lovelace', 'Ada', citations=9)]
+        return json.dumps({'message': {'items': items}}).encode('utf-8'), True
+
+    async def offline_get(client, semaphore, query_params, force_refresh=False, cache_params=None):
+        raise httpx.ConnectError('offline')
+
+    monkeypatch.setattr(main, '_crossref_cached_get', live_get)
+    first = client.post('/search-research', json={'full_name': 'Ada Lovelace'}, headers=auth_headers).json()
+    assert first['papers'][0]['provenance'] == 'live'
+
+    monkeypatch.setattr(main, '_crossref_cached_get', offline_get)
+    second = client.post('/search-research', json={'full_name': 'A. Lovelace'}, headers=auth_headers).json()
+    assert second['status'] == 'upstream-error'
+    assert [(paper['title'], paper['provenance']) for paper in second['papers']] == [('Analytical Engines', 'local')]
+    assert second['sources'] == {'local': 1, 'live': 0}
+
+
+def test_crossref_cached_pages_never_reuse_stale_cursors(monkeypatch):
+    sessions = {'count': 0}
+    seen_cursors = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        cursor = request.url.params['cursor']
+        seen_cursors.append(cursor)
+        if cursor == '*':
+            sessions['count'] += 1
+        elif cursor != f"s{sessions['count']}":
+            # Crossref rejects cursors from an earlier session.
+            return httpx.Response(400, json={'message': 'expired cursor'})
+        page = 0 if cursor == '*' else 1
+        items = [_crossref_item(f'Paper {page}-{idx}', 'Lovelace', 'Ada') for idx in range(2)]
+        return httpx.Response(200, json={'message': {'items': items, 'next-cursor': f"s{sessions['count']}"}})
+
+    async def run(errors):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await main._stream_crossref_query(
+                client, asyncio.Semaphore(1), {'query.author': 'cursor'}, 4, lambda item: True, errors=errors
+            )
+
+    monkeypatch.setattr(main, 'CROSSREF_PAGE_ROWS', 2)
+    monkeypatch.setattr(main, 'CROSSREF_MAX_PAGES', 2)
+    main.METRICS.clear()
+    errors: list[str] = []
+    assert len(asyncio.run(run(errors))) == 4
+    # Page 0 now comes from cache; its next-cursor is stale, so page 0 is refetched live before paging on.
+    seen_cursors.clear()
+    assert len(asyncio.run(run(errors))) == 4
+    assert seen_cursors == ['*']
+    monkeypatch.setattr(main, 'CROSSREF_CACHE_TTL_SECONDS', 0)
+    seen_cursors.clear()
+    assert len(asyncio.run(run(errors))) == 4
+    assert errors == []
+    # The internal refetch is not a user-requested bypass.
+    assert main.METRICS['crossref_cache.cursor_refetch'] == 1
+    assert main.METRICS['crossref_cache.bypass'] == 0
+
+
+def test_crossref_serves_stale_entry_on_upstream_5xx(monkeypatch):
+    status = [200]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if status[0] != 200:
+            return httpx.Response(status[0])
+        return httpx.Response(200, json={'message': {'items': [{'title': ['Cached']}]}})
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await main._stream_crossref_query(client, asyncio.Semaphore(1), {'query.author': 'stale'}, 5, lambda item: True)
+
+    asyncio.run(run())
+    monkeypatch.setattr(main, 'CROSSREF_CACHE_TTL_SECONDS', 0)
+    status[0] = 503
+    main.METRICS.clear()
+    assert asyncio.run(run())[0]['title'] == ['Cached']
+    assert main.METRICS['crossref_cache.stale_served'] == 1
+
+
+def test_research_search_reports_lost_deeper_pages(client, auth_headers, monkeypatch):
+    async def fake_get(client, semaphore, query_params, force_refresh=False, cache_params=None):
+        if query_params['cursor'] != '*':
+            raise httpx.HTTPStatusError('expired', request=httpx.Request('GET', 'https://x'), response=httpx.Response(400))
+        items = [_crossref_item('Graph Mining', 'Lovelace', 'Ada'), _crossref_item('Other', 'Babbage', 'Charles')]
+        return json.dumps({'message': {'items': items, 'next-cursor': 'c1'}}).encode('utf-8'), True
+
+    monkeypatch.setattr(main, '_crossref_cached_get', fake_get)
+    monkeypatch.setattr(main, 'CROSSREF_PAGE_ROWS', 2)
+    data = client.post('/search-research', json={'full_name': 'Ada Lovelace'}, headers=auth_headers).json()
+    assert data['status'] == 'partial-results'
+    assert [paper['title'] for paper in data['papers']] == ['Graph Mining']
+    assert data['query_status']['name_only']['partial'] >= 1
+    assert 'http-400' in data['query_status']['name_only']['errors']
+
+
+def test_publication_index_keeps_every_author(client, auth_headers, monkeypatch):
+    item = _crossref_item('Big Collaboration', 'Lovelace', 'Ada')
+    item['author'] = [{'given': f'Person{idx}', 'family': f'Coauthor{idx}'} for idx in range(6)] + item['author']
+
+    async def live_get(client, semaphore, query_params, force_refresh=False, cache_params=None):
+        return json.dumps({'message': {'items': [item]}}).encode('utf-8'), True
+
+    async def offline_get(client, semaphore, query_params, force_refresh=False, cache_params=None):
+        raise httpx.ConnectError('offline')
+
+    monkeypatch.setattr(main, '_crossref_cached_get', live_get)
+    first = client.post('/search-research', json={'full_name': 'Ada Lovelace'}, headers=auth_headers).json()
+    # Responses (and the stored scan) keep the short byline; the index row has all seven authors.
+    assert first['papers'][0]['authors'].count(',') == main.RESEARCH_DISPLAY_AUTHORS - 1
+    db = main.SessionLocal()
+    try:
+        assert db.query(main.Publication).one().authors.endswith('Ada Lovelace')
+    finally:
+        db.close()
+
+    # The seventh author is still found offline through the local index.
+    monkeypatch.setattr(main, '_crossref_cached_get', offline_get)
+    second = client.post('/search-research', json={'full_name': 'Ada Lovelace'}, headers=auth_headers).json()
+    assert [paper['title'] for paper in second['papers']] == ['Big Collaboration']
+
+
+def test_crossref_cache_store_survives_a_concurrent_insert():
+    raced = []
+
+    def insert_first(session, flush_context, instances):
+        # Another request stores the same key between our lookup and our insert.
+        if raced or not any(isinstance(obj, main.CrossrefCacheEntry) for obj in session.new):
+            return
+        raced.append(True)
+        with main.engine.begin() as conn:
+            conn.execute(
+                main.CrossrefCacheEntry.__table__.insert().values(
+                    cache_key='k', params_json='{}', body=main.zlib.compress(b'old'), fetched_at=main.datetime.now(main.timezone.utc)
+                )
+            )
+
+    event.listen(main.SessionLocal, 'before_flush', insert_first)
+    try:
+        main._store_crossref_cache('k', {}, b'new', '"v2"', None)
+    finally:
+        event.remove(main.SessionLocal, 'before_flush', insert_first)
+    assert raced
+    cached = main._load_crossref_cache('k')
+    assert (cached['body'], cached['etag']) == (b'new', '"v2"')
@@ -0,0 +1,392 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+import app.main as main
+
+
+def _queue_job(client, auth_headers) -> str:
+    payload = {'seed_urls': ['https://example.com'], 'keywords': ['example'], 'max_pages': 1}
+    queued = client.post('/jobs/scrape', json=payload, headers=auth_headers)
+    assert queued.status_code == 200
+    return queued.json()['job_id']
+
+
+def _job_row(job_id: str) -> main.ScrapeJob:
+    db = main.SessionLocal()
+    try:
+        return db.query(main.ScrapeJob).filter(main.ScrapeJob.job_id == job_id).one()
+    finally:
+        db.close()
+
+
+def test_claim_is_exclusive_and_reclaims_expired_leases(client, auth_headers):
+    job_id = _queue_job(client, auth_headers)
+
+    claim = main._claim_scrape_job('worker-a')
+    assert claim['job_id'] == job_id
+    assert claim['attempts'] == 1
+    assert main._claim_scrape_job('worker-b') is None
+    assert main._extend_scrape_lease(job_id, 'worker-a')
+    assert not main._extend_scrape_lease(job_id, 'worker-b')
+
+    # A worker that stops heartbeating loses the job to the next claimant.
+    db = main.SessionLocal()
+    try:
+        db.query(main.ScrapeJob).update({main.ScrapeJob.lease_expires_at: datetime.now(timezone.utc) - timedelta(seconds=1)})
+        db.commit()
+    finally:
+        db.close()
+    reclaimed = main._claim_scrape_job('worker-b')
+    assert reclaimed['job_id'] == job_id
+    assert reclaimed['attempts'] == 2
+
+    main._finish_scrape_job(job_id, 'worker-a', result={'status': 'stale'})
+    assert _job_row(job_id).status == 'running'
+
+
+def test_failed_job_retries_with_backoff_then_fails(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(main, 'SCRAPE_JOB_MAX_ATTEMPTS', 2)
+    monkeypatch.setattr(main, 'SCRAPE_JOB_RETRY_BASE_SECONDS', 30)
+    job_id = _queue_job(client, auth_headers)
+
+    main._claim_scrape_job('worker-a')
+    main._finish_scrape_job(job_id, 'worker-a', error='boom')
+    row = _job_row(job_id)
+    assert row.status == 'queued'
+    assert row.error == 'boom'
+    delay = (main._as_utc(row.available_at) - datetime.now(timezone.utc)).total_seconds()
+    assert 25 < delay <= 30
+    assert main._claim_scrape_job('worker-a') is None
+
+    db = main.SessionLocal()
+    try:
+        db.query(main.ScrapeJob).update({main.ScrapeJob.available_at: datetime.now(timezone.utc)})
+        db.commit()
+    finally:
+        db.close()
+    assert main._claim_scrape_job('worker-a')['attempts'] == 2
+    main._finish_scrape_job(job_id, 'worker-a', error='boom again')
+
+    job = client.get(f'/jobs/scrape/{job_id}', headers=auth_headers).json()
+    assert job['status'] == 'failed'
+    assert job['attempts'] == 2
+    assert job['error'] == 'boom again'
+
+
+def test_worker_runs_job_and_stores_result(client, auth_headers, monkeypatch):
+    async def fake_pipeline(payload, transport=None, state_scope=None, progress=None, cancel=None):
+        progress('page', {'url': 'https://example.com', 'keyword_hits': {'example': 2}})
+        await asyncio.sleep(0.05)
+        return {'status': 'scraped', 'pages': [], 'aggregates': {'pages_scraped': 1, 'keyword_totals': {'example': 2}}}
+
+    monkeypatch.setattr(main, '_run_scrape_pipeline', fake_pipeline)
+    monkeypatch.setattr(main, 'SCRAPE_JOB_HEARTBEAT_SECONDS', 0.01)
+    job_id = _queue_job(client, auth_headers)
+
+    claim = main._claim_scrape_job('worker-a')
+    asyncio.run(main._execute_scrape_job(claim, 'worker-a'))
+
+    job = client.get(f'/jobs/scrape/{job_id}', headers=auth_headers)
+    assert job.status_code == 200
+    body = job.json()
+    assert body['status'] == 'completed'
+    assert body['result']['status'] == 'scraped'
+    assert 'finished_at' in body
+
+    history = client.get('/report/history', headers=auth_headers).json()['events']
+    assert any(event['scan_type'] == 'web_scrape_aggregate' for event in history)
+
+    events = client.get(f'/jobs/scrape/{job_id}/events', headers=auth_headers)
+    assert events.headers['content-type'].startswith('text/event-stream')
+    blocks = [block for block in events.text.split('\n\n') if block]
+    assert [block.split('\n')[1] for block in blocks] == ['event: queued', 'event: started', 'event: page', 'event: completed']
+    assert json.loads(blocks[2].split('data: ', 1)[1])['keyword_hits'] == {'example': 2}
+
+    # Reconnecting clients resume after the last event they saw.
+    last_seen = blocks[2].split('\n')[0].split(': ')[1]
+    resumed = client.get(f'/jobs/scrape/{job_id}/events', headers={**auth_headers, 'Last-Event-ID': last_seen})
+    assert resumed.text.count('event: ') == 1
+    assert 'event: completed' in resumed.text
+
+    other = client.post('/auth/signup', json={'email': 'other@example.com', 'password': 'TestPass123', 'name': 'Other'})
+    other_headers = {'Authorization': f"Bearer {other.json()['access_token']}"}
+    assert client.get(f'/jobs/scrape/{job_id}', headers=other_headers).status_code == 404
+
+    # Browsers' EventSource cannot set headers: it opens the stream with a short-lived, job-scoped token instead.
+    minted = client.post(f'/jobs/scrape/{job_id}/events/token', headers=auth_headers).json()
+    assert minted['expires_in'] == main.SCRAPE_JOB_STREAM_TOKEN_SECONDS
+    via_query = client.get(f'/jobs/scrape/{job_id}/events', params={'token': minted['token'], 'after': last_seen})
+    assert via_query.status_code == 200
+    assert 'event: completed' in via_query.text
+    assert client.get(f'/jobs/scrape/{job_id}/events').status_code == 401
+    # The stream token is no general access token, and it is bound to its job.
+    assert client.get('/jobs/scrape', headers={'Authorization': f"Bearer {minted['token']}"}).status_code == 401
+    assert client.get('/jobs/scrape/other-job/events', params={'token': minted['token']}).status_code == 401
+    assert client.post(f'/jobs/scrape/{job_id}/events/token', headers=other_headers).status_code == 404
+    monkeypatch.setattr(main, 'SCRAPE_JOB_STREAM_TOKEN_SECONDS', -5)
+    stale = client.post(f'/jobs/scrape/{job_id}/events/token', headers=auth_headers).json()['token']
+    assert client.get(f'/jobs/scrape/{job_id}/events', params={'token': stale}).status_code == 401
+
+
+def test_stuck_pipeline_is_stopped_at_the_job_timeout(client, auth_headers, monkeypatch):
+    stopped = asyncio.Event()
+
+    async def stuck_pipeline(payload, transport=None, state_scope=None, progress=None, cancel=None):
+        try:
+            await asyncio.sleep(3600)
+        finally:
+            stopped.set()
+
+    monkeypatch.setattr(main, '_run_scrape_pipeline', stuck_pipeline)
+    monkeypatch.setattr(main, 'SCRAPE_JOB_PROGRESS_SECONDS', 0.01)
+    monkeypatch.setattr(main, 'SCRAPE_JOB_TIMEOUT_SECONDS', 0.05)
+    job_id = _queue_job(client, auth_headers)
+
+    claim = main._claim_scrape_job('worker-a')
+    asyncio.run(asyncio.wait_for(main._execute_scrape_job(claim, 'worker-a'), timeout=5))
+    assert stopped.is_set()
+    row = _job_row(job_id)
+    assert row.status == 'queued'
+    assert 'exceeded' in row.error
+
+
+def test_transient_db_errors_do_not_fail_a_running_job(client, auth_headers, monkeypatch):
+    async def fake_pipeline(payload, transport=None, state_scope=None, progress=None, cancel=None):
+        progress('page', {'url': 'https://example.com', 'keyword_hits': {}})
+        await asyncio.sleep(0.05)
+        return {'status': 'scraped', 'pages': [], 'aggregates': {'pages_scraped': 1, 'keyword_totals': {}}}
+
+    real_sync = main._sync_scrape_job_progress
+    failures = {'sync': 1, 'lease': 1}
+
+    def flaky_sync(job_id, events):
+        if failures['sync']:
+            failures['sync'] -= 1
+            raise main.OperationalError('UPDATE', {}, Exception('database is locked'))
+        return real_sync(job_id, events)
+
+    def flaky_lease(job_id, owner):
+        if failures['lease']:
+            failures['lease'] -= 1
+            raise main.OperationalError('UPDATE', {}, Exception('database is locked'))
+        return True
+
+    monkeypatch.setattr(main, '_run_scrape_pipeline', fake_pipeline)
+    monkeypatch.setattr(main, '_sync_scrape_job_progress', flaky_sync)
+    monkeypatch.setattr(main, '_extend_scrape_lease', flaky_lease)
+    monkeypatch.setattr(main, 'SCRAPE_JOB_PROGRESS_SECONDS', 0.01)
+    monkeypatch.setattr(main, 'SCRAPE_JOB_HEARTBEAT_SECONDS', 0)
+    job_id = _queue_job(client, auth_headers)
+
+    claim = main._claim_scrape_job('worker-a')
+    asyncio.run(main._execute_scrape_job(claim, 'worker-a'))
+    assert failures == {'sync': 0, 'lease': 0}
+    assert _job_row(job_id).status == 'completed'
+    # The batch that failed to sync is written on the next round instead of being lost.
+    events = client.get(f'/jobs/scrape/{job_id}/events', headers=auth_headers).text
+    assert 'event: page' in events
+
+
+def test_worker_survives_a_failed_iteration(monkeypatch):
+    calls: list[str] = []
+
+    def flaky_claim(owner):
+        calls.append(owner)
+        if len(calls) == 1:
+            raise RuntimeError('boom')
+        return None
+
+    async def idle() -> None:
+        await asyncio.sleep(0.01)
+
+    monkeypatch.setattr(main, '_claim_scrape_job', flaky_claim)
+    monkeypatch.setattr(main, '_wait_for_scrape_work', idle)
+    monkeypatch.setattr(main, 'SCRAPE_JOB_POLL_SECONDS', 0.01)
+
+    async def run_briefly() -> None:
+        try:
+            await asyncio.wait_for(main._scrape_worker('worker-a'), timeout=0.2)
+        except asyncio.TimeoutError:
+            pass
+
+    asyncio.run(run_briefly())
+    assert len(calls) > 2
+
+
+def test_api_role_leaves_background_work_to_workers(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    monkeypatch.setattr(main, 'PROCESS_ROLE', 'api')
+    with TestClient(main.app) as api:
+        assert api.get('/ops/readiness').json()['process_role'] == 'api'
+        assert main.SCRAPE_WORKERS == []
+        if main.scheduler:
+            assert main.scheduler.get_job('breach-monitor') is None
+    assert main.SCRAPE_WORKERS == []
+
+
+def test_scheduler_lease_has_a_single_leader(monkeypatch):
+    monkeypatch.setattr(main, 'redis_client', None)
+    assert asyncio.run(main._claim_scheduler_leadership('node-a'))
+    assert asyncio.run(main._claim_scheduler_leadership('node-a'))
+    assert not asyncio.run(main._claim_scheduler_leadership('node-b'))
+    assert asyncio.run(main._dispatch_scrape_schedules('node-b')) == 0
+
+    db = main.SessionLocal()
+    try:
+        db.query(main.ServiceLease).update({main.ServiceLease.expires_at: datetime.now(timezone.utc) - timedelta(seconds=1)})
+        db.commit()
+    finally:
+        db.close()
+    assert asyncio.run(main._claim_scheduler_leadership('node-b'))
+    assert not asyncio.run(main._claim_scheduler_leadership('node-a'))
+
+
+def test_redis_scheduler_lease_is_claimed_and_renewed_in_one_script(monkeypatch):
+    class ScriptOnlyRedis:
+        # Runs the lease script's semantics; any separate GET/SET/EXPIRE call fails the test.
+        def __init__(self):
+            self.store = {}
+            self.calls = []
+
+        async def eval(self, script, numkeys, key, owner, ttl):
+            assert script == main.SCHEDULER_LEASE_SCRIPT and numkeys == 1
+            self.calls.append((key, owner, ttl))
+            current = self.store.get(key)
+            if current in (None, owner):
+                self.store[key] = owner
+                return 1
+            return 0
+
+    fake = ScriptOnlyRedis()
+    monkeypatch.setattr(main, 'redis_client', fake)
+    assert asyncio.run(main._claim_scheduler_leadership('node-a'))
+    assert asyncio.run(main._claim_scheduler_leadership('node-a'))
+    assert not asyncio.run(main._claim_scheduler_leadership('node-b'))
+    assert fake.calls[0] == (main.SCRAPE_SCHEDULER_LEASE_KEY, 'node-a', main.SCRAPE_SCHEDULER_LEASE_SECONDS)
+
+
+def test_persisted_schedule_dispatches_and_coalesces(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(main, 'redis_client', None)
+    payload = {'seed_urls': ['https://example.com'], 'keywords': ['example'], 'interval_minutes': 10, 'max_pages': 1}
+    created = client.post('/crawler/schedules', json=payload, headers=auth_headers).json()
+    schedule_id = created['schedule_id']
+    first_run = datetime.fromisoformat(created['next_run_at'])
+    offset = (first_run - datetime.fromisoformat(created['created_at'])).total_seconds() - 600
+    assert 0 <= offset <= main.SCRAPE_SCHEDULE_MAX_JITTER_SECONDS
+    assert asyncio.run(main._dispatch_scrape_schedules('node-a')) == 0
+
+    # Simulate three missed slots, e.g. while every worker was down.
+    def make_due():
+        db = main.SessionLocal()
+        try:
+            schedule = db.query(main.ScrapeSchedule).one()
+            schedule.next_run_at = main._as_utc(schedule.next_run_at) - timedelta(minutes=30)
+            db.commit()
+            return main._as_utc(schedule.next_run_at)
+        finally:
+            db.close()
+
+    due_at = make_due()
+    assert asyncio.run(main._dispatch_scrape_schedules('node-a')) == 1
+    listed = client.get('/crawler/schedules', headers=auth_headers).json()['schedules'][0]
+    next_run = datetime.fromisoformat(listed['next_run_at'])
+    assert next_run > datetime.now(timezone.utc)
+    assert (next_run - due_at).total_seconds() % 600 == 0
+    jobs = client.get('/jobs/scrape', headers=auth_headers).json()['jobs']
+    assert [job['job_id'] for job in jobs] == [listed['last_job_id']]
+    assert jobs[0]['schedule_id'] == schedule_id
+
+    # The previous run has not been picked up yet, so the next slot is coalesced into it.
+    make_due()
+    assert asyncio.run(main._dispatch_scrape_schedules('node-a')) == 0
+    assert len(client.get('/jobs/scrape', headers=auth_headers).json()['jobs']) == 1
+
+
+def test_cancel_stops_crawl_and_keeps_partial_result(client, auth_headers, monkeypatch):
+    pages = {f'/p{i}': f'<html><title>P{i}</title><body>graph <a href="/p{i + 1}">next</a></body></html>' for i in range(20)}
+
+    async def handler(request):
+        await asyncio.sleep(0.02)
+        return httpx.Response(200, text=pages.get(request.url.path, 'missing'), headers={'content-type': 'text/html'})
+
+    original = main._run_scrape_pipeline
+
+    async def pipeline_on_fixture(payload, **kwargs):
+        return await original(payload, transport=httpx.MockTransport(handler), **kwargs)
+
+    monkeypatch.setattr(main, '_run_scrape_pipeline', pipeline_on_fixture)
+    monkeypatch.setattr(main, 'CRAWLER_RESPECT_ROBOTS', False)
+    monkeypatch.setattr(main, 'CRAWLER_USE_SITEMAPS', False)
+    monkeypatch.setattr(main, 'CRAWLER_DOMAIN_DELAY_SECONDS', 0.0)
+    monkeypatch.setattr(main, 'SCRAPE_JOB_PROGRESS_SECONDS', 0.05)
+    payload = {'seed_urls': ['https://chain.test/p0'], 'keywords': ['graph'], 'max_pages': 20}
+    job_id = client.post('/jobs/scrape', json=payload, headers=auth_headers).json()['job_id']
+    claim = main._claim_scrape_job('worker-a')
+
+    async def run():
+        task = asyncio.create_task(main._execute_scrape_job(claim, 'worker-a'))
+        await asyncio.sleep(0.15)
+        assert client.post(f'/jobs/scrape/{job_id}/cancel', headers=auth_headers).json()['status'] == 'cancelling'
+        await asyncio.wait_for(task, timeout=5)
+
+    asyncio.run(run())
+
+    job = client.get(f'/jobs/scrape/{job_id}', headers=auth_headers).json()
+    assert job['status'] == 'cancelled'
+    assert job['result']['status'] == 'cancelled'
+    assert 0 < job['result']['aggregates']['pages_scraped'] < 20
+    history = client.get('/report/history', headers=auth_headers).json()['events']
+    assert any(event['scan_type'] == 'web_scrape_aggregate' for event in history)
+    assert client.post(f'/jobs/scrape/{job_id}/cancel', headers=auth_headers).status_code == 409
+
+    # Queued jobs are cancelled without ever reaching a worker.
+    queued_id = client.post('/jobs/scrape', json=payload, headers=auth_headers).json()['job_id']
+    assert client.post(f'/jobs/scrape/{queued_id}/cancel', headers=auth_headers).json()['status'] == 'cancelled'
+    assert main._claim_scrape_job('worker-a') is None
+
+
+def test_results_are_stored_apart_paginated_and_pruned(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(main, 'SCRAPE_JOB_MAX_PER_USER', 2)
+    result = {
+        'status': 'scraped',
+        'pages': [{'url': f'https://example.com/{i}', 'keyword_hits': {}} for i in range(7)],
+        'aggregates': {'pages_scraped': 7, 'emails_found': ['a@example.com'], 'keyword_totals': {'example': 4}},
+    }
+    job_ids = []
+    for _ in range(3):
+        job_id = _queue_job(client, auth_headers)
+        main._claim_scrape_job('worker-a')
+        main._finish_scrape_job(job_id, 'worker-a', result=result)
+        job_ids.append(job_id)
+
+    # Only the newest finished jobs per user are kept, with their stored results.
+    listed = client.get('/jobs/scrape?limit=1', headers=auth_headers).json()
+    assert listed['total'] == 2
+    assert [job['job_id'] for job in listed['jobs']] == [job_ids[2]]
+    assert 'result' not in listed['jobs'][0]
+    assert listed['jobs'][0]['summary'] == {
+        'status': 'scraped',
+        'frontier': None,
+        'pages_scraped': 7,
+        'unique_links': 0,
+        'emails_found': 1,
+        'keyword_totals': {'example': 4},
+    }
+    second = client.get('/jobs/scrape?limit=1&offset=1', headers=auth_headers).json()
+    assert [job['job_id'] for job in second['jobs']] == [job_ids[1]]
+    assert client.get(f'/jobs/scrape/{job_ids[0]}', headers=auth_headers).status_code == 404
+    db = main.SessionLocal()
+    try:
+        assert db.query(main.ScrapeJobResult).count() == 2
+    finally:
+        db.close()
+
+    page = client.get(f'/jobs/scrape/{job_ids[2]}?pages_offset=5&pages_limit=5', headers=auth_headers).json()
+    assert [row['url'] for row in page['result']['pages']] == ['https://example.com/5', 'https://example.com/6']
+    assert page['pages'] == {'offset': 5, 'limit': 5, 'total': 7}
+    assert page['result']['aggregates']['pages_scraped'] == 7
+    assert job_ids[2] in main.SCRAPE_RESULT_CACHE
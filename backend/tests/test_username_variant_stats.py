@@ -0,0 +1,72 @@
+from app.main import (
+    PLATFORMS,
+    SessionLocal,
+    User,
+    _fast_probe_plan,
+    _username_variant_patterns,
+    _variant_hit_stats,
+    store_scan_event,
+)
+
+
+def test_variant_patterns_are_labelled():
+    patterns = dict((variant, pattern) for pattern, variant in _username_variant_patterns('Ada Lovelace'))
+    assert patterns['adalovelace'] == 'joined'
+    assert patterns['ada.lovelace'] == 'dotted'
+    assert patterns['lovelaceada'] == 'reversed'
+
+
+def test_hit_stats_drive_fast_plan(client, auth_headers):
+    db = SessionLocal()
+    try:
+        user = db.query(User).first()
+        for _ in range(6):
+            store_scan_event(
+                db,
+                user,
+                'username_scan',
+                {
+                    'username': 'Ada Lovelace',
+                    'username_variants_checked': ['adalovelace', 'ada.lovelace'],
+                    'results': [{'platform': 'GitHub', 'username': 'adalovelace', 'status': 'Found'}],
+                    'status': 'live-scan',
+                },
+            )
+        stats = _variant_hit_stats(db)
+    finally:
+        db.close()
+
+    assert stats['GitHub']['joined'] == {'probes': 6, 'hits': 6}
+    assert stats['GitHub']['dotted'] == {'probes': 6, 'hits': 0}
+
+    plan = _fast_probe_plan(stats, ['joined', 'dotted', 'underscored'])
+    assert plan['GitHub'] == ['joined', 'underscored']
+    # Low-yield patterns are pruned while unsampled ones are still explored.
+    assert plan['GitLab'] == ['underscored']
+    assert set(plan) == {platform['name'] for platform in PLATFORMS}
+
+
+def test_every_pattern_that_found_the_profile_is_credited(client, auth_headers):
+    db = SessionLocal()
+    try:
+        user = db.query(User).first()
+        store_scan_event(
+            db,
+            user,
+            'username_scan',
+            {
+                'username': 'Ada Lovelace',
+                'username_variants_checked': ['adalovelace', 'ada.lovelace'],
+                'variant_patterns': {'adalovelace': 'joined', 'ada.lovelace': 'dotted'},
+                # Both variants resolve; only the faster one is kept as the result row.
+                'pattern_hits': {'GitHub': ['joined', 'dotted']},
+                'results': [{'platform': 'GitHub', 'username': 'adalovelace', 'variant_pattern': 'joined', 'status': 'Found'}],
+                'status': 'live-scan',
+            },
+        )
+        stats = _variant_hit_stats(db)
+    finally:
+        db.close()
+
+    assert stats['GitHub']['joined'] == {'probes': 1, 'hits': 1}
+    assert stats['GitHub']['dotted'] == {'probes': 1, 'hits': 1}
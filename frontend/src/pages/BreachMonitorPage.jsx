@@ -60,16 +60,24 @@ export default function BreachMonitorPage({ embedded = false }) {
             <GlassCard
               key={row.site}
               className={`p-5 ${
-                row.risk === 'high' ? 'border border-red-500/35 shadow-[0_0_24px_rgba(239,68,68,0.12)]' : 'border border-emerald-500/30'
+                row.risk === 'high'
+                  ? 'border border-red-500/35 shadow-[0_0_24px_rgba(239,68,68,0.12)]'
+                  : row.risk === 'unknown'
+                    ? 'border border-amber-500/30'
+                    : 'border border-emerald-500/30'
               }`}
             >
               <div className="flex items-start justify-between">
                 <h3 className="text-lg font-semibold">{row.site}</h3>
-                <span className={`rounded-full px-2.5 py-1 text-xs ${row.risk === 'high' ? 'bg-red-500/20 text-red-200' : 'bg-emerald-500/20 text-emerald-200'}`}>
+                <span
+                  className={`rounded-full px-2.5 py-1 text-xs ${
+                    row.risk === 'high' ? 'bg-red-500/20 text-red-200' : row.risk === 'unknown' ? 'bg-amber-500/20 text-amber-200' : 'bg-emerald-500/20 text-emerald-200'
+                  }`}
+                >
                   {row.risk.toUpperCase()} RISK
                 </span>
               </div>
-              <p className="mt-3 text-sm text-muted">Data exposed: {row.data}</p>
+              <p className="mt-3 text-sm text-muted">Data exposed: {row.metadata === 'unavailable' ? 'Details not yet available' : row.data}</p>
               <p className="mt-1 text-sm text-muted">Date of breach: {row.date}</p>
             </GlassCard>
           ))}
@@ -308,6 +308,20 @@ export async function listScrapeJobs() {
   }
 }
 
+// EventSource cannot send the Authorization header, so the stream is opened with a short-lived token for this job.
+// The token is only checked on open: once the source closes, reopen with the last seen event id as `after`.
+export async function openScrapeJobEvents(jobId, after = 0) {
+  try {
+    const { data } = await apiClient.post(`/jobs/scrape/${jobId}/events/token`);
+    const params = new URLSearchParams({ token: data.token });
+    if (after) params.set('after', String(after));
+    const baseURL = (apiClient.defaults.baseURL || '').replace(/\/$/, '');
+    return new EventSource(`${baseURL}/jobs/scrape/${jobId}/events?${params}`);
+  } catch (error) {
+    throw normalizeApiError(error, 'Failed to open scrape job events.');
+  }
+}
+
 export async function listCrawlerSchedules() {
   try {
     const { data } = await apiClient.get('/crawler/schedules');